@@ -0,0 +1,90 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from paid_library_service.singleflight import cached_read
+
+
+CATALOG_VERSION_KEY = "books:catalog:version"
+
+
+def catalog_version():
+    """
+    Current catalog version, part of every cached response key.
+    A missing counter starts from the current time in milliseconds,
+    so it never goes back to a value used before an eviction.
+    """
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOG_VERSION_KEY, time.time_ns() // 1_000_000, None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        cache.set(CATALOG_VERSION_KEY, time.time_ns() // 1_000_000, None)
+
+
+def catalog_cache_key(request, action, version):
+    """
+    Key built from the action, the catalog version, the host (links in
+    the response are absolute) and the normalized query params.
+    """
+    params = sorted(
+        (name, value)
+        for name, values in request.query_params.lists()
+        for value in values
+    )
+    raw = f"{request.get_host()}{request.path}?{params}"
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f"books:catalog:{action}:{version}:{digest}"
+
+
+class _UncachedResponse(Exception):
+    def __init__(self, response):
+        self.response = response
+
+
+def cached_catalog_response(request, action, get_validators, render):
+    """
+    Return the cached data of a successful response or render it.
+    The validators (ETag, Last-Modified) are cached with the data,
+    so a conditional request for a cached entry is answered without
+    touching the database.
+
+    Entries are fresh for settings.CATALOG_CACHE_TIMEOUT seconds, which
+    bounds staleness when a change can't bump the version (e.g. a write
+    seen only by another process' local memory cache). For another
+    settings.CATALOG_CACHE_STALE_TIMEOUT seconds an expired entry is
+    still served while a single request refreshes it, and concurrent
+    misses for the same key wait for one computation.
+    """
+    key = catalog_cache_key(request, action, catalog_version())
+
+    def compute():
+        validators = get_validators()
+        response = render()
+        if response.status_code != 200:
+            raise _UncachedResponse(response)
+        return response.data, validators
+
+    try:
+        (data, validators), state = cached_read(
+            key,
+            compute,
+            timeout=settings.CATALOG_CACHE_TIMEOUT,
+            stale_timeout=settings.CATALOG_CACHE_STALE_TIMEOUT,
+        )
+    except _UncachedResponse as error:
+        response = error.response
+        response["X-Cache"] = "MISS"
+        return response
+    return validators.respond(
+        request, lambda: Response(data, headers={"X-Cache": state})
+    )
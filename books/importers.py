@@ -0,0 +1,134 @@
+from itertools import islice
+
+from django.db import connection, transaction
+from django.db.backends.postgresql.psycopg_any import is_psycopg3
+from django.utils import timezone
+from rest_framework import serializers
+
+from books.models import Book
+from books.signals import catalog_changed
+from paid_library_service.importers import ImportResult, validate_batch
+
+
+UPDATE_FIELDS = ("inventory", "daily_fee", "updated_at")
+
+
+class BookImportSerializer(serializers.Serializer):
+    """
+    One catalog row. Accepts plain rows and loaddata fixture items
+    ({"model": ..., "fields": {...}}), and the cover as value or label.
+    """
+
+    COVERS = {
+        choice.upper(): value
+        for value, label in Book.CoverType.choices
+        for choice in (value, label)
+    }
+
+    title = serializers.CharField(max_length=255)
+    author = serializers.CharField(max_length=255)
+    cover = serializers.CharField()
+    inventory = serializers.IntegerField(min_value=0)
+    daily_fee = serializers.DecimalField(max_digits=5, decimal_places=2)
+
+    def to_internal_value(self, data):
+        if isinstance(data, dict) and isinstance(data.get("fields"), dict):
+            data = data["fields"]
+        return super().to_internal_value(data)
+
+    def validate_cover(self, value):
+        try:
+            return self.COVERS[value.strip().upper()]
+        except KeyError:
+            raise serializers.ValidationError(
+                f"Expected one of: {', '.join(Book.CoverType.values)}."
+            )
+
+
+def upsert_books(books):
+    """Insert new books and update existing ones by natural key."""
+    Book.objects.bulk_create(
+        books,
+        update_conflicts=True,
+        unique_fields=Book.NATURAL_KEY,
+        update_fields=UPDATE_FIELDS,
+    )
+
+
+def copy_books(books):
+    """
+    Same as upsert_books() through Postgres COPY into a temporary staging
+    table (emptied on commit) and one INSERT ... ON CONFLICT from it.
+    """
+    quote = connection.ops.quote_name
+    table = quote(Book._meta.db_table)
+    names = ", ".join(map(quote, (*Book.NATURAL_KEY, *UPDATE_FIELDS)))
+    now = timezone.now()
+
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"CREATE TEMP TABLE IF NOT EXISTS books_import "
+            f"ON COMMIT DELETE ROWS "
+            f"AS SELECT {names} FROM {table} WITH NO DATA"
+        )
+        with cursor.cursor.copy(
+            f"COPY books_import ({names}) FROM STDIN"
+        ) as copy:
+            for book in books:
+                copy.write_row(
+                    (
+                        book.title,
+                        book.author,
+                        book.cover,
+                        book.inventory,
+                        book.daily_fee,
+                        now,
+                    )
+                )
+        cursor.execute(
+            f"INSERT INTO {table} ({names}) "
+            f"SELECT {names} FROM books_import "
+            f"ON CONFLICT ({', '.join(map(quote, Book.NATURAL_KEY))}) "
+            f"DO UPDATE SET "
+            + ", ".join(
+                f"{quote(column)} = EXCLUDED.{quote(column)}"
+                for column in UPDATE_FIELDS
+            )
+        )
+
+
+def import_books(
+    rows, batch_size=1000, use_copy=False, max_errors=20, progress=None
+):
+    """
+    Validate and upsert rows batch_size at a time, each batch in its own
+    transaction, so memory is bounded by the batch and not the file.
+    Invalid rows are skipped and counted, the first max_errors of them
+    are kept in the result with their 1-based row number.
+    Duplicates of a natural key within a batch keep the last row.
+    """
+    if use_copy and not (connection.vendor == "postgresql" and is_psycopg3):
+        raise ValueError("COPY needs PostgreSQL with psycopg 3.")
+    write = copy_books if use_copy else upsert_books
+    result = ImportResult()
+    rows = iter(rows)
+
+    validator = BookImportSerializer()
+
+    while batch := list(islice(rows, batch_size)):
+        books = {}
+        for data in validate_batch(validator, batch, result, max_errors):
+            key = tuple(data[name] for name in Book.NATURAL_KEY)
+            books[key] = Book(**data)
+
+        if books:
+            with transaction.atomic():
+                write(list(books.values()))
+                catalog_changed.send(sender=Book)
+
+        result.rows += len(batch)
+        result.imported += len(books)
+        if progress:
+            progress(result)
+
+    return result
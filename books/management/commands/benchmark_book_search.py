@@ -0,0 +1,95 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from books.models import Book
+
+
+WORDS = (
+    "war peace night day river city garden house secret shadow "
+    "king queen island winter summer stone fire glass silent storm"
+).split()
+AUTHORS = (
+    "Orwell Tolstoy Austen Dickens Woolf Hemingway Tolkien Rowling "
+    "Christie Twain Bronte Kafka Camus Dostoevsky Fitzgerald"
+).split()
+
+
+class Command(BaseCommand):
+    """
+    Django command comparing ranked ?q= search with the icontains filter.
+    Synthetic books are generated inside a transaction that is
+    rolled back at the end, so the catalog stays untouched.
+    """
+
+    help = "Benchmark book search against the icontains filter"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--books", type=int, default=200_000)
+        parser.add_argument("--queries", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=5_000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+
+        with transaction.atomic():
+            self.stdout.write(f"Generating {options['books']} books...")
+            Book.objects.bulk_create(
+                (self.make_book(rng) for _ in range(options["books"])),
+                batch_size=options["batch_size"],
+                ignore_conflicts=True,
+            )
+            if connection.vendor == "postgresql":
+                with connection.cursor() as cursor:
+                    cursor.execute("ANALYZE books_book")
+
+            terms = [
+                rng.choice(WORDS + AUTHORS)
+                for _ in range(options["queries"])
+            ]
+
+            icontains = self.measure(
+                terms,
+                lambda term: Book.objects.filter(title__icontains=term)
+                | Book.objects.filter(author__icontains=term),
+            )
+            search = self.measure(
+                terms, lambda term: Book.objects.search(term)
+            )
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Database: {connection.vendor}")
+        self.report("icontains", icontains, len(terms))
+        self.report("search (?q=)", search, len(terms))
+
+    @staticmethod
+    def make_book(rng):
+        return Book(
+            title=" ".join(rng.sample(WORDS, 3)).title(),
+            author=f"{rng.choice(AUTHORS)} {rng.randint(1, 999)}",
+            cover=rng.choice(Book.CoverType.values),
+            inventory=rng.randint(0, 20),
+            daily_fee=f"{rng.randint(50, 500) / 100:.2f}",
+        )
+
+    @staticmethod
+    def measure(terms, build_queryset):
+        """Time the first page of a typical list request per term."""
+        started = time.perf_counter()
+        for term in terms:
+            queryset = build_queryset(term)
+            queryset.count()
+            list(queryset[:20])
+        return time.perf_counter() - started
+
+    def report(self, name, elapsed, queries):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{name:<14} {elapsed:8.3f}s total, "
+                f"{elapsed / queries * 1000:8.2f} ms per query"
+            )
+        )
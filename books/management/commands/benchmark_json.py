@@ -0,0 +1,101 @@
+import io
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from paid_library_service.parsers import FastJSONParser
+from paid_library_service.renderers import FastJSONRenderer, orjson
+
+
+class Command(BaseCommand):
+    """
+    Django command comparing DRF's stdlib JSON renderer and parser with
+    the orjson-backed ones on a page of borrowing-like rows
+    (Decimal fees, dates, nested book details).
+    """
+
+    help = "Benchmark JSON rendering and parsing"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        if orjson is None:
+            self.stdout.write(
+                self.style.WARNING(
+                    "orjson is not installed, both paths use the stdlib."
+                )
+            )
+
+        payload = {
+            "count": options["rows"],
+            "next": None,
+            "previous": None,
+            "results": [
+                self.make_row(index) for index in range(options["rows"])
+            ],
+        }
+        body = JSONRenderer().render(payload)
+        repeat = options["repeat"]
+
+        for name, renderer in (
+            ("stdlib", JSONRenderer()),
+            ("orjson", FastJSONRenderer()),
+        ):
+            self.report(
+                f"render {name}",
+                self.measure(repeat, lambda: renderer.render(payload)),
+                repeat,
+            )
+        for name, parser in (
+            ("stdlib", JSONParser()),
+            ("orjson", FastJSONParser()),
+        ):
+            self.report(
+                f"parse  {name}",
+                self.measure(
+                    repeat,
+                    lambda: parser.parse(
+                        io.BytesIO(body), "application/json", {}
+                    ),
+                ),
+                repeat,
+            )
+
+    @staticmethod
+    def make_row(index):
+        borrow_date = date(2026, 1, 1) + timedelta(days=index % 300)
+        return {
+            "id": index,
+            "borrow_date": borrow_date,
+            "expected_return_date": borrow_date + timedelta(days=14),
+            "actual_return_date": None if index % 3 else borrow_date,
+            "book": index,
+            "book_detail": {
+                "title": f"Book {index}",
+                "author": f"Author {index % 97}",
+                "cover": "HARD COVER",
+                "daily_fee": Decimal(index % 500) / 100,
+            },
+            "user": f"user{index % 50}@example.com",
+            "is_active": bool(index % 3),
+        }
+
+    @staticmethod
+    def measure(repeat, run):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            run()
+        return time.perf_counter() - started
+
+    def report(self, name, elapsed, repeat):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{name:<14} {elapsed / repeat * 1000:9.2f} ms per page"
+            )
+        )
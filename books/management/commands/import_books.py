@@ -0,0 +1,35 @@
+from books.importers import import_books
+from paid_library_service.importers import ImportCommand
+
+
+class Command(ImportCommand):
+    """
+    Django command streaming a catalog file (JSON array or loaddata
+    fixture, NDJSON, CSV) into the books table. Rows are validated and
+    upserted by (title, author, cover) in batches, so memory stays flat
+    whatever the size of the file.
+    """
+
+    help = "Import or update books from a JSON, NDJSON or CSV file"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--copy",
+            action="store_true",
+            help="Load batches with COPY into a staging table (Postgres)",
+        )
+
+    def import_rows(self, rows, progress, **options):
+        return import_books(
+            rows,
+            batch_size=options["batch_size"],
+            use_copy=options["copy"],
+            progress=progress,
+        )
+
+    def describe(self, result):
+        return (
+            f"Imported {result.imported} books from {result.rows} rows "
+            f"({result.invalid} invalid)"
+        )
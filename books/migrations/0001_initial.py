@@ -5,8 +5,6 @@ from django.db import migrations, models
 
 class Migration(migrations.Migration):
 
-    replaces = [("books", "0001_initial"), ("books", "0002_alter_book_cover")]
-
     initial = True
 
     dependencies = []
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.1 on 2026-10-17 13:01
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+SEARCH_INDEXES = [
+    django.contrib.postgres.indexes.GinIndex(
+        django.contrib.postgres.search.SearchVector(
+            "title", "author", config="english"
+        ),
+        name="book_search_vector_idx",
+    ),
+    django.contrib.postgres.indexes.GinIndex(
+        fields=["title"],
+        name="book_title_trgm_idx",
+        opclasses=["gin_trgm_ops"],
+    ),
+    django.contrib.postgres.indexes.GinIndex(
+        fields=["author"],
+        name="book_author_trgm_idx",
+        opclasses=["gin_trgm_ops"],
+    ),
+]
+
+
+def add_search_indexes(apps, schema_editor):
+    """GIN indexes exist only on Postgres, other databases keep the state."""
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Book = apps.get_model("books", "Book")
+    for index in SEARCH_INDEXES:
+        schema_editor.add_index(Book, index)
+
+
+def remove_search_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    Book = apps.get_model("books", "Book")
+    for index in SEARCH_INDEXES:
+        schema_editor.remove_index(Book, index)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0001_initial"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AddIndex(model_name="book", index=index)
+                for index in SEARCH_INDEXES
+            ],
+            database_operations=[
+                migrations.RunPython(
+                    add_search_indexes, remove_search_indexes
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.1 on 2026-10-17 15:50
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0002_book_search_indexes"),
+    ]
+
+    operations = [
+        # The GIN indexes leave the model state and stay in the database,
+        # otherwise SQLite tries to rebuild them on table remakes.
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.RemoveIndex(model_name="book", name=name)
+                for name in (
+                    "book_search_vector_idx",
+                    "book_title_trgm_idx",
+                    "book_author_trgm_idx",
+                )
+            ],
+        ),
+    ]
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.1 on 2026-10-17 13:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0002_book_search_indexes_state"),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="book",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("inventory__gte", 0)),
+                name="book_inventory_non_negative",
+            ),
+        ),
+    ]
@@ -0,0 +1,81 @@
+# Generated by Django 5.1.1 on 2026-10-17 13:49
+
+from django.db import migrations, models
+from django.db.models import Count, F, Min, Sum
+
+
+def merge_duplicate_books(apps, schema_editor):
+    """
+    Merge the books sharing a natural key into the oldest one, which
+    takes their borrowings and their inventory, so the constraint can
+    be added. Nothing is merged while duplicates differ in daily fee:
+    the migration fails listing them, to be fixed by hand first.
+    """
+    Book = apps.get_model("books", "Book")
+    Borrowing = apps.get_model("borrowings", "Borrowing")
+
+    duplicates = (
+        Book.objects.order_by()
+        .values("title", "author", "cover")
+        .annotate(
+            count=Count("id"),
+            fees=Count("daily_fee", distinct=True),
+            keep=Min("id"),
+        )
+        .filter(count__gt=1)
+    )
+    conflicts = [
+        sorted(
+            Book.objects.filter(
+                title=key["title"], author=key["author"], cover=key["cover"]
+            ).values_list("id", "daily_fee")
+        )
+        for key in duplicates
+        if key["fees"] > 1
+    ]
+    if conflicts:
+        raise ValueError(
+            "Duplicate books with different daily fees, give them the "
+            "same fee or another title before migrating (id, daily_fee): "
+            + "; ".join(
+                ", ".join(f"({pk}, {fee})" for pk, fee in books)
+                for books in conflicts
+            )
+        )
+
+    for key in duplicates:
+        books = Book.objects.filter(
+            title=key["title"], author=key["author"], cover=key["cover"]
+        ).exclude(pk=key["keep"])
+        ids = list(books.values_list("id", flat=True))
+        inventory = books.aggregate(total=Sum("inventory"))["total"]
+
+        Borrowing.objects.filter(book_id__in=ids).update(book_id=key["keep"])
+        Book.objects.filter(pk=key["keep"]).update(
+            inventory=F("inventory") + inventory
+        )
+        Book.objects.filter(pk__in=ids).delete()
+
+    if schema_editor.connection.vendor == "postgresql":
+        # Run the deferred foreign key checks before altering the table.
+        schema_editor.execute("SET CONSTRAINTS ALL IMMEDIATE")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0004_book_updated_at"),
+        ("borrowings", "0004_borrowing_updated_at"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            merge_duplicate_books, migrations.RunPython.noop
+        ),
+        migrations.AddConstraint(
+            model_name="book",
+            constraint=models.UniqueConstraint(
+                fields=("title", "author", "cover"), name="book_natural_key"
+            ),
+        ),
+    ]
@@ -1,4 +1,88 @@
-from django.db import models
+from django.contrib.postgres.search import (
+    SearchQuery,
+    SearchRank,
+    SearchVector,
+    TrigramSimilarity,
+)
+from django.db import connections, models
+from django.db.models import F, Q
+from django.db.models.functions import Greatest
+from django.utils import timezone
+
+from books.signals import catalog_changed
+
+
+SEARCH_CONFIG = "english"
+
+
+def book_search_vector():
+    """
+    Full-text vector over title and author.
+    Must stay identical to the expression of the "book_search_vector_idx"
+    GIN index (books/migrations/0002_book_search_indexes.py), otherwise
+    Postgres can't use the index for the match.
+    """
+    return SearchVector("title", "author", config=SEARCH_CONFIG)
+
+
+class BookQuerySet(models.QuerySet):
+    def search(self, text):
+        """
+        Ranked search by title and author.
+
+        On Postgres the text is matched against the full-text vector
+        and the trigram indexes (typos, partial words) and the books
+        are ordered by the best of both scores.
+        Other databases fall back to case-insensitive substring matching.
+        """
+        if connections[self.db].vendor != "postgresql":
+            return self.filter(
+                Q(title__icontains=text) | Q(author__icontains=text)
+            ).order_by("id")
+
+        query = SearchQuery(
+            text, config=SEARCH_CONFIG, search_type="websearch"
+        )
+        vector = book_search_vector()
+
+        return (
+            self.alias(search=vector)
+            .filter(
+                Q(search=query)
+                | Q(title__trigram_similar=text)
+                | Q(author__trigram_similar=text)
+            )
+            .annotate(
+                rank=Greatest(
+                    SearchRank(vector, query),
+                    TrigramSimilarity("title", text),
+                    TrigramSimilarity("author", text),
+                )
+            )
+            .order_by("-rank", "id")
+        )
+
+    def decrement_inventory(self, pk, copies=1):
+        """
+        Take copies of the book in a single conditional UPDATE.
+        Returns False when fewer copies were left. The row is locked only
+        from this statement until the end of the surrounding transaction.
+        """
+        updated = self.filter(pk=pk, inventory__gte=copies).update(
+            inventory=F("inventory") - copies, updated_at=timezone.now()
+        )
+        if updated:
+            catalog_changed.send(sender=Book)
+        return updated == 1
+
+    def increment_inventory(self, pk, copies=1):
+        """Put returned copies back in a single UPDATE."""
+        updated = self.filter(pk=pk).update(
+            inventory=F("inventory") + copies, updated_at=timezone.now()
+        )
+        if updated:
+            catalog_changed.send(sender=Book)
+        return updated
 
 
 class Book(models.Model):
@@ -11,6 +95,26 @@ class Book(models.Model):
     cover = models.CharField(max_length=10, choices=CoverType.choices)
     inventory = models.PositiveIntegerField()
     daily_fee = models.DecimalField(max_digits=5, decimal_places=2)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    # Unique (see the "book_natural_key" constraint), used by the
+    # import_books upsert and to report duplicates.
+    NATURAL_KEY = ("title", "author", "cover")
+
+    objects = BookQuerySet.as_manager()
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=Q(inventory__gte=0),
+                name="book_inventory_non_negative",
+            ),
+            # The fields of Book.NATURAL_KEY.
+            models.UniqueConstraint(
+                fields=["title", "author", "cover"],
+                name="book_natural_key",
+            ),
+        ]
 
     def __str__(self):
         return (
@@ -22,15 +126,13 @@ class Book(models.Model):
         """
         Decreases inventory by 1 when a book is borrowed.
         """
-        if self.inventory > 0:
-            self.inventory -= 1
-            self.save()
-        else:
+        if not Book.objects.decrement_inventory(self.pk):
             raise ValueError("No more copies available to borrow.")
+        self.refresh_from_db(fields=["inventory", "updated_at"])
 
     def return_book(self):
         """
         Increases inventory by 1 when a book is returned.
         """
-        self.inventory += 1
-        self.save()
+        Book.objects.increment_inventory(self.pk)
+        self.refresh_from_db(fields=["inventory", "updated_at"])
@@ -0,0 +1,150 @@
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+
+
+def pagination_setting(name):
+    return settings.LIBRARY_PAGINATION[name]
+
+
+class LibraryCursorPagination(CursorPagination):
+    """
+    Keyset pagination: every page is a "WHERE id > last_seen LIMIT n"
+    query, so deep pages cost the same as the first one.
+    The ordering is taken from the view's "cursor_ordering" and must be
+    unique, otherwise DRF falls back to offsets inside equal positions.
+    Query parameters that order the results their own way (e.g. a
+    ranked search) are listed in the view's "cursor_excluded_params"
+    and rejected, rather than silently re-sorted.
+    The total count is skipped unless the client asks for it with
+    ?count=true (or CURSOR_COUNT is enabled in settings).
+    """
+
+    page_size = 3
+    page_size_query_param = "page_size"
+    ordering = ("id",)
+    count_query_param = "count"
+
+    def __init__(self):
+        self.max_page_size = pagination_setting("MAX_PAGE_SIZE")
+        self.count = None
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, "cursor_ordering", self.ordering)
+
+    def include_count(self, request):
+        value = request.query_params.get(self.count_query_param)
+        if value is None:
+            return pagination_setting("CURSOR_COUNT")
+        return value.lower() == "true"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        for param in getattr(view, "cursor_excluded_params", ()):
+            if param in request.query_params:
+                raise ValidationError(
+                    {
+                        param: "Not supported with cursor pagination, "
+                               "use page numbers."
+                    }
+                )
+        if self.include_count(request):
+            self.count = queryset.count()
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if self.count is not None:
+            response.data = {"count": self.count, **response.data}
+        return response
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema["properties"]["count"] = {
+            "type": "integer",
+            "example": 123,
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.count_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Include the total count in cursor mode "
+                               "(true/false).",
+                "schema": {"type": "boolean"},
+            }
+        )
+        return parameters
+
+
+class LibraryPagination(PageNumberPagination):
+    """
+    Page number pagination with an opt-in cursor mode.
+
+    Requests with ?cursor= (or ?pagination=cursor for the first page)
+    are handed over to LibraryCursorPagination, every other request
+    keeps the classic page/count response.
+    """
+
+    page_size = 3
+    page_size_query_param = "page_size"
+    mode_query_param = "pagination"
+    cursor_pagination_class = LibraryCursorPagination
+
+    def __init__(self):
+        self.max_page_size = pagination_setting("MAX_PAGE_SIZE")
+        self.cursor_paginator = None
+
+    def use_cursor(self, request):
+        cursor_query_param = self.cursor_pagination_class.cursor_query_param
+        return (
+            cursor_query_param in request.query_params
+            or request.query_params.get(self.mode_query_param) == "cursor"
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.use_cursor(request):
+            self.cursor_paginator = self.cursor_pagination_class()
+            page = self.cursor_paginator.paginate_queryset(
+                queryset, request, view
+            )
+            self.display_page_controls = (
+                self.cursor_paginator.display_page_controls
+            )
+            return page
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def to_html(self):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.to_html()
+        return super().to_html()
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append(
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Use 'cursor' to switch to cursor "
+                               "pagination without a COUNT query.",
+                "schema": {"type": "string", "enum": ["cursor"]},
+            }
+        )
+        cursor_paginator = self.cursor_pagination_class()
+        parameters.extend(
+            parameter
+            for parameter in cursor_paginator.get_schema_operation_parameters(
+                view
+            )
+            if parameter["name"] != self.page_size_query_param
+        )
+        return parameters
@@ -0,0 +1,20 @@
+from django.db import connection, transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from books.cache import bump_catalog_version
+from books.models import Book
+from books.signals import catalog_changed
+
+
+@receiver(post_save, sender=Book)
+@receiver(post_delete, sender=Book)
+@receiver(catalog_changed, sender=Book)
+def invalidate_catalog_cache(sender, **kwargs):
+    """
+    Bump the catalog version right away and once more after the commit,
+    so a response computed from the old rows in between is not kept.
+    """
+    bump_catalog_version()
+    if connection.in_atomic_block:
+        transaction.on_commit(bump_catalog_version)
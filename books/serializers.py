@@ -1,9 +1,16 @@
+from collections import defaultdict
+
+from django.utils import timezone
 from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.settings import api_settings
 
 from books.models import Book
+from books.signals import catalog_changed
+from paid_library_service.serializers import SparseFieldsetMixin
 
 
-class BookListSerializer(serializers.ModelSerializer):
+class BookListSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ["id", "title", "author", "cover", "inventory", "daily_fee"]
@@ -19,3 +26,118 @@ class BookDetailBorrowingSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
         fields = ["title", "author", "cover", "daily_fee"]
+
+
+class BookBulkListSerializer(serializers.ListSerializer):
+    """
+    Bulk create, or partial update when the instance is a dict of books
+    by id (items then carry their "id"). All items are validated in one
+    pass and the natural key of all of them is checked with one query;
+    nothing is written if any item is invalid.
+    """
+
+    def run_validation(self, data=empty):
+        self._existing_keys = self.get_existing_keys(data)
+        self._seen_ids, self._seen_keys = set(), set()
+        return super().run_validation(data)
+
+    def get_existing_keys(self, data):
+        """Natural keys (and ids) of the books the items may clash with."""
+        titles = {
+            str(item["title"]).strip()
+            for item in (data if isinstance(data, list) else [])
+            if isinstance(item, dict) and "title" in item
+        }
+        titles.update(book.title for book in (self.instance or {}).values())
+        rows = Book.objects.filter(title__in=titles).values_list(
+            "pk", *Book.NATURAL_KEY
+        )
+        return {tuple(key): pk for pk, *key in rows}
+
+    def run_child_validation(self, data):
+        book = None
+        if self.instance is not None:
+            book = self.get_item_instance(data)
+            self.child.instance = book
+        attrs = self.child.run_validation(data)
+
+        key = tuple(
+            attrs[name] if name in attrs else getattr(book, name)
+            for name in Book.NATURAL_KEY
+        )
+        owner = self._existing_keys.get(key)
+        if key in self._seen_keys or owner not in (None, book and book.pk):
+            raise serializers.ValidationError(
+                {
+                    api_settings.NON_FIELD_ERRORS_KEY: [
+                        "A book with this title, author and cover "
+                        "already exists."
+                    ]
+                }
+            )
+        self._seen_keys.add(key)
+        if book is not None:
+            attrs["id"] = book.pk
+        return attrs
+
+    def get_item_instance(self, data):
+        try:
+            pk = int(data["id"])
+        except (KeyError, TypeError, ValueError):
+            raise serializers.ValidationError(
+                {"id": ["A valid book id is required."]}
+            )
+        if pk in self._seen_ids:
+            raise serializers.ValidationError(
+                {"id": ["Duplicate book id."]}
+            )
+        self._seen_ids.add(pk)
+        try:
+            return self.instance[pk]
+        except KeyError:
+            raise serializers.ValidationError({"id": ["Book not found."]})
+
+    def create(self, validated_data):
+        books = Book.objects.bulk_create(
+            Book(**attrs) for attrs in validated_data
+        )
+        catalog_changed.send(sender=Book)
+        return books
+
+    def update(self, instance, validated_data):
+        """
+        One bulk_update() per set of fields sent, so a book is written
+        only in the columns its item changed.
+        """
+        now = timezone.now()
+        groups = defaultdict(list)
+        books = []
+        for attrs in validated_data:
+            book = instance[attrs.pop("id")]
+            for name, value in attrs.items():
+                setattr(book, name, value)
+            book.updated_at = now
+            groups[tuple(sorted(attrs))].append(book)
+            books.append(book)
+        for fields, group in groups.items():
+            Book.objects.bulk_update(group, [*fields, "updated_at"])
+        catalog_changed.send(sender=Book)
+        return books
+
+
+class BookBulkSerializer(BookDetailSerializer):
+    """Item of the bulk endpoints, the natural key is checked per list."""
+
+    class Meta(BookDetailSerializer.Meta):
+        list_serializer_class = BookBulkListSerializer
+
+    def get_unique_together_validators(self):
+        return []
+
+
+class BookBulkDeleteSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=500,
+    )
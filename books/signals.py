@@ -0,0 +1,5 @@
+from django.dispatch import Signal
+
+
+# Sent by queryset updates that bypass post_save (e.g. inventory changes).
+catalog_changed = Signal()
@@ -0,0 +1,200 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.cache import catalog_version
+from books.models import Book
+from users.models import User
+
+
+class BookBulkTestCase(APITestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.books = [
+            Book.objects.create(
+                title=f"Book {index}",
+                author="Author",
+                cover=Book.CoverType.HARD,
+                inventory=index,
+                daily_fee="1.00",
+            )
+            for index in range(3)
+        ]
+        self.url = reverse("books:book-bulk")
+        self.client.force_authenticate(user=self.admin_user)
+
+    def new_book(self, title, **fields):
+        return {
+            "title": title,
+            "author": "Author",
+            "cover": Book.CoverType.SOFT,
+            "inventory": 2,
+            "daily_fee": "0.50",
+            **fields,
+        }
+
+    def test_bulk_create(self):
+        version = catalog_version()
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                self.url,
+                [self.new_book("New 1"), self.new_book("New 2")],
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [book["title"] for book in response.data], ["New 1", "New 2"]
+        )
+        self.assertTrue(all(book["id"] for book in response.data))
+        self.assertEqual(Book.objects.count(), 5)
+        self.assertEqual(
+            sum(
+                query["sql"].startswith("INSERT")
+                for query in queries.captured_queries
+            ),
+            1,
+        )
+        self.assertNotEqual(catalog_version(), version)
+
+    def test_bulk_create_reports_errors_per_item(self):
+        response = self.client.post(
+            self.url,
+            [
+                self.new_book("New 1"),
+                self.new_book("New 2", inventory=-1),
+                self.new_book("Book 0", cover=Book.CoverType.HARD),
+                self.new_book("New 1"),
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(len(response.data), 4)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("inventory", response.data[1])
+        self.assertIn("non_field_errors", response.data[2])
+        self.assertIn("non_field_errors", response.data[3])
+        self.assertEqual(Book.objects.count(), 3)
+
+    def test_bulk_create_limits(self):
+        for data in ([], {"title": "New"}):
+            response = self.client.post(self.url, data, format="json")
+
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+            self.assertIn("non_field_errors", response.data)
+
+    def test_bulk_partial_update(self):
+        first, second, third = self.books
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.patch(
+                self.url,
+                [
+                    {"id": first.id, "inventory": 10},
+                    {"id": second.id, "inventory": 20},
+                    {"id": third.id, "daily_fee": "3.00"},
+                ],
+                format="json",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book["inventory"] for book in response.data], [10, 20, 2]
+        )
+        updates = [
+            query["sql"]
+            for query in queries.captured_queries
+            if query["sql"].startswith("UPDATE")
+        ]
+        self.assertEqual(len(updates), 2)
+        self.assertTrue(all('"title"' not in sql for sql in updates))
+        self.assertIn('"daily_fee"', updates[1])
+        self.assertNotIn('"inventory"', updates[1])
+        for book in self.books:
+            book.refresh_from_db()
+        self.assertEqual([book.inventory for book in self.books], [10, 20, 2])
+        self.assertEqual(third.daily_fee, Decimal("3.00"))
+
+    def test_bulk_partial_update_reports_errors_per_item(self):
+        first, second, third = self.books
+
+        response = self.client.patch(
+            self.url,
+            [
+                {"id": first.id, "inventory": 10},
+                {"inventory": 1},
+                {"id": 999_999, "inventory": 1},
+                {"id": first.id, "inventory": 11},
+                {"id": second.id, "title": third.title},
+                {"id": third.id, "inventory": "many"},
+            ],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data[0], {})
+        for index in (1, 2, 3):
+            self.assertIn("id", response.data[index])
+        self.assertIn("non_field_errors", response.data[4])
+        self.assertIn("inventory", response.data[5])
+        first.refresh_from_db()
+        self.assertEqual(first.inventory, 0)
+
+    def test_bulk_partial_update_keeps_own_natural_key(self):
+        first = self.books[0]
+
+        response = self.client.patch(
+            self.url,
+            [{"id": first.id, "title": first.title, "inventory": 4}],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_bulk_delete(self):
+        first, second, _ = self.books
+
+        response = self.client.delete(
+            self.url, {"ids": [first.id, second.id]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(Book.objects.count(), 1)
+
+    def test_bulk_delete_reports_missing_books(self):
+        first = self.books[0]
+
+        response = self.client.delete(
+            self.url, {"ids": [first.id, 999_999]}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            [status.HTTP_204_NO_CONTENT, status.HTTP_404_NOT_FOUND],
+        )
+        self.assertFalse(Book.objects.filter(id=first.id).exists())
+
+    def test_admin_only(self):
+        user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.client.force_authenticate(user=user)
+
+        for method in ("post", "patch", "delete"):
+            response = getattr(self.client, method)(
+                self.url, [], format="json"
+            )
+
+            self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,102 @@
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.test import override_settings
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from users.models import User
+
+
+class BookCatalogCacheTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.book = Book.objects.create(
+            title="Cached Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=5,
+            daily_fee="1.00",
+        )
+        self.books_list_url = reverse("books:book-list")
+
+    def test_repeated_list_is_served_from_cache(self):
+        first = self.client.get(self.books_list_url)
+
+        with self.assertNumQueries(0):
+            second = self.client.get(self.books_list_url)
+
+        self.assertEqual(first["X-Cache"], "MISS")
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(first.data, second.data)
+
+    def test_query_params_are_normalized(self):
+        self.client.get(self.books_list_url, {"title": "cached", "page": 1})
+
+        response = self.client.get(
+            f"{self.books_list_url}?page=1&title=cached"
+        )
+        other = self.client.get(self.books_list_url, {"title": "other"})
+
+        self.assertEqual(response["X-Cache"], "HIT")
+        self.assertEqual(other["X-Cache"], "MISS")
+
+    def test_saving_a_book_invalidates_the_cache(self):
+        self.client.get(self.books_list_url)
+
+        Book.objects.create(
+            title="New Book",
+            author="Author",
+            cover=Book.CoverType.SOFT,
+            inventory=1,
+            daily_fee="1.00",
+        )
+        response = self.client.get(self.books_list_url)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["count"], 2)
+
+    def test_borrowing_invalidates_cached_inventory(self):
+        self.client.get(self.books_list_url)
+        user = User.objects.create_user(email="user@example.com")
+        self.client.force_authenticate(user=user)
+
+        self.client.post(
+            reverse("borrowings:borrowing-list"),
+            {
+                "book": self.book.id,
+                "expected_return_date": (
+                    localdate() + timedelta(days=7)
+                ).isoformat(),
+            },
+            format="json",
+        )
+        response = self.client.get(self.books_list_url)
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["results"][0]["inventory"], 4)
+
+    def test_errors_are_not_cached(self):
+        admin = User.objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.client.force_authenticate(user=admin)
+        url = reverse("books:book-detail", args=[self.book.id + 100])
+
+        self.client.get(url)
+        response = self.client.get(url)
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertNotEqual(response.get("X-Cache"), "HIT")
+
+    @override_settings(CATALOG_CACHE_TIMEOUT=0)
+    def test_timeout_bounds_staleness(self):
+        self.client.get(self.books_list_url)
+
+        response = self.client.get(self.books_list_url)
+
+        self.assertEqual(response["X-Cache"], "MISS")
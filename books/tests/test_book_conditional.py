@@ -0,0 +1,108 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from users.models import User
+
+
+class BookConditionalRequestTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.book = Book.objects.create(
+            title="Conditional Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=5,
+            daily_fee="1.00",
+        )
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.books_list_url = reverse("books:book-list")
+        self.book_detail_url = reverse(
+            "books:book-detail", args=[self.book.id]
+        )
+
+    def test_list_has_validators(self):
+        response = self.client.get(self.books_list_url)
+
+        self.assertTrue(response["ETag"].startswith('"'))
+        self.assertNotIn("Last-Modified", response)
+
+    def test_unchanged_list_is_not_modified(self):
+        etag = self.client.get(self.books_list_url)["ETag"]
+
+        with self.assertNumQueries(0):
+            response = self.client.get(
+                self.books_list_url, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response["ETag"], etag)
+        self.assertEqual(response.content, b"")
+
+    def test_detail_not_modified_since_last_modified(self):
+        self.client.force_authenticate(user=self.admin_user)
+        last_modified = self.client.get(self.book_detail_url)["Last-Modified"]
+
+        response = self.client.get(
+            self.book_detail_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_list_ignores_if_modified_since(self):
+        self.client.force_authenticate(user=self.admin_user)
+        last_modified = self.client.get(self.book_detail_url)["Last-Modified"]
+        etag = self.client.get(self.books_list_url)["ETag"]
+
+        Book.objects.filter(pk=self.book.pk).delete()
+        cache.clear()
+        response = self.client.get(
+            self.books_list_url, HTTP_IF_MODIFIED_SINCE=last_modified
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["results"], [])
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_inventory_change_changes_etag(self):
+        etag = self.client.get(self.books_list_url)["ETag"]
+
+        self.book.borrow_book()
+        response = self.client.get(
+            self.books_list_url, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_update_with_current_etag(self):
+        self.client.force_authenticate(user=self.admin_user)
+        etag = self.client.get(self.book_detail_url)["ETag"]
+
+        response = self.client.patch(
+            self.book_detail_url, {"inventory": 3}, HTTP_IF_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 3)
+
+    def test_update_with_stale_etag_fails(self):
+        self.client.force_authenticate(user=self.admin_user)
+        etag = self.client.get(self.book_detail_url)["ETag"]
+        self.client.patch(self.book_detail_url, {"inventory": 4})
+
+        response = self.client.patch(
+            self.book_detail_url, {"inventory": 3}, HTTP_IF_MATCH=etag
+        )
+
+        self.assertEqual(
+            response.status_code, status.HTTP_412_PRECONDITION_FAILED
+        )
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 4)
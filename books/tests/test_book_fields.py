@@ -0,0 +1,42 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from books.models import Book
+
+
+class BookSparseFieldsetTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=2,
+            daily_fee="1.00",
+        )
+        self.books_list_url = reverse("books:book-list")
+
+    def test_list_returns_and_selects_requested_fields(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.books_list_url, {"fields": "id,title,inventory"}
+            )
+
+        self.assertEqual(
+            list(response.data["results"][0]), ["id", "title", "inventory"]
+        )
+        sql = queries.captured_queries[-1]["sql"]
+        self.assertNotIn("author", sql)
+        self.assertNotIn("daily_fee", sql)
+
+    def test_fields_are_cached_separately(self):
+        self.client.get(self.books_list_url)
+
+        response = self.client.get(self.books_list_url, {"fields": "id"})
+
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(list(response.data["results"][0]), ["id"])
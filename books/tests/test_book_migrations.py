@@ -0,0 +1,78 @@
+from datetime import date
+
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+from users.models import User
+
+
+class MergeDuplicateBooksTestCase(TransactionTestCase):
+    before = [
+        ("books", "0004_book_updated_at"),
+        ("borrowings", "0004_borrowing_updated_at"),
+    ]
+    after = [("books", "0005_book_natural_key")]
+
+    def migrate(self, targets):
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+        return executor.loader.project_state(targets).apps
+
+    def tearDown(self):
+        executor = MigrationExecutor(connection)
+        executor.migrate(executor.loader.graph.leaf_nodes())
+
+    def test_duplicates_are_merged_into_the_oldest_book(self):
+        apps = self.migrate(self.before)
+        Book = apps.get_model("books", "Book")
+        Borrowing = apps.get_model("borrowings", "Borrowing")
+        user = User.objects.create_user(email="user@example.com")
+        kept, duplicate, other = (
+            Book.objects.create(
+                title="Dune",
+                author="Frank Herbert",
+                cover=cover,
+                inventory=inventory,
+                daily_fee="1.00",
+            )
+            for cover, inventory in (("HARD", 2), ("HARD", 3), ("SOFT", 1))
+        )
+        Borrowing.objects.create(
+            user_id=user.id,
+            book=duplicate,
+            borrow_date=date(2024, 5, 1),
+            expected_return_date=date(2024, 5, 10),
+        )
+
+        apps = self.migrate(self.after)
+        Book = apps.get_model("books", "Book")
+        Borrowing = apps.get_model("borrowings", "Borrowing")
+
+        self.assertEqual(
+            dict(Book.objects.values_list("id", "inventory")),
+            {kept.id: 5, other.id: 1},
+        )
+        self.assertEqual(Borrowing.objects.get().book_id, kept.id)
+
+    def test_duplicates_with_different_fees_abort_the_migration(self):
+        apps = self.migrate(self.before)
+        Book = apps.get_model("books", "Book")
+        books = [
+            Book.objects.create(
+                title="Dune",
+                author="Frank Herbert",
+                cover="HARD",
+                inventory=1,
+                daily_fee=daily_fee,
+            )
+            for daily_fee in ("1.00", "2.00")
+        ]
+
+        with self.assertRaisesMessage(ValueError, f"({books[1].id}, 2.00)"):
+            self.migrate(self.after)
+
+        self.assertEqual(Book.objects.count(), 2)
+        # Lets tearDown migrate forward.
+        Book.objects.filter(pk=books[1].pk).update(daily_fee="1.00")
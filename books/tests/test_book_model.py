@@ -1,3 +1,5 @@
+from django.db import IntegrityError, transaction
+from django.db.models import F
 from django.test import TestCase
 
 from books.models import Book
@@ -44,3 +46,25 @@ class BookInventoryTests(TestCase):
 
         with self.assertRaises(ValueError):
             self.book.borrow_book()
+
+    def test_decrement_inventory_stops_at_zero(self):
+        """
+        Test the conditional decrement takes copies only while any are left.
+        """
+        results = [
+            Book.objects.decrement_inventory(self.book.pk)
+            for _ in range(self.book.inventory + 1)
+        ]
+        self.book.refresh_from_db()
+
+        self.assertEqual(results, [True] * 5 + [False])
+        self.assertEqual(self.book.inventory, 0)
+
+    def test_negative_inventory_is_rejected_by_database(self):
+        """
+        Test the check constraint forbids an inventory below zero.
+        """
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            Book.objects.filter(pk=self.book.pk).update(
+                inventory=F("inventory") - 6
+            )
@@ -0,0 +1,84 @@
+from unittest import skipUnless
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+
+
+class BookSearchTestCase(APITestCase):
+
+    def setUp(self):
+        self.gatsby = Book.objects.create(
+            title="The Great Gatsby",
+            author="F. Scott Fitzgerald",
+            cover="SOFT",
+            inventory=5,
+            daily_fee="1.00",
+        )
+        self.orwell = Book.objects.create(
+            title="1984",
+            author="George Orwell",
+            cover="HARD",
+            inventory=10,
+            daily_fee="1.50",
+        )
+        self.animal_farm = Book.objects.create(
+            title="Animal Farm",
+            author="George Orwell",
+            cover="SOFT",
+            inventory=8,
+            daily_fee="1.25",
+        )
+        self.books_list_url = reverse("books:book-list")
+
+    def test_search_matches_title(self):
+        response = self.client.get(self.books_list_url, {"q": "gatsby"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book["id"] for book in response.data["results"]],
+            [self.gatsby.id],
+        )
+
+    def test_search_matches_author(self):
+        response = self.client.get(self.books_list_url, {"q": "orwell"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {book["id"] for book in response.data["results"]},
+            {self.orwell.id, self.animal_farm.id},
+        )
+
+    def test_search_combined_with_title_filter(self):
+        response = self.client.get(
+            self.books_list_url, {"q": "orwell", "title": "farm"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [book["id"] for book in response.data["results"]],
+            [self.animal_farm.id],
+        )
+
+    def test_search_with_no_results(self):
+        response = self.client.get(self.books_list_url, {"q": "tolkien"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data["results"]), 0)
+
+    @skipUnless(connection.vendor == "postgresql", "Postgres search only")
+    def test_search_ranks_best_match_first(self):
+        response = self.client.get(
+            self.books_list_url, {"q": "animal farm orwell"}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"][0]["id"], self.animal_farm.id
+        )
+
+    @skipUnless(connection.vendor == "postgresql", "Postgres search only")
+    def test_search_tolerates_typos(self):
+        response = self.client.get(self.books_list_url, {"q": "great gatsbby"})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["results"][0]["id"], self.gatsby.id
+        )
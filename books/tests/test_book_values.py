@@ -0,0 +1,39 @@
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from books.serializers import BookListSerializer
+
+
+class BookValuesListTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        for index, fee in enumerate(["1", "2.5", "0.99"]):
+            Book.objects.create(
+                title=f"Book {index}",
+                author="Author",
+                cover=Book.CoverType.SOFT,
+                inventory=index,
+                daily_fee=fee,
+            )
+        self.books_list_url = reverse("books:book-list")
+
+    def test_list_is_byte_identical_to_serializer(self):
+        response = self.client.get(self.books_list_url, {"page_size": 10})
+
+        expected = BookListSerializer(Book.objects.all(), many=True).data
+        self.assertEqual(
+            JSONRenderer().render(response.data["results"]),
+            JSONRenderer().render(expected),
+        )
+
+    def test_search_keeps_rank_order(self):
+        response = self.client.get(self.books_list_url, {"q": "book 2"})
+
+        self.assertEqual(
+            [item["id"] for item in response.data["results"]],
+            [book.id for book in Book.objects.search("book 2")],
+        )
@@ -102,6 +102,7 @@ class BookViewSetPermissionsTest(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
+        data["title"] = "Updated Book"
         response = self.client.put(
             self.book_detail_url, data, **self.get_jwt_token(self.admin_user)
         )
@@ -112,6 +113,22 @@ class BookViewSetPermissionsTest(APITestCase):
         )
         self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
 
+    def test_duplicate_book_is_rejected(self):
+        data = {
+            "title": "New Book",
+            "author": "Author",
+            "cover": "HARD COVER",
+            "inventory": 5,
+            "daily_fee": "4.99",
+        }
+        token = self.get_jwt_token(self.admin_user)
+        self.client.post(self.books_list_url, data, **token)
+
+        response = self.client.post(self.books_list_url, data, **token)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("non_field_errors", response.data)
+
     def test_authenticated_non_admin_user_cannot_partial_update_book(self):
         data = {"title": "Updated Title"}
         response = self.client.patch(
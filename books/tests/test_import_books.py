@@ -0,0 +1,255 @@
+import io
+import json
+import os
+import tempfile
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+from books.importers import import_books
+from books.models import Book
+from books.signals import catalog_changed
+from paid_library_service.importers import (
+    InvalidRow,
+    read_json_array,
+    read_rows,
+)
+
+
+ROWS = [
+    {
+        "title": "Dune",
+        "author": "Frank Herbert",
+        "cover": "HARD",
+        "inventory": 3,
+        "daily_fee": "1.50",
+    },
+    {
+        "title": "Emma",
+        "author": "Jane Austen",
+        "cover": "SOFT COVER",
+        "inventory": 2,
+        "daily_fee": "0.99",
+    },
+]
+
+
+class ReadRowsTestCase(TestCase):
+
+    def test_json_array_is_read_in_chunks(self):
+        text = json.dumps(ROWS, indent=2)
+
+        for chunk_size in (1, 7, 1 << 16):
+            self.assertEqual(
+                list(read_json_array(io.StringIO(text), chunk_size)), ROWS
+            )
+
+    def test_empty_json_array(self):
+        self.assertEqual(list(read_json_array(io.StringIO(" [ ] "))), [])
+
+    def test_json_must_be_an_array(self):
+        with self.assertRaises(ValueError):
+            list(read_json_array(io.StringIO('{"title": "Dune"}')))
+
+    def test_truncated_json_array(self):
+        with self.assertRaises(ValueError):
+            list(read_json_array(io.StringIO(json.dumps(ROWS)[:-1])))
+
+    def test_malformed_json_array_item_is_not_buffered(self):
+        text = '[{"title": "Dune",, "author": "x"}, ' + " " * 100_000 + "]"
+        stream = io.StringIO(text)
+
+        with self.assertRaises(ValueError):
+            list(read_json_array(stream, chunk_size=1000, max_item_size=5000))
+
+        self.assertLess(stream.tell(), 10_000)
+
+    def test_ndjson_skips_blank_lines(self):
+        text = "\n".join(json.dumps(row) for row in ROWS) + "\n\n"
+
+        self.assertEqual(list(read_rows(io.StringIO(text), "ndjson")), ROWS)
+
+    def test_malformed_ndjson_lines_are_invalid_rows(self):
+        text = f"{json.dumps(ROWS[0])}\n{{oops\n{json.dumps(ROWS[1])}\n"
+
+        rows = list(read_rows(io.StringIO(text), "ndjson"))
+        result = import_books(rows)
+
+        self.assertIsInstance(rows[1], InvalidRow)
+        self.assertEqual((result.imported, result.invalid), (2, 1))
+        self.assertEqual(result.errors[0][0], 2)
+        self.assertIn("Invalid JSON", str(result.errors[0][1]))
+
+    def test_csv(self):
+        text = (
+            "title,author,cover,inventory,daily_fee\r\n"
+            '"Dune, Messiah",Frank Herbert,HARD,3,1.50\r\n'
+        )
+
+        rows = list(read_rows(io.StringIO(text), "csv"))
+
+        self.assertEqual(rows[0]["title"], "Dune, Messiah")
+        self.assertEqual(rows[0]["inventory"], "3")
+
+
+class ImportBooksTestCase(TestCase):
+
+    def test_rows_are_created(self):
+        result = import_books(ROWS)
+
+        self.assertEqual((result.rows, result.imported), (2, 2))
+        book = Book.objects.get(title="Dune")
+        self.assertEqual(book.cover, Book.CoverType.HARD)
+        self.assertEqual(book.daily_fee, Decimal("1.50"))
+        self.assertEqual(
+            Book.objects.get(title="Emma").cover, Book.CoverType.SOFT
+        )
+
+    def test_existing_books_are_updated(self):
+        book = Book.objects.create(
+            title="Dune",
+            author="Frank Herbert",
+            cover=Book.CoverType.HARD,
+            inventory=10,
+            daily_fee="5.00",
+        )
+        updated_at = book.updated_at
+
+        import_books(ROWS)
+
+        book.refresh_from_db()
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual(book.inventory, 3)
+        self.assertEqual(book.daily_fee, Decimal("1.50"))
+        self.assertGreater(book.updated_at, updated_at)
+
+    def test_last_duplicate_in_a_batch_wins(self):
+        rows = [ROWS[0], {**ROWS[0], "inventory": 7}]
+
+        result = import_books(rows)
+
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(Book.objects.get().inventory, 7)
+
+    def test_invalid_rows_are_skipped(self):
+        rows = [
+            {**ROWS[0], "cover": "PAPER"},
+            ROWS[1],
+            {**ROWS[0], "inventory": -1},
+        ]
+
+        result = import_books(rows, max_errors=1)
+
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.invalid, 2)
+        self.assertEqual(len(result.errors), 1)
+        number, errors = result.errors[0]
+        self.assertEqual(number, 1)
+        self.assertIn("cover", errors)
+
+    def test_batches(self):
+        rows = [{**ROWS[0], "title": f"Book {index}"} for index in range(5)]
+        seen = []
+        receiver = mock.Mock()
+        catalog_changed.connect(receiver, sender=Book)
+        self.addCleanup(catalog_changed.disconnect, receiver, sender=Book)
+
+        with CaptureQueriesContext(connection) as queries:
+            result = import_books(
+                rows,
+                batch_size=2,
+                progress=lambda result: seen.append(result.rows),
+            )
+
+        self.assertEqual(result.imported, 5)
+        self.assertEqual(seen, [2, 4, 5])
+        self.assertEqual(receiver.call_count, 3)
+        self.assertEqual(
+            sum(
+                query["sql"].startswith("INSERT")
+                for query in queries.captured_queries
+            ),
+            3,
+        )
+
+    def test_copy_needs_postgres(self):
+        if connection.vendor == "postgresql":
+            self.skipTest("COPY is available")
+
+        with self.assertRaises(ValueError):
+            import_books(ROWS, use_copy=True)
+
+
+class ImportBooksCommandTestCase(TestCase):
+
+    def write(self, suffix, text):
+        handle, path = tempfile.mkstemp(suffix=suffix)
+        with os.fdopen(handle, "w", encoding="utf-8") as stream:
+            stream.write(text)
+        self.addCleanup(os.remove, path)
+        return path
+
+    def call(self, *args):
+        out, err = io.StringIO(), io.StringIO()
+        call_command("import_books", *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_loaddata_fixture(self):
+        fixture = [
+            {"model": "books.book", "pk": index, "fields": row}
+            for index, row in enumerate(ROWS, start=1)
+        ]
+        path = self.write(".json", json.dumps(fixture))
+
+        out, _ = self.call(path)
+
+        self.assertIn("Imported 2 books from 2 rows (0 invalid)", out)
+        self.assertEqual(Book.objects.count(), 2)
+
+    def test_csv_with_errors(self):
+        path = self.write(
+            ".csv",
+            "\ufefftitle,author,cover,inventory,daily_fee\n"
+            "Dune,Frank Herbert,HARD,3,1.50\n"
+            "Emma,Jane Austen,HARD,many,0.99\n",
+        )
+
+        out, err = self.call(path)
+
+        self.assertIn("(1 invalid)", out)
+        self.assertIn("Row 2", err)
+        self.assertEqual(Book.objects.get().title, "Dune")
+
+    def test_format_option(self):
+        path = self.write(
+            ".txt", "\n".join(json.dumps(row) for row in ROWS)
+        )
+
+        with self.assertRaises(CommandError):
+            self.call(path)
+        self.call(path, "--format", "ndjson")
+
+        self.assertEqual(Book.objects.count(), 2)
+
+
+@skipUnless(connection.vendor == "postgresql", "COPY needs PostgreSQL")
+class CopyBooksTestCase(TransactionTestCase):
+
+    def test_copy_upserts_books(self):
+        Book.objects.create(
+            title="Dune",
+            author="Frank Herbert",
+            cover=Book.CoverType.HARD,
+            inventory=10,
+            daily_fee="5.00",
+        )
+
+        result = import_books(ROWS, use_copy=True)
+
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(Book.objects.count(), 2)
+        self.assertEqual(Book.objects.get(title="Dune").inventory, 3)
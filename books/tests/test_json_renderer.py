@@ -0,0 +1,89 @@
+import io
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from unittest import mock
+
+from django.test import SimpleTestCase
+from django.utils.translation import gettext_lazy
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+
+from paid_library_service import parsers, renderers
+from paid_library_service.parsers import FastJSONParser
+from paid_library_service.renderers import FastJSONRenderer
+
+
+PAYLOAD = {
+    "count": 2,
+    "results": [
+        {
+            "id": 1,
+            "title": "Grüße – “quoted”\u2028line",
+            "daily_fee": "1.50",
+            "fee": Decimal("1.5"),
+            "borrow_date": date(2026, 10, 17),
+            "updated_at": datetime(
+                2026, 10, 17, 13, 5, 1, 123456, tzinfo=timezone.utc
+            ),
+            "is_active": True,
+            "actual_return_date": None,
+        },
+    ],
+    "errors": {0: [ErrorDetail("Invalid.", code="invalid")]},
+    "detail": gettext_lazy("Not found."),
+    "big": 2**70,
+}
+
+
+class FastJSONRendererTestCase(SimpleTestCase):
+
+    def test_output_matches_json_renderer(self):
+        self.assertEqual(
+            FastJSONRenderer().render(PAYLOAD),
+            JSONRenderer().render(PAYLOAD),
+        )
+
+    def test_indent_falls_back_to_stdlib(self):
+        rendered = FastJSONRenderer().render(
+            PAYLOAD, "application/json; indent=4"
+        )
+
+        self.assertEqual(
+            rendered,
+            JSONRenderer().render(PAYLOAD, "application/json; indent=4"),
+        )
+
+    def test_works_without_orjson(self):
+        with mock.patch.object(renderers, "orjson", None):
+            rendered = FastJSONRenderer().render(PAYLOAD)
+
+        self.assertEqual(rendered, JSONRenderer().render(PAYLOAD))
+
+
+class FastJSONParserTestCase(SimpleTestCase):
+
+    def parse(self, parser, body):
+        return parser.parse(io.BytesIO(body), "application/json", {})
+
+    def test_parses_like_json_parser(self):
+        body = '{"book": 1, "title": "Grüße", "fee": 1.5, "big": %d}' % (
+            2**70
+        )
+
+        for parser in (FastJSONParser(), JSONParser()):
+            self.assertEqual(
+                self.parse(parser, body.encode()),
+                {"book": 1, "title": "Grüße", "fee": 1.5, "big": 2**70},
+            )
+
+    def test_invalid_json_is_a_parse_error(self):
+        for body in (b'{"book": ', b'{"fee": NaN}', b"\xff"):
+            with self.assertRaises(ParseError):
+                self.parse(FastJSONParser(), body)
+
+    def test_works_without_orjson(self):
+        with mock.patch.object(parsers, "orjson", None):
+            data = self.parse(FastJSONParser(), b'{"book": 1}')
+
+        self.assertEqual(data, {"book": 1})
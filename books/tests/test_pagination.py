@@ -0,0 +1,118 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+from users.models import User
+
+
+class LibraryPaginationTestCase(APITestCase):
+
+    def setUp(self):
+        self.books = [
+            Book.objects.create(
+                title=f"Book {number}",
+                author="Author",
+                cover=Book.CoverType.SOFT,
+                inventory=5,
+                daily_fee="1.00",
+            )
+            for number in range(7)
+        ]
+        self.books_list_url = reverse("books:book-list")
+
+    def walk(self, url, params):
+        """Follow "next" links and return the ids of all pages."""
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        ids = [item["id"] for item in response.data["results"]]
+        while response.data["next"]:
+            response = self.client.get(response.data["next"])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            ids.extend(item["id"] for item in response.data["results"])
+        return ids
+
+    def test_page_number_pagination_is_default(self):
+        response = self.client.get(self.books_list_url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data["count"], 7)
+        self.assertEqual(len(response.data["results"]), 3)
+
+    def test_page_number_page_size_is_selectable(self):
+        response = self.client.get(self.books_list_url, {"page_size": 5})
+
+        self.assertEqual(len(response.data["results"]), 5)
+
+    def test_cursor_mode_walks_all_books_in_id_order(self):
+        ids = self.walk(self.books_list_url, {"pagination": "cursor"})
+
+        self.assertEqual(ids, [book.id for book in self.books])
+
+    def test_cursor_mode_skips_count_by_default(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                self.books_list_url, {"pagination": "cursor"}
+            )
+
+        self.assertNotIn("count", response.data)
+        self.assertFalse(
+            any("COUNT(" in query["sql"] for query in queries.captured_queries)
+        )
+
+    def test_cursor_mode_count_is_opt_in(self):
+        response = self.client.get(
+            self.books_list_url, {"pagination": "cursor", "count": "true"}
+        )
+
+        self.assertEqual(response.data["count"], 7)
+
+    def test_cursor_mode_page_size_is_capped(self):
+        with self.settings(
+            LIBRARY_PAGINATION={"MAX_PAGE_SIZE": 4, "CURSOR_COUNT": False}
+        ):
+            response = self.client.get(
+                self.books_list_url,
+                {"pagination": "cursor", "page_size": 50},
+            )
+
+        self.assertEqual(len(response.data["results"]), 4)
+
+    def test_cursor_mode_rejects_ranked_search(self):
+        response = self.client.get(
+            self.books_list_url, {"pagination": "cursor", "q": "Book"}
+        )
+        paged = self.client.get(self.books_list_url, {"q": "Book"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("q", response.data)
+        self.assertEqual(paged.status_code, status.HTTP_200_OK)
+        self.assertEqual(paged.data["count"], 7)
+
+    def test_cursor_mode_for_borrowings_newest_first(self):
+        user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        borrowings = [
+            Borrowing.objects.create(
+                user=user,
+                book=book,
+                expected_return_date=localdate() + timedelta(days=7),
+            )
+            for book in self.books
+        ]
+        self.client.force_authenticate(user=user)
+
+        ids = self.walk(
+            reverse("borrowings:borrowing-list"), {"pagination": "cursor"}
+        )
+
+        self.assertEqual(
+            ids, [borrowing.id for borrowing in reversed(borrowings)]
+        )
@@ -0,0 +1,118 @@
+import threading
+import time
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from paid_library_service.singleflight import (
+    CacheLock,
+    SingleFlight,
+    cached_read,
+)
+
+
+class SingleFlightTestCase(SimpleTestCase):
+
+    def test_concurrent_calls_share_one_result(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+        results = []
+
+        def slow():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "value"
+
+        def worker():
+            results.append(flight.do("key", slow))
+
+        leader = threading.Thread(target=worker)
+        leader.start()
+        started.wait(5)
+        waiters = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in waiters:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in [leader, *waiters]:
+            thread.join(5)
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(len(results), 5)
+        self.assertEqual({value for value, _ in results}, {"value"})
+        self.assertEqual(sum(not shared for _, shared in results), 1)
+        self.assertFalse(flight.in_flight("key"))
+
+    def test_error_is_raised_and_not_remembered(self):
+        flight = SingleFlight()
+
+        def fail():
+            raise ValueError("boom")
+
+        with self.assertRaises(ValueError):
+            flight.do("key", fail)
+
+        self.assertEqual(flight.do("key", lambda: 1), (1, False))
+
+
+class CachedReadTestCase(SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return self.calls
+
+    def test_miss_then_hit(self):
+        self.assertEqual(cached_read("k", self.compute, 60), (1, "MISS"))
+        self.assertEqual(cached_read("k", self.compute, 60), (1, "HIT"))
+        self.assertEqual(self.calls, 1)
+
+    def test_expired_value_is_refreshed_by_one_caller(self):
+        cached_read("k", self.compute, 0, stale_timeout=30)
+
+        self.assertEqual(
+            cached_read("k", self.compute, 0, stale_timeout=30), (2, "MISS")
+        )
+
+    def test_expired_value_is_served_while_refreshing(self):
+        cached_read("k", self.compute, 0, stale_timeout=30)
+        lock = CacheLock(cache, "k", 10)
+        lock.acquire()
+
+        value, state = cached_read("k", self.compute, 0, stale_timeout=30)
+
+        self.assertEqual((value, state), (1, "STALE"))
+        self.assertEqual(self.calls, 1)
+        lock.release()
+
+    def test_waits_for_value_computed_by_another_process(self):
+        lock = CacheLock(cache, "k", 10)
+        lock.acquire()
+
+        def other_process():
+            time.sleep(0.05)
+            cache.set("k", ("theirs", time.time() + 60), 60)
+            lock.release()
+
+        thread = threading.Thread(target=other_process)
+        thread.start()
+        value, state = cached_read("k", self.compute, 60, poll_interval=0.01)
+        thread.join(5)
+
+        self.assertEqual((value, state), ("theirs", "SHARED"))
+        self.assertEqual(self.calls, 0)
+
+    def test_computes_itself_when_the_lock_holder_is_gone(self):
+        CacheLock(cache, "k", 10).acquire()
+
+        value, state = cached_read(
+            "k", self.compute, 60, lock_timeout=0.05, poll_interval=0.01
+        )
+
+        self.assertEqual((value, state), (1, "MISS"))
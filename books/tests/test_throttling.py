@@ -0,0 +1,139 @@
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.throttling import SimpleRateThrottle
+
+from books.models import Book
+from paid_library_service.throttling import (
+    CacheThrottleStore,
+    SlidingWindowRateThrottle,
+    SQLiteThrottleStore,
+    get_throttle_store,
+)
+from users.models import User
+
+
+class ThrottleStoreTests:
+
+    def test_counts_roll_over_windows(self):
+        for _ in range(3):
+            counts = self.store.hit("key", 60, 60)
+        self.assertEqual(counts, (3, 0))
+
+        self.assertEqual(self.store.hit("key", 120, 60), (1, 3))
+        self.assertEqual(self.store.hit("key", 120, 60), (2, 3))
+        self.assertEqual(self.store.hit("key", 240, 60), (1, 0))
+        self.assertEqual(self.store.hit("other", 240, 60), (1, 0))
+
+
+class CacheThrottleStoreTestCase(ThrottleStoreTests, SimpleTestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.store = CacheThrottleStore()
+
+
+class SQLiteThrottleStoreTestCase(ThrottleStoreTests, SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = Path(directory.name) / "throttle.sqlite3"
+        self.store = SQLiteThrottleStore(self.path)
+
+    def test_counts_are_shared_between_stores_and_threads(self):
+        def worker():
+            store = SQLiteThrottleStore(self.path)
+            for _ in range(25):
+                store.hit("key", 60, 60)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.store.hit("key", 60, 60), (101, 0))
+
+    def test_expired_keys_are_pruned(self):
+        store = SQLiteThrottleStore(self.path, prune_every=1)
+        store.hit("idle", 60, 60)
+        store.hit("active", 240, 60)
+
+        rows = store.connect().execute("SELECT key FROM throttle").fetchall()
+
+        self.assertEqual(rows, [("active",)])
+
+    def test_store_is_built_from_settings(self):
+        config = {
+            "BACKEND": "paid_library_service.throttling.SQLiteThrottleStore",
+            "OPTIONS": {"path": str(self.path)},
+        }
+        with override_settings(THROTTLE_STORE=config):
+            self.assertIsInstance(get_throttle_store(), SQLiteThrottleStore)
+        self.assertIsInstance(get_throttle_store(), CacheThrottleStore)
+
+
+@mock.patch.dict(
+    SimpleRateThrottle.THROTTLE_RATES, {"catalog": "10/min", "anon": None}
+)
+@mock.patch.object(SlidingWindowRateThrottle, "timer")
+class CatalogThrottleTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.book = Book.objects.create(
+            title="Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=1,
+            daily_fee="1.00",
+        )
+        self.url = reverse("books:book-list")
+
+    def get_statuses(self, count):
+        return [self.client.get(self.url).status_code for _ in range(count)]
+
+    def test_previous_window_is_weighted_by_its_overlap(self, timer):
+        timer.return_value = 0
+        self.assertEqual(self.get_statuses(10), [status.HTTP_200_OK] * 10)
+
+        response = self.client.get(self.url)
+
+        self.assertEqual(
+            response.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(response["Retry-After"], "71")
+
+        # Half of the previous window (11 requests) still counts.
+        timer.return_value = 90
+        self.assertEqual(
+            self.get_statuses(5),
+            [status.HTTP_200_OK] * 4 + [status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+
+        timer.return_value = 240
+        self.assertEqual(self.get_statuses(10), [status.HTTP_200_OK] * 10)
+
+    def test_writes_are_not_in_the_catalog_scope(self, timer):
+        timer.return_value = 0
+        admin = User.objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.client.force_authenticate(user=admin)
+        self.get_statuses(11)
+
+        response = self.client.patch(
+            reverse("books:book-detail", args=[self.book.id]),
+            {"inventory": 2},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
@@ -1,21 +1,40 @@
-from rest_framework import viewsets
+from django.db import transaction
+from django.db.models import ProtectedError
+from django.shortcuts import get_object_or_404
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
 from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
 
 from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
     OpenApiParameter,
+    OpenApiResponse,
 )
 
+from books.cache import cached_catalog_response
 from books.models import Book
-from books.serializers import BookListSerializer, BookDetailSerializer
+from books.pagination import LibraryPagination
+from books.serializers import (
+    BookBulkDeleteSerializer,
+    BookBulkSerializer,
+    BookDetailSerializer,
+    BookListSerializer,
+)
+from borrowings.models import Reservation
+from borrowings.serializers import BookAvailabilitySerializer
+from paid_library_service.bulk import bulk_ids, bulk_response
+from paid_library_service.mixins import (
+    ConditionalRequestMixin,
+    Conflict,
+    QueryOptimizationMixin,
+)
+from paid_library_service.values import ValuesListMixin
 
 
-class LibraryPagination(PageNumberPagination):
-    page_size = 3
-    max_page_size = 20
+BILLED_BOOK = "The book has billed borrowings and can't be deleted."
 
 
 @extend_schema_view(
@@ -46,18 +65,38 @@ class LibraryPagination(PageNumberPagination):
     ),
     destroy=extend_schema(
         description="Delete a book. Accessible only to admin users.",
-        responses={204: None},
+        responses={
+            204: None,
+            409: OpenApiResponse(description="Book has billed borrowings"),
+        },
     ),
 )
-class BookViewSet(viewsets.ModelViewSet):
+class BookViewSet(
+    ValuesListMixin,
+    ConditionalRequestMixin,
+    QueryOptimizationMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet for managing books.
     Allows performing standard CRUD operations on books.
+    List and detail responses are cached and support conditional GET,
+    lists are rendered from .values() rows.
     """
 
     queryset = Book.objects.all()
     permission_classes = (IsAuthenticatedOrReadOnly,)
     pagination_class = LibraryPagination
+    cursor_ordering = ("id",)
+    # Ranked search results are ordered by rank, not by cursor_ordering.
+    cursor_excluded_params = ("q",)
+    bulk_max_size = 500
+
+    @property
+    def throttle_scope(self):
+        if self.action in ("list", "retrieve", "availability"):
+            return "catalog"
+        return None
 
     def get_permissions(self):
         if self.action in (
@@ -66,6 +105,7 @@ class BookViewSet(viewsets.ModelViewSet):
             "partial_update",
             "destroy",
             "retrieve",
+            "bulk",
         ):
             self.permission_classes = (IsAdminUser,)
         return super().get_permissions()
@@ -73,25 +113,39 @@ class BookViewSet(viewsets.ModelViewSet):
     def get_serializer_class(self):
         if self.action == "list":
             return BookListSerializer
+        if self.action == "bulk":
+            if self.request.method == "DELETE":
+                return BookBulkDeleteSerializer
+            return BookBulkSerializer
         return BookDetailSerializer
 
     def get_queryset(self):
         """Retrieve the book with filters"""
+        search = self.request.query_params.get("q")
         title = self.request.query_params.get("title")
         author = self.request.query_params.get("author")
 
         queryset = self.queryset
 
+        if search:
+            queryset = queryset.search(search)
+
         if title:
             queryset = queryset.filter(title__icontains=title)
 
         if author:
             queryset = queryset.filter(author__icontains=author)
 
-        return queryset.distinct()
+        return queryset
 
     @extend_schema(
         parameters=[
+            OpenApiParameter(
+                "q",
+                type=OpenApiTypes.STR,
+                description="Ranked search by book title and author "
+                            "(ex. ?q=orwell 1984), page numbers only",
+            ),
             OpenApiParameter(
                 "title",
                 type=OpenApiTypes.STR,
@@ -102,7 +156,156 @@ class BookViewSet(viewsets.ModelViewSet):
                 type=OpenApiTypes.STR,
                 description="Filter by book author " "(ex. ?author=fiction)",
             ),
+            OpenApiParameter(
+                "fields",
+                type=OpenApiTypes.STR,
+                description="Comma separated fields to return "
+                            "(ex. ?fields=id,title,inventory)",
+            ),
         ]
     )
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
+
+    @extend_schema(
+        description="Copies left, reservation queue and the estimated "
+                    "date the book can be borrowed, from the expected "
+                    "return dates of its active borrowings. Includes the "
+                    "place of your reservation when you have one.",
+        responses=BookAvailabilitySerializer,
+    )
+    @action(detail=True, methods=["get"])
+    def availability(self, request, pk=None):
+        book = get_object_or_404(Book.objects.only("inventory"), pk=pk)
+        return Response(
+            BookAvailabilitySerializer(
+                Reservation.objects.availability(book, request.user)
+            ).data
+        )
+
+    def conditional_response(self, request, get_validators, render):
+        return cached_catalog_response(
+            request, self.action, get_validators, render
+        )
+
+    @extend_schema(
+        methods=["POST"],
+        description="Create several books at once. "
+                    "Accessible only to admin users. All items are "
+                    "validated first and inserted with one query, "
+                    "nothing is created if any item is invalid "
+                    "(errors are listed per item, in request order).",
+        request=BookBulkSerializer(many=True),
+        responses={
+            201: BookDetailSerializer(many=True),
+            400: OpenApiResponse(description="Errors per item"),
+        },
+    )
+    @extend_schema(
+        methods=["PATCH"],
+        description="Partially update several books at once, every item "
+                    "has the book id and the fields to change. "
+                    "Accessible only to admin users. Books are written "
+                    "only in the fields sent, nothing is updated if any "
+                    "item is invalid (errors are listed per item).",
+        request=BookBulkSerializer(many=True, partial=True),
+        responses={
+            200: BookDetailSerializer(many=True),
+            400: OpenApiResponse(description="Errors per item"),
+        },
+    )
+    @extend_schema(
+        methods=["DELETE"],
+        description="Delete several books at once. "
+                    "Accessible only to admin users. "
+                    "The outcome is reported per book id.",
+        request=BookBulkDeleteSerializer,
+        responses={
+            200: OpenApiResponse(description="All books deleted"),
+            207: OpenApiResponse(
+                description="Some books not found or billed"
+            ),
+            400: OpenApiResponse(description="No book deleted"),
+        },
+    )
+    @action(detail=False, methods=["post", "patch", "delete"])
+    def bulk(self, request):
+        if request.method == "DELETE":
+            return self.bulk_destroy(request)
+
+        books = None
+        if request.method == "PATCH":
+            books = Book.objects.in_bulk(
+                bulk_ids(request.data, "id", self.bulk_max_size)
+            )
+        serializer = self.get_serializer(
+            books,
+            data=request.data,
+            many=True,
+            partial=books is not None,
+            allow_empty=False,
+            max_length=self.bulk_max_size,
+        )
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            serializer.save()
+        return Response(
+            serializer.data,
+            status=(
+                status.HTTP_200_OK
+                if books is not None
+                else status.HTTP_201_CREATED
+            ),
+        )
+
+    def perform_destroy(self, instance):
+        try:
+            instance.delete()
+        except ProtectedError:
+            raise Conflict(BILLED_BOOK)
+
+    def bulk_destroy(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data["ids"]))
+
+        with transaction.atomic():
+            books = Book.objects.filter(id__in=ids)
+            found = set(books.values_list("id", flat=True))
+            billed = set(
+                books.filter(borrowings__invoice_line__isnull=False)
+                .values_list("id", flat=True)
+                .distinct()
+            )
+            deleted = found - billed
+            if deleted:
+                try:
+                    Book.objects.filter(id__in=deleted).delete()
+                except ProtectedError:
+                    # Billed since the check above.
+                    raise Conflict(BILLED_BOOK)
+
+        results = []
+        for book_id in ids:
+            if book_id in deleted:
+                results.append(
+                    {"id": book_id, "status": status.HTTP_204_NO_CONTENT}
+                )
+            elif book_id in billed:
+                results.append(
+                    {
+                        "id": book_id,
+                        "status": status.HTTP_409_CONFLICT,
+                        "errors": {"detail": BILLED_BOOK},
+                    }
+                )
+            else:
+                results.append(
+                    {
+                        "id": book_id,
+                        "status": status.HTTP_404_NOT_FOUND,
+                        "errors": {"detail": "Not found."},
+                    }
+                )
+
+        return bulk_response(results)
@@ -1,5 +1,7 @@
 from django.contrib import admin
 
-from borrowings.models import Borrowing
+from borrowings.models import Borrowing, FineLedger, Reservation
 
 admin.site.register(Borrowing)
+admin.site.register(FineLedger)
+admin.site.register(Reservation)
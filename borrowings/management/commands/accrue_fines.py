@@ -0,0 +1,34 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+
+from borrowings.fines import accrue_fines
+
+
+class Command(BaseCommand):
+    """Django command to accrue fines for overdue borrowings"""
+
+    help = "Append fines for overdue days since the previous run"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--as-of",
+            type=date.fromisoformat,
+            help="Accrue up to this date (YYYY-MM-DD), today by default",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = accrue_fines(
+            as_of=options["as_of"], chunk_size=options["chunk_size"]
+        )
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Accrued {result.amount} $ for {result.days} days "
+                f"of {result.entries} overdue borrowings in {elapsed:.2f}s"
+            )
+        )
@@ -0,0 +1,125 @@
+import random
+import time
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils.timezone import localdate
+from rest_framework.renderers import JSONRenderer
+
+from books.models import Book
+from books.serializers import BookListSerializer
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingSerializer
+from borrowings.views import BorrowingViewSet
+from paid_library_service.mixins import build_query_plan
+from paid_library_service.values import ValuesRepresentation
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Django command comparing the serializer and the .values() list paths
+    on one large page of books and borrowings. Synthetic rows are
+    generated inside a transaction that is rolled back at the end.
+    """
+
+    help = "Benchmark serializer against .values() list rendering"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--rows", type=int, default=10_000)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        rows, repeat = options["rows"], options["repeat"]
+
+        with transaction.atomic():
+            self.stdout.write(f"Generating {rows} books and borrowings...")
+            user = User.objects.create_user(
+                email="benchmark@example.com", password=None
+            )
+            books = Book.objects.bulk_create(
+                Book(
+                    title=f"Book {index}",
+                    author=f"Author {rng.randint(1, 999)}",
+                    cover=rng.choice(Book.CoverType.values),
+                    inventory=rng.randint(0, 20),
+                    daily_fee=f"{rng.randint(50, 500) / 100:.2f}",
+                )
+                for index in range(rows)
+            )
+            today = localdate()
+            Borrowing.objects.bulk_create(
+                Borrowing(
+                    user=user,
+                    book=book,
+                    borrow_date=today,
+                    expected_return_date=today
+                    + timedelta(days=rng.randint(1, 30)),
+                    actual_return_date=rng.choice([None, today]),
+                )
+                for book in books
+            )
+
+            for serializer, model, annotations in (
+                (BookListSerializer, Book, {}),
+                (
+                    BorrowingSerializer,
+                    Borrowing,
+                    BorrowingViewSet.values_annotations,
+                ),
+            ):
+                queryset = model.objects.order_by("id")[:rows]
+                plain = self.measure(
+                    repeat, lambda: self.serialize(serializer, queryset)
+                )
+                values = self.measure(
+                    repeat,
+                    lambda: self.values(
+                        serializer, model, annotations, queryset
+                    ),
+                )
+                self.report(model.__name__, "serializer", plain, repeat)
+                self.report(model.__name__, ".values()", values, repeat)
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(f"Database: {connection.vendor}")
+
+    @staticmethod
+    def serialize(serializer_class, queryset):
+        serializer = serializer_class()
+        queryset = build_query_plan(serializer, queryset.model).apply(
+            queryset
+        )
+        return JSONRenderer().render(
+            serializer_class(queryset, many=True).data
+        )
+
+    @staticmethod
+    def values(serializer_class, model, annotations, queryset):
+        representation = ValuesRepresentation(
+            serializer_class(), model, annotations
+        )
+        return JSONRenderer().render(
+            representation.to_representation(
+                representation.values(queryset)
+            )
+        )
+
+    @staticmethod
+    def measure(repeat, render):
+        started = time.perf_counter()
+        for _ in range(repeat):
+            render()
+        return time.perf_counter() - started
+
+    def report(self, model, name, elapsed, repeat):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{model:<10} {name:<11} "
+                f"{elapsed / repeat * 1000:9.2f} ms per page"
+            )
+        )
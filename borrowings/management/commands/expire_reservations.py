@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+
+from borrowings.models import Reservation
+
+
+class Command(BaseCommand):
+    """Django command to pass on the copies of expired reservation holds"""
+
+    help = "Drop holds older than RESERVATION_HOLD_DAYS and pass them on"
+
+    def handle(self, *args, **options):
+        expired = Reservation.objects.expire_holds()
+        self.stdout.write(
+            self.style.SUCCESS(f"Expired {expired} reservation holds")
+        )
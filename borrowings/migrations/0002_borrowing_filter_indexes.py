@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-17 13:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0003_book_inventory_non_negative"),
+        ("borrowings", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterModelOptions(
+            name="borrowing",
+            options={"ordering": ["expected_return_date", "id"]},
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["user", "expected_return_date"],
+                name="borrowing_active_user_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                fields=["book", "actual_return_date"],
+                name="borrowing_book_return_idx",
+            ),
+        ),
+        migrations.AlterField(
+            model_name="borrowing",
+            name="book",
+            field=models.ForeignKey(
+                db_index=False,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="borrowings",
+                to="books.book",
+            ),
+        ),
+    ]
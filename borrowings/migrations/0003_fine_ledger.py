@@ -0,0 +1,64 @@
+# Generated by Django 5.1.1 on 2026-10-17 13:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("books", "0003_book_inventory_non_negative"),
+        ("borrowings", "0002_borrowing_filter_indexes"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FineLedger",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("accrued_from", models.DateField()),
+                ("accrued_to", models.DateField()),
+                ("days", models.PositiveIntegerField()),
+                ("amount", models.DecimalField(decimal_places=2, max_digits=10)),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name="borrowing",
+            name="fines_accrued_until",
+            field=models.DateField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="borrowing",
+            index=models.Index(
+                condition=models.Q(("actual_return_date__isnull", True)),
+                fields=["expected_return_date"],
+                name="borrowing_overdue_idx",
+            ),
+        ),
+        migrations.AddField(
+            model_name="fineledger",
+            name="borrowing",
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="fines",
+                to="borrowings.borrowing",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="fineledger",
+            constraint=models.UniqueConstraint(
+                fields=("borrowing", "accrued_to"), name="fine_ledger_unique_accrual"
+            ),
+        ),
+    ]
@@ -1,22 +1,69 @@
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
 from django.core.exceptions import ValidationError
+from django.utils import timezone
 from django.utils.timezone import localdate
 from django.utils.translation import gettext_lazy as _
-from django.db import models
+from django.db import models, transaction
 
 from books.models import Book
 from users.models import User
 
 
+class BorrowingQuerySet(models.QuerySet):
+    def active(self):
+        return self.filter(actual_return_date__isnull=True)
+
+    def mark_returned(self, return_date=None):
+        """
+        Close the active borrowings of the queryset in a single UPDATE.
+        Returns the number of borrowings that were still active.
+        """
+        return self.active().update(
+            actual_return_date=return_date or localdate(),
+            updated_at=timezone.now(),
+        )
+
+
 class Borrowing(models.Model):
     borrow_date = models.DateField(default=localdate)
     expected_return_date = models.DateField()
     actual_return_date = models.DateField(null=True, blank=True)
     book = models.ForeignKey(
-        Book, on_delete=models.CASCADE, related_name="borrowings"
+        Book,
+        on_delete=models.CASCADE,
+        related_name="borrowings",
+        db_index=False,
     )
     user = models.ForeignKey(
         User, on_delete=models.CASCADE, related_name="borrowings"
     )
+    fines_accrued_until = models.DateField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    objects = BorrowingQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["expected_return_date", "id"]
+        indexes = [
+            models.Index(
+                fields=["user", "expected_return_date"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_active_user_idx",
+            ),
+            # Leads with book_id, so it replaces the plain FK index.
+            models.Index(
+                fields=["book", "actual_return_date"],
+                name="borrowing_book_return_idx",
+            ),
+            models.Index(
+                fields=["expected_return_date"],
+                condition=models.Q(actual_return_date__isnull=True),
+                name="borrowing_overdue_idx",
+            ),
+        ]
 
     @property
     def is_active(self):
@@ -50,8 +97,194 @@ class Borrowing(models.Model):
                 }
             )
 
-    def save(self, *args, **kwargs):
+    def save(self, *args, validate=True, **kwargs):
+        """
+        Pass validate=False when the data was already validated
+        (e.g. by a serializer) to skip full_clean() and its FK lookups.
+        """
         if not self.borrow_date:
             self.borrow_date = localdate()
-        self.full_clean()
+        if validate:
+            self.full_clean()
         super().save(*args, **kwargs)
+
+
+class FineLedger(models.Model):
+    """
+    Append-only record of fines: every accrual run adds one entry
+    per overdue borrowing for the days since its previous entry.
+    """
+
+    borrowing = models.ForeignKey(
+        Borrowing, on_delete=models.CASCADE, related_name="fines"
+    )
+    accrued_from = models.DateField()
+    accrued_to = models.DateField()
+    days = models.PositiveIntegerField()
+    amount = models.DecimalField(max_digits=10, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["borrowing", "accrued_to"],
+                name="fine_ledger_unique_accrual",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"Fine {self.amount} $ for borrowing {self.borrowing_id}, "
+            f"{self.accrued_from} - {self.accrued_to}"
+        )
+
+
+class ReservationQuerySet(models.QuerySet):
+    def waiting(self):
+        return self.filter(status=Reservation.Status.WAITING)
+
+    def ready(self):
+        return self.filter(status=Reservation.Status.READY)
+
+    def release_copies(self, book_id, copies=1):
+        """
+        Hand returned copies to the oldest waiting reservations of the
+        book, the rest goes back to the inventory. Call it inside the
+        transaction returning the copies. Returns the number of copies
+        held for reservations.
+        """
+        # The book row is locked first, so no reservation joins the queue
+        # between reading its head and putting the rest in the inventory.
+        Book.objects.select_for_update().only("pk").get(pk=book_id)
+        head = self.waiting().filter(book_id=book_id).order_by(
+            "created_at", "id"
+        )[:copies]
+        held = self.waiting().filter(pk__in=head.values("pk")).update(
+            status=Reservation.Status.READY, ready_at=timezone.now()
+        )
+        if held < copies:
+            Book.objects.increment_inventory(book_id, copies - held)
+        return held
+
+    def expire_holds(self, now=None):
+        """
+        Drop the holds not borrowed within RESERVATION_HOLD_DAYS and pass
+        their copies on. Returns the number of expired holds.
+        """
+        cutoff = (now or timezone.now()) - timedelta(
+            days=settings.RESERVATION_HOLD_DAYS
+        )
+        with transaction.atomic():
+            expired = list(
+                self.ready()
+                .select_for_update()
+                .filter(ready_at__lt=cutoff)
+                .values_list("pk", "book_id")
+            )
+            self.filter(pk__in=[pk for pk, _ in expired]).delete()
+            copies = Counter(book_id for _, book_id in expired)
+            for book_id in sorted(copies):
+                self.release_copies(book_id, copies[book_id])
+        return len(expired)
+
+    def availability(self, book, user=None):
+        """
+        Copies left, queue length and the estimated date the book can be
+        borrowed by the user (or by a new reservation): the n-th place in
+        the queue gets the n-th active borrowing to come back, overdue
+        ones are expected today. None when there aren't enough borrowings
+        to estimate it.
+        """
+        today = localdate()
+        queue = self.waiting().filter(book=book)
+        reservation = None
+        if user is not None and user.is_authenticated:
+            reservation = self.filter(book=book, user=user).first()
+
+        data = {
+            "book": book.pk,
+            "inventory": book.inventory,
+            "queue_length": queue.count(),
+            "status": reservation and reservation.status,
+            "position": None,
+            "next_available_date": today,
+        }
+        if book.inventory > 0 or (
+            reservation and reservation.status == Reservation.Status.READY
+        ):
+            return data
+
+        if reservation:
+            data["position"] = position = (
+                queue.filter(
+                    models.Q(created_at__lt=reservation.created_at)
+                    | models.Q(
+                        created_at=reservation.created_at,
+                        id__lt=reservation.id,
+                    )
+                ).count()
+                + 1
+            )
+        else:
+            position = data["queue_length"] + 1
+        returns = (
+            Borrowing.objects.active()
+            .filter(book=book)
+            .order_by("expected_return_date")
+            .values_list("expected_return_date", flat=True)
+        )
+        expected = returns[position - 1:position].first()
+        data["next_available_date"] = expected and max(expected, today)
+        return data
+
+
+class Reservation(models.Model):
+    """
+    Place in the queue for an out-of-stock book. Returned copies go to
+    the oldest waiting reservation (READY, the copy is held for the user)
+    before the inventory.
+    """
+
+    class Status(models.TextChoices):
+        WAITING = "WAITING", "Waiting"
+        READY = "READY", "Ready"
+
+    book = models.ForeignKey(
+        Book,
+        on_delete=models.CASCADE,
+        related_name="reservations",
+        db_index=False,
+    )
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="reservations"
+    )
+    status = models.CharField(
+        max_length=7, choices=Status.choices, default=Status.WAITING
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    ready_at = models.DateTimeField(null=True, blank=True)
+
+    objects = ReservationQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["created_at", "id"]
+        constraints = [
+            # Leads with book_id, so it replaces the plain FK index.
+            models.UniqueConstraint(
+                fields=["book", "user"],
+                name="reservation_unique_book_user",
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["book", "created_at"],
+                condition=models.Q(status="WAITING"),
+                name="reservation_queue_idx",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.user.email} reserved {self.book.title} "
+            f"({self.status})"
+        )
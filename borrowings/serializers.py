@@ -1,11 +1,14 @@
+from django.core.exceptions import ValidationError as DjangoValidationError
 from rest_framework import serializers
+from rest_framework.validators import UniqueTogetherValidator
 
 from books.models import Book
-from borrowings.models import Borrowing
+from borrowings.models import Borrowing, Reservation
 from books.serializers import BookDetailBorrowingSerializer
+from paid_library_service.serializers import SparseFieldsetMixin
 
 
-class BorrowingSerializer(serializers.ModelSerializer):
+class BorrowingSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     book = serializers.PrimaryKeyRelatedField(queryset=Book.objects.all())
     book_detail = BookDetailBorrowingSerializer(source="book", read_only=True)
     user = serializers.ReadOnlyField(source="user.email")
@@ -25,6 +28,7 @@ class BorrowingSerializer(serializers.ModelSerializer):
             "user",
             "is_active",
         ]
+        expandable_fields = ["book_detail", "user"]
 
 
 class BorrowingCreateSerializer(serializers.ModelSerializer):
@@ -46,6 +50,43 @@ class BorrowingCreateSerializer(serializers.ModelSerializer):
             "is_active",
         ]
 
+    def validate(self, attrs):
+        """Run the model's clean() here, so save() can skip full_clean()."""
+        try:
+            Borrowing(**attrs).clean()
+        except DjangoValidationError as e:
+            raise serializers.ValidationError(e.message_dict)
+        return attrs
+
+    def create(self, validated_data):
+        borrowing = Borrowing(**validated_data)
+        borrowing.save(validate=False)
+        return borrowing
+
+
+class PrefetchedBookField(serializers.PrimaryKeyRelatedField):
+    """
+    Resolves the book from the "books" dict in the serializer context,
+    so a batch of items is validated with a single in_bulk() query.
+    """
+
+    def to_internal_value(self, data):
+        books = self.context.get("books")
+        if books is None:
+            return super().to_internal_value(data)
+        if isinstance(data, bool):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+        try:
+            return books[int(data)]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+        except (TypeError, ValueError):
+            self.fail("incorrect_type", data_type=type(data).__name__)
+
+
+class BorrowingBatchItemSerializer(BorrowingCreateSerializer):
+    book = PrefetchedBookField(queryset=Book.objects.all())
+
 
 class BorrowingUpdateSerializer(BorrowingSerializer):
 
@@ -72,3 +113,67 @@ class BorrowingUpdateSerializer(BorrowingSerializer):
             "manage_this_borrowing",
             "is_active",
         ]
+
+
+class BorrowingReturnSerializer(serializers.Serializer):
+    borrowings = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=100,
+    )
+
+
+class BorrowingExportSerializer(serializers.Serializer):
+    """Query params of the borrowings export."""
+
+    borrowed_from = serializers.DateField(required=False)
+    borrowed_to = serializers.DateField(required=False)
+
+    def validate(self, attrs):
+        borrowed_from = attrs.get("borrowed_from")
+        borrowed_to = attrs.get("borrowed_to")
+        if borrowed_from and borrowed_to and borrowed_from > borrowed_to:
+            raise serializers.ValidationError(
+                {"borrowed_to": "Must not be earlier than borrowed_from."}
+            )
+        return attrs
+
+
+class ReservationSerializer(serializers.ModelSerializer):
+    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+
+    class Meta:
+        model = Reservation
+        fields = ["id", "book", "user", "status", "created_at", "ready_at"]
+        read_only_fields = ["status", "ready_at"]
+        validators = [
+            UniqueTogetherValidator(
+                queryset=Reservation.objects.all(),
+                fields=["book", "user"],
+                message="You have already reserved this book.",
+            )
+        ]
+
+    def validate_book(self, book):
+        if book.inventory > 0:
+            raise serializers.ValidationError(
+                "The book is available, borrow it instead."
+            )
+        return book
+
+
+class BookAvailabilitySerializer(serializers.Serializer):
+    """Availability of a book for the requesting user."""
+
+    book = serializers.IntegerField()
+    inventory = serializers.IntegerField()
+    queue_length = serializers.IntegerField()
+    status = serializers.ChoiceField(
+        choices=Reservation.Status.choices,
+        allow_null=True,
+        help_text="Status of your reservation, if any",
+    )
+    position = serializers.IntegerField(
+        allow_null=True, help_text="Place of your reservation in the queue"
+    )
+    next_available_date = serializers.DateField(allow_null=True)
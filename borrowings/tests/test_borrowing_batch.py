@@ -0,0 +1,158 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowings.models import Borrowing, Reservation
+from users.models import User
+
+
+class BorrowingBatchTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.book = Book.objects.create(
+            title="Available Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=5,
+            daily_fee="1.00",
+        )
+        self.another_book = Book.objects.create(
+            title="Another Book",
+            author="Author",
+            cover=Book.CoverType.SOFT,
+            inventory=1,
+            daily_fee="1.50",
+        )
+        self.url = reverse("borrowings:borrowing-batch")
+        self.return_date = (localdate() + timedelta(days=7)).isoformat()
+        self.client.force_authenticate(user=self.user)
+
+    def item(self, book, expected_return_date=None):
+        return {
+            "book": book.id if isinstance(book, Book) else book,
+            "expected_return_date": expected_return_date or self.return_date,
+        }
+
+    def test_batch_creates_all_borrowings(self):
+        response = self.client.post(
+            self.url,
+            [self.item(self.book), self.item(self.book),
+             self.item(self.another_book)],
+            format="json",
+        )
+
+        self.book.refresh_from_db()
+        self.another_book.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            [201, 201, 201],
+        )
+        self.assertEqual(
+            response.data["results"][2]["borrowing"]["user"], self.user.email
+        )
+        self.assertEqual(self.book.inventory, 3)
+        self.assertEqual(self.another_book.inventory, 0)
+        self.assertEqual(Borrowing.objects.filter(user=self.user).count(), 3)
+
+    def test_batch_reports_errors_per_item(self):
+        response = self.client.post(
+            self.url,
+            [
+                self.item(self.book),
+                self.item(self.book, localdate() - timedelta(days=1)),
+                self.item(999999),
+                self.item(self.another_book),
+                self.item(self.another_book),
+            ],
+            format="json",
+        )
+
+        self.book.refresh_from_db()
+        self.another_book.refresh_from_db()
+        results = response.data["results"]
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [result["status"] for result in results], [201, 400, 400, 400, 400]
+        )
+        self.assertIn("expected_return_date", results[1]["errors"])
+        self.assertIn("book", results[2]["errors"])
+        self.assertIn("book", results[3]["errors"])
+        self.assertEqual(self.book.inventory, 4)
+        self.assertEqual(self.another_book.inventory, 1)
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_batch_without_any_success_is_bad_request(self):
+        Book.objects.filter(pk=self.book.pk).update(inventory=0)
+
+        response = self.client.post(
+            self.url, [self.item(self.book)], format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Borrowing.objects.exists())
+
+    def test_batch_requires_non_empty_list(self):
+        for payload in ([], self.item(self.book)):
+            response = self.client.post(self.url, payload, format="json")
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+    def test_batch_query_count(self):
+        """
+        One in_bulk() lookup, then SAVEPOINT, the holds lookup, one UPDATE
+        per book, one bulk INSERT and RELEASE SAVEPOINT.
+        """
+        payload = [self.item(self.book)] * 3 + [self.item(self.another_book)]
+
+        with self.assertNumQueries(7):
+            response = self.client.post(self.url, payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_batch_takes_the_held_copy_first(self):
+        Book.objects.filter(pk=self.another_book.pk).update(inventory=0)
+        Reservation.objects.create(
+            book=self.another_book,
+            user=self.user,
+            status=Reservation.Status.READY,
+        )
+
+        response = self.client.post(
+            self.url,
+            [self.item(self.another_book), self.item(self.book)],
+            format="json",
+        )
+
+        self.another_book.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.another_book.inventory, 0)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_batch_keeps_the_hold_when_the_book_fails(self):
+        Book.objects.filter(pk=self.another_book.pk).update(inventory=0)
+        Reservation.objects.create(
+            book=self.another_book,
+            user=self.user,
+            status=Reservation.Status.READY,
+        )
+
+        response = self.client.post(
+            self.url,
+            [self.item(self.another_book), self.item(self.another_book)],
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(Reservation.objects.ready().exists())
+        self.assertFalse(Borrowing.objects.filter(user=self.user).exists())
@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from unittest import skipUnless
+
+from django.db import connection, connections
+from django.test import TransactionTestCase
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from books.models import Book
+from borrowings.models import Borrowing, Reservation
+from users.models import User
+
+
+@skipUnless(
+    connection.vendor == "postgresql",
+    "Concurrent writers need a database with row-level locking",
+)
+class ConcurrentBorrowingTestCase(TransactionTestCase):
+
+    def setUp(self):
+        self.book = Book.objects.create(
+            title="Popular Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=3,
+            daily_fee="1.00",
+        )
+        self.users = [
+            User.objects.create_user(
+                email=f"user{number}@example.com", password="password"
+            )
+            for number in range(10)
+        ]
+
+    def borrow(self, user):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        try:
+            return client.post(
+                reverse("borrowings:borrowing-list"),
+                {
+                    "book": self.book.id,
+                    "expected_return_date": (
+                        localdate() + timedelta(days=7)
+                    ).isoformat(),
+                },
+                format="json",
+            ).status_code
+        finally:
+            connections.close_all()
+
+    def test_inventory_is_never_oversold(self):
+        with ThreadPoolExecutor(max_workers=len(self.users)) as executor:
+            statuses = list(executor.map(self.borrow, self.users))
+
+        self.book.refresh_from_db()
+
+        self.assertEqual(statuses.count(status.HTTP_201_CREATED), 3)
+        self.assertEqual(statuses.count(status.HTTP_400_BAD_REQUEST), 7)
+        self.assertEqual(self.book.inventory, 0)
+        self.assertEqual(Borrowing.objects.filter(book=self.book).count(), 3)
+
+    def batch_borrow(self, user, books):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        try:
+            return client.post(
+                reverse("borrowings:borrowing-batch"),
+                [
+                    {
+                        "book": book.id,
+                        "expected_return_date": (
+                            localdate() + timedelta(days=7)
+                        ).isoformat(),
+                    }
+                    for book in books
+                ],
+                format="json",
+            ).status_code
+        finally:
+            connections.close_all()
+
+    def test_batches_in_opposite_order_do_not_deadlock(self):
+        Book.objects.filter(pk=self.book.pk).update(inventory=100)
+        other_book = Book.objects.create(
+            title="Other Book",
+            author="Author",
+            cover=Book.CoverType.SOFT,
+            inventory=100,
+            daily_fee="1.00",
+        )
+        orders = [[self.book, other_book], [other_book, self.book]] * 5
+
+        with ThreadPoolExecutor(max_workers=len(orders)) as executor:
+            statuses = list(
+                executor.map(self.batch_borrow, self.users, orders)
+            )
+
+        self.assertEqual(statuses, [status.HTTP_201_CREATED] * len(orders))
+        self.assertEqual(
+            Book.objects.get(pk=other_book.pk).inventory, 100 - len(orders)
+        )
+
+    def return_or_reserve(self, user, borrowing):
+        client = APIClient()
+        client.force_authenticate(user=user)
+        try:
+            if borrowing is not None:
+                return client.patch(
+                    reverse("borrowings:borrowing-detail", args=[borrowing]),
+                    {"manage_this_borrowing": "return"},
+                    format="json",
+                ).status_code
+            return client.post(
+                reverse("borrowings:reservation-list"),
+                {"book": self.book.id},
+                format="json",
+            ).status_code
+        finally:
+            connections.close_all()
+
+    def test_returned_copies_are_not_kept_from_the_queue(self):
+        Book.objects.filter(pk=self.book.pk).update(inventory=0)
+        returning, reserving = self.users[:5], self.users[5:]
+        borrowings = [
+            Borrowing.objects.create(
+                user=user,
+                book=self.book,
+                expected_return_date=localdate() + timedelta(days=7),
+            ).id
+            for user in returning
+        ]
+
+        with ThreadPoolExecutor(max_workers=len(self.users)) as executor:
+            list(
+                executor.map(
+                    self.return_or_reserve,
+                    returning + reserving,
+                    borrowings + [None] * len(reserving),
+                )
+            )
+
+        self.book.refresh_from_db()
+        if self.book.inventory:
+            self.assertFalse(Reservation.objects.waiting().exists())
@@ -0,0 +1,119 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingSerializer
+from users.models import User
+
+
+class BorrowingConditionalRequestTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.another_user = User.objects.create_user(
+            email="another_user@example.com", password="password"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=2,
+            daily_fee="1.00",
+        )
+        self.borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=localdate() + timedelta(days=7),
+        )
+        self.url = reverse("borrowings:borrowing-list")
+        self.detail_url = reverse(
+            "borrowings:borrowing-detail", args=[self.borrowing.id]
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def test_unchanged_list_is_not_serialized(self):
+        etag = self.client.get(self.url, {"is_active": "true"})["ETag"]
+
+        with mock.patch.object(
+            BorrowingSerializer, "to_representation"
+        ) as to_representation:
+            response = self.client.get(
+                self.url, {"is_active": "true"}, HTTP_IF_NONE_MATCH=etag
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        to_representation.assert_not_called()
+
+    def test_return_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.client.patch(
+            self.detail_url, {"manage_this_borrowing": "return"}
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_book_change_changes_etag(self):
+        etag = self.client.get(self.url)["ETag"]
+
+        self.book.title = "Renamed Book"
+        self.book.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_email_change_changes_etags(self):
+        etags = [
+            self.client.get(url)["ETag"] for url in (self.url, self.detail_url)
+        ]
+
+        self.user.email = "renamed@example.com"
+        self.user.save()
+        responses = [
+            self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            for url, etag in zip((self.url, self.detail_url), etags)
+        ]
+
+        for response in responses:
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(responses[1].data["user"], "renamed@example.com")
+
+    def test_etag_depends_on_user(self):
+        etag = self.client.get(self.url, {"is_active": "false"})["ETag"]
+
+        self.client.force_authenticate(user=self.another_user)
+        response = self.client.get(
+            self.url, {"is_active": "false"}, HTTP_IF_NONE_MATCH=etag
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unchanged_detail_is_not_modified(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_delete_with_stale_etag_fails(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        Borrowing.objects.filter(pk=self.borrowing.pk).mark_returned()
+
+        response = self.client.delete(self.detail_url, HTTP_IF_MATCH=etag)
+
+        self.assertEqual(
+            response.status_code, status.HTTP_412_PRECONDITION_FAILED
+        )
+        self.assertTrue(
+            Borrowing.objects.filter(pk=self.borrowing.pk).exists()
+        )
@@ -0,0 +1,139 @@
+import csv
+import io
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+from paid_library_service.renderers import CSVRenderer
+from users.models import User
+
+
+class BorrowingExportTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.book = Book.objects.create(
+            title='Test, "Book"',
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=5,
+            daily_fee="1.50",
+        )
+        self.today = localdate()
+        self.borrowings = [
+            Borrowing.objects.create(
+                user=user,
+                book=self.book,
+                borrow_date=self.today - timedelta(days=days),
+                expected_return_date=self.today + timedelta(days=7),
+            )
+            for user, days in (
+                (self.user, 10),
+                (self.user, 5),
+                (self.admin_user, 0),
+            )
+        ]
+        Borrowing.objects.filter(pk=self.borrowings[0].pk).mark_returned()
+        self.url = reverse("borrowings:borrowing-export")
+        self.client.force_authenticate(user=self.admin_user)
+
+    def export(self, export_format, **params):
+        response = self.client.get(
+            self.url, {"format": export_format, **params}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b"".join(response.streaming_content).decode()
+
+    def ndjson(self, **params):
+        _, body = self.export("ndjson", **params)
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_ndjson_export(self):
+        response, body = self.export("ndjson")
+        rows = [json.loads(line) for line in body.splitlines()]
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(
+            [row["id"] for row in rows],
+            [borrowing.id for borrowing in self.borrowings],
+        )
+        self.assertEqual(
+            rows[0],
+            {
+                "id": self.borrowings[0].id,
+                "borrow_date": str(self.today - timedelta(days=10)),
+                "expected_return_date": str(self.today + timedelta(days=7)),
+                "actual_return_date": str(self.today),
+                "book_id": self.book.id,
+                "book_title": 'Test, "Book"',
+                "book_author": "Author",
+                "book_daily_fee": "1.50",
+                "user_id": self.user.id,
+                "user_email": "user@example.com",
+            },
+        )
+
+    def test_csv_export(self):
+        response, body = self.export("csv")
+
+        self.assertIn("borrowings.csv", response["Content-Disposition"])
+        rows = list(csv.DictReader(io.StringIO(body)))
+        self.assertEqual(len(rows), 3)
+        self.assertEqual(rows[0]["book_title"], 'Test, "Book"')
+        self.assertEqual(rows[1]["actual_return_date"], "")
+
+    @mock.patch.object(CSVRenderer, "flush_every", 2)
+    def test_rows_are_written_in_chunks(self):
+        response = self.client.get(self.url, {"format": "csv"})
+
+        chunks = list(response.streaming_content)
+
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[1].count(b"\n"), 1)
+
+    def test_filters(self):
+        active = self.ndjson(is_active="true")
+        by_user = self.ndjson(user_id=self.user.id)
+        by_date = self.ndjson(
+            borrowed_from=str(self.today - timedelta(days=6)),
+            borrowed_to=str(self.today - timedelta(days=1)),
+        )
+
+        self.assertEqual(len(active), 2)
+        self.assertEqual(len(by_user), 2)
+        self.assertEqual(
+            [row["id"] for row in by_date], [self.borrowings[1].id]
+        )
+
+    def test_invalid_date_range(self):
+        response = self.client.get(
+            self.url,
+            {
+                "format": "csv",
+                "borrowed_from": str(self.today),
+                "borrowed_to": str(self.today - timedelta(days=1)),
+            },
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn(b"borrowed_to", response.content)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(user=self.user)
+
+        response = self.client.get(self.url, {"format": "ndjson"})
+
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -0,0 +1,113 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+from users.models import User
+
+
+class BorrowingSparseFieldsetTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=2,
+            daily_fee="1.00",
+        )
+        self.borrowing = Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=localdate() + timedelta(days=7),
+        )
+        self.url = reverse("borrowings:borrowing-list")
+        self.detail_url = reverse(
+            "borrowings:borrowing-detail", args=[self.borrowing.id]
+        )
+        self.client.force_authenticate(user=self.user)
+
+    def get(self, url, params):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, params)
+        page_query = queries.captured_queries[-1]["sql"]
+        return response, page_query
+
+    def test_fields_drop_joins(self):
+        response, sql = self.get(self.url, {"fields": "id,book"})
+
+        self.assertEqual(list(response.data["results"][0]), ["id", "book"])
+        self.assertNotIn("books_book", sql)
+        self.assertNotIn("users_user", sql)
+
+    def test_empty_expand_drops_related_data(self):
+        response, sql = self.get(self.url, {"expand": ""})
+
+        item = response.data["results"][0]
+        self.assertNotIn("book_detail", item)
+        self.assertNotIn("user", item)
+        self.assertIn("expected_return_date", item)
+        self.assertNotIn("JOIN", sql)
+
+    def test_expand_one_relation(self):
+        response, sql = self.get(self.url, {"expand": "book_detail"})
+
+        item = response.data["results"][0]
+        self.assertEqual(item["book_detail"]["title"], "Test Book")
+        self.assertNotIn("user", item)
+        self.assertIn("books_book", sql)
+        self.assertNotIn("users_user", sql)
+
+    def test_detail_fields(self):
+        response, sql = self.get(self.detail_url, {"fields": "id,is_active"})
+
+        self.assertEqual(
+            response.data, {"id": self.borrowing.id, "is_active": True}
+        )
+        # Only the validators of the relations are read (see the ETag).
+        self.assertNotIn('"books_book"."title"', sql)
+        self.assertNotIn('"users_user"."first_name"', sql)
+
+    def test_sparse_detail_etag_is_valid_for_updates(self):
+        etag = self.client.get(self.detail_url, {"fields": "id"})["ETag"]
+
+        response = self.client.patch(
+            self.detail_url,
+            {"manage_this_borrowing": "return"},
+            HTTP_IF_MATCH=etag,
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_unknown_fields_are_rejected(self):
+        response = self.client.get(
+            self.url, {"fields": "id,password", "expand": "book"}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("fields", response.data)
+        self.assertIn("expand", response.data)
+
+    def test_empty_fields_keep_all_of_them(self):
+        full = self.client.get(self.url).data["results"]
+
+        for fields in ("", ","):
+            response = self.client.get(self.url, {"fields": fields})
+            self.assertEqual(response.data["results"], full)
+
+    def test_only_unknown_fields_are_rejected(self):
+        response = self.client.get(self.url, {"fields": "nope,other"})
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            str(response.data["fields"]), "Unknown fields: nope, other."
+        )
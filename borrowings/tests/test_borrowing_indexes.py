@@ -0,0 +1,53 @@
+from datetime import timedelta
+
+from django.db import connection
+from django.test import TestCase
+from django.utils.timezone import localdate
+
+from books.models import Book
+from borrowings.models import Borrowing
+from users.models import User
+
+
+class BorrowingIndexUsageTestCase(TestCase):
+    """
+    Fails when the planner stops using the borrowing filter indexes.
+    Sequential scans are disabled on Postgres, because on a tiny test
+    table they are always cheaper than any index.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com")
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=5,
+            daily_fee="1.00",
+        )
+        Borrowing.objects.create(
+            user=self.user,
+            book=self.book,
+            expected_return_date=localdate() + timedelta(days=7),
+        )
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def assertUsesIndex(self, queryset, index_name):
+        plan = queryset.explain()
+        self.assertIn(index_name, plan)
+
+    def test_active_borrowings_of_user_use_partial_index(self):
+        queryset = Borrowing.objects.filter(
+            user=self.user, actual_return_date__isnull=True
+        )
+
+        self.assertUsesIndex(queryset, "borrowing_active_user_idx")
+
+    def test_borrowings_of_book_use_composite_index(self):
+        queryset = Borrowing.objects.filter(
+            book=self.book, actual_return_date__isnull=True
+        )
+
+        self.assertUsesIndex(queryset, "borrowing_book_return_idx")
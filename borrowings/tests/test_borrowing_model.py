@@ -93,3 +93,16 @@ class BorrowingModelTest(TestCase):
         borrowing.save()
         borrowing.refresh_from_db()
         self.assertEqual(borrowing.actual_return_date, localdate())
+
+    def test_save_without_validation_skips_lookups(self):
+        """
+        Test that save(validate=False) runs only the INSERT.
+        """
+        borrowing = Borrowing(
+            book=self.book,
+            user=self.user,
+            expected_return_date=localdate() + timedelta(days=7),
+        )
+        with self.assertNumQueries(1):
+            borrowing.save(validate=False)
+        self.assertEqual(borrowing.borrow_date, localdate())
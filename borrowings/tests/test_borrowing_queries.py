@@ -0,0 +1,145 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingSerializer
+from paid_library_service.mixins import build_query_plan
+from users.models import User
+
+
+class BorrowingCreateQueryBudgetTestCase(APITestCase):
+    """
+    Pins the number of queries of POST /api/borrowings/:
+    SELECT book (validation), SAVEPOINT, DELETE the user's held copy
+    (none here), INSERT borrowing, conditional UPDATE of the inventory,
+    RELEASE SAVEPOINT.
+    """
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=5,
+            daily_fee="1.00",
+        )
+        self.url = reverse("borrowings:borrowing-list")
+        self.payload = {
+            "book": self.book.id,
+            "expected_return_date": (
+                localdate() + timedelta(days=7)
+            ).isoformat(),
+        }
+
+    def test_create_borrowing_query_count(self):
+        self.client.force_authenticate(user=self.user)
+
+        with self.assertNumQueries(6):
+            response = self.client.post(self.url, self.payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["user"], self.user.email)
+        self.assertEqual(response.data["book_detail"]["title"], "Test Book")
+        self.assertEqual(Borrowing.objects.count(), 1)
+
+    def test_create_borrowing_with_jwt_query_count(self):
+        """The token authentication adds the user lookup."""
+        token = RefreshToken.for_user(self.user).access_token
+
+        with self.assertNumQueries(7):
+            response = self.client.post(
+                self.url,
+                self.payload,
+                format="json",
+                HTTP_AUTHORIZE=f"Bearer {token}",
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+    def test_out_of_stock_query_count(self):
+        """
+        An empty shelf seen during validation is rejected right away,
+        after checking the user has no copy held for a reservation.
+        """
+        self.client.force_authenticate(user=self.user)
+        Book.objects.filter(pk=self.book.pk).update(inventory=0)
+
+        with self.assertNumQueries(2):
+            response = self.client.post(self.url, self.payload, format="json")
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(Borrowing.objects.exists())
+
+
+class BorrowingListQueryTestCase(APITestCase):
+
+    def setUp(self):
+        self.admin_user = User.objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.url = reverse("borrowings:borrowing-list")
+
+    def create_borrowings(self, count):
+        start = Borrowing.objects.count()
+        for number in range(start, start + count):
+            user = User.objects.create_user(email=f"user{number}@example.com")
+            book = Book.objects.create(
+                title=f"Book {number}",
+                author="Author",
+                cover=Book.CoverType.SOFT,
+                inventory=5,
+                daily_fee="1.00",
+            )
+            Borrowing.objects.create(
+                user=user,
+                book=book,
+                expected_return_date=localdate() + timedelta(days=7),
+            )
+
+    def test_query_plan_follows_serializer_fields(self):
+        plan = build_query_plan(BorrowingSerializer(), Borrowing)
+
+        self.assertEqual(plan.select_related, {"book", "user"})
+        self.assertEqual(plan.prefetch_related, set())
+        self.assertIn("book__title", plan.only)
+        self.assertIn("user__email", plan.only)
+        self.assertNotIn("book__inventory", plan.only)
+        self.assertNotIn("user__password", plan.only)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        self.client.force_authenticate(user=self.admin_user)
+        self.create_borrowings(3)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"page_size": 3})
+        self.assertEqual(len(response.data["results"]), 3)
+
+        self.create_borrowings(17)
+
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"page_size": 20})
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertTrue(
+            all(item["book_detail"] for item in response.data["results"])
+        )
+
+    def test_retrieve_query_count(self):
+        self.client.force_authenticate(user=self.admin_user)
+        self.create_borrowings(1)
+        borrowing = Borrowing.objects.get()
+
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse("borrowings:borrowing-detail", args=[borrowing.id])
+            )
+
+        self.assertEqual(response.data["user"], borrowing.user.email)
@@ -0,0 +1,169 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowings.fines import accrue_fines
+from borrowings.models import Borrowing
+from users.models import User
+
+
+class BorrowingReturnTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.another_user = User.objects.create_user(
+            email="another_user@example.com", password="password"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=2,
+            daily_fee="1.00",
+        )
+        self.another_book = Book.objects.create(
+            title="Another Book",
+            author="Author",
+            cover=Book.CoverType.SOFT,
+            inventory=0,
+            daily_fee="1.50",
+        )
+        self.borrowings = [
+            self.borrow(self.user, self.book),
+            self.borrow(self.user, self.book),
+            self.borrow(self.user, self.another_book),
+        ]
+        self.bulk_url = reverse("borrowings:borrowing-bulk-return")
+        self.client.force_authenticate(user=self.user)
+
+    @staticmethod
+    def borrow(user, book):
+        return Borrowing.objects.create(
+            user=user,
+            book=book,
+            expected_return_date=localdate() + timedelta(days=7),
+        )
+
+    def test_single_return_query_count(self):
+        """
+        SELECT the borrowing, SAVEPOINT, UPDATE the borrowing, lock the
+        book, UPDATE the head of the reservation queue, UPDATE the
+        inventory, RELEASE SAVEPOINT.
+        """
+        url = reverse(
+            "borrowings:borrowing-detail", args=[self.borrowings[0].id]
+        )
+
+        with self.assertNumQueries(7):
+            response = self.client.patch(
+                url, {"manage_this_borrowing": "return"}, format="json"
+            )
+
+        self.book.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data["actual_return_date"], localdate()
+        )
+        self.assertEqual(self.book.inventory, 3)
+
+    def test_late_returns_accrue_fines_up_to_the_return(self):
+        today = localdate()
+        Borrowing.objects.filter(
+            pk__in=[self.borrowings[0].pk, self.borrowings[2].pk]
+        ).update(expected_return_date=today - timedelta(days=3))
+        accrue_fines(as_of=today - timedelta(days=1))
+
+        self.client.patch(
+            reverse(
+                "borrowings:borrowing-detail", args=[self.borrowings[0].id]
+            ),
+            {"manage_this_borrowing": "return"},
+            format="json",
+        )
+        self.client.post(
+            self.bulk_url,
+            {"borrowings": [self.borrowings[1].id, self.borrowings[2].id]},
+            format="json",
+        )
+
+        fines = {
+            borrowing.id: list(
+                borrowing.fines.order_by("accrued_to").values_list(
+                    "days", "amount"
+                )
+            )
+            for borrowing in self.borrowings
+        }
+
+        self.assertEqual(
+            fines[self.borrowings[0].id],
+            [(2, Decimal("4.00")), (1, Decimal("2.00"))],
+        )
+        self.assertEqual(fines[self.borrowings[1].id], [])
+        self.assertEqual(
+            fines[self.borrowings[2].id],
+            [(2, Decimal("6.00")), (1, Decimal("3.00"))],
+        )
+
+    def test_bulk_return_groups_inventory_per_book(self):
+        """
+        One book lock, one reservation queue and one inventory UPDATE
+        per book.
+        """
+        ids = [borrowing.id for borrowing in self.borrowings]
+
+        with self.assertNumQueries(10):
+            response = self.client.post(
+                self.bulk_url, {"borrowings": ids}, format="json"
+            )
+
+        self.book.refresh_from_db()
+        self.another_book.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.book.inventory, 4)
+        self.assertEqual(self.another_book.inventory, 1)
+        self.assertFalse(Borrowing.objects.active().exists())
+
+    def test_bulk_return_reports_errors_per_borrowing(self):
+        Borrowing.objects.filter(pk=self.borrowings[1].pk).mark_returned()
+        foreign = self.borrow(self.another_user, self.book)
+
+        response = self.client.post(
+            self.bulk_url,
+            {
+                "borrowings": [
+                    self.borrowings[0].id,
+                    self.borrowings[1].id,
+                    foreign.id,
+                ]
+            },
+            format="json",
+        )
+
+        self.book.refresh_from_db()
+        foreign.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [result["status"] for result in response.data["results"]],
+            [200, 400, 404],
+        )
+        self.assertEqual(self.book.inventory, 3)
+        self.assertTrue(foreign.is_active)
+
+    def test_bulk_return_requires_ids(self):
+        response = self.client.post(
+            self.bulk_url, {"borrowings": []}, format="json"
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("borrowings", response.data)
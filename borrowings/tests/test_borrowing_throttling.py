@@ -0,0 +1,73 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework.throttling import SimpleRateThrottle
+
+from books.models import Book
+from users.models import User
+
+
+@mock.patch.dict(SimpleRateThrottle.THROTTLE_RATES, {"borrow": "2/hour"})
+class BorrowThrottleTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.book = Book.objects.create(
+            title="Available Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=5,
+            daily_fee="1.00",
+        )
+        self.url = reverse("borrowings:borrowing-list")
+        self.client.force_authenticate(user=self.user)
+
+    def borrow(self):
+        return self.client.post(
+            self.url,
+            {
+                "book": self.book.id,
+                "expected_return_date": localdate() + timedelta(days=7),
+            },
+            format="json",
+        )
+
+    def test_borrow_writes_have_their_own_budget(self):
+        statuses = [self.borrow().status_code for _ in range(3)]
+
+        self.assertEqual(
+            statuses,
+            [status.HTTP_201_CREATED] * 2
+            + [status.HTTP_429_TOO_MANY_REQUESTS],
+        )
+        batch = self.client.post(
+            reverse("borrowings:borrowing-batch"),
+            [{"book": self.book.id}],
+            format="json",
+        )
+        self.assertEqual(
+            batch.status_code, status.HTTP_429_TOO_MANY_REQUESTS
+        )
+        self.assertEqual(
+            self.client.get(self.url).status_code, status.HTTP_200_OK
+        )
+
+    def test_budget_is_per_user(self):
+        for _ in range(3):
+            self.borrow()
+
+        self.client.force_authenticate(
+            user=User.objects.create_user(
+                email="other@example.com", password="password"
+            )
+        )
+
+        self.assertEqual(self.borrow().status_code, status.HTTP_201_CREATED)
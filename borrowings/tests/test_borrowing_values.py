@@ -0,0 +1,100 @@
+from datetime import timedelta
+
+from django.core.exceptions import ImproperlyConfigured
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.timezone import localdate
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+from borrowings.serializers import BorrowingSerializer
+from borrowings.views import BorrowingViewSet
+from paid_library_service.values import ValuesRepresentation
+from users.models import User
+
+
+class BorrowingValuesRepresentationTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=2,
+            daily_fee="1.5",
+        )
+        for days in range(3):
+            Borrowing.objects.create(
+                user=self.user,
+                book=self.book,
+                expected_return_date=localdate() + timedelta(days=days),
+            )
+        Borrowing.objects.filter(
+            pk=Borrowing.objects.first().pk
+        ).mark_returned()
+        self.url = reverse("borrowings:borrowing-list")
+        self.client.force_authenticate(user=self.user)
+
+    def test_output_is_byte_identical(self):
+        representation = ValuesRepresentation(
+            BorrowingSerializer(),
+            Borrowing,
+            BorrowingViewSet.values_annotations,
+        )
+        queryset = Borrowing.objects.order_by("id")
+
+        expected = BorrowingSerializer(queryset, many=True).data
+        data = representation.to_representation(
+            representation.values(queryset)
+        )
+
+        self.assertEqual(
+            JSONRenderer().render(data), JSONRenderer().render(expected)
+        )
+
+    def test_list_is_served_from_values(self):
+        """COUNT, the ids of the page, then the values of its rows."""
+        with self.assertNumQueries(3):
+            response = self.client.get(self.url, {"page_size": 10})
+
+        expected = BorrowingSerializer(
+            Borrowing.objects.filter(user=self.user), many=True
+        ).data
+        self.assertEqual(
+            JSONRenderer().render(response.data["results"]),
+            JSONRenderer().render(expected),
+        )
+
+    def test_cursor_pagination_reads_values_rows(self):
+        response = self.client.get(
+            self.url, {"pagination": "cursor", "page_size": 2}
+        )
+        next_page = self.client.get(response.data["next"])
+
+        ids = [
+            item["id"]
+            for item in response.data["results"] + next_page.data["results"]
+        ]
+        self.assertEqual(
+            ids, sorted(Borrowing.objects.values_list("id", flat=True))[::-1]
+        )
+
+    def test_count_and_page_lookup_do_not_join(self):
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get(self.url, {"page_size": 2})
+
+        count, page, values = (query["sql"] for query in queries)
+        self.assertIn("COUNT", count)
+        self.assertNotIn("JOIN", count)
+        self.assertNotIn("JOIN", page)
+        self.assertIn("JOIN", values)
+
+    def test_property_without_annotation_is_rejected(self):
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesRepresentation(BorrowingSerializer(), Borrowing)
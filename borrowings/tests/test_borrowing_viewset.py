@@ -348,3 +348,26 @@ class BorrowingViewSetTestCase(APITestCase):
 
         self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
         self.assertIn("expected_return_date", response.data)
+
+    def test_cannot_borrow_book_without_inventory(self):
+        self.authenticate(self.user)
+        url = reverse("borrowings:borrowing-list")
+        borrowings_count = Borrowing.objects.count()
+
+        response = self.client.post(
+            url,
+            {
+                "book": self.book_no_inventory.id,
+                "expected_return_date": (
+                    localdate() + timedelta(days=7)
+                ).isoformat(),
+            },
+            format="json",
+        )
+
+        self.book_no_inventory.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("book", response.data)
+        self.assertEqual(self.book_no_inventory.inventory, 0)
+        self.assertEqual(Borrowing.objects.count(), borrowings_count)
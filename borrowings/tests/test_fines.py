@@ -0,0 +1,99 @@
+from datetime import timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils.timezone import localdate
+
+from books.models import Book
+from borrowings.fines import accrue_fines
+from borrowings.models import Borrowing, FineLedger
+from users.models import User
+
+
+class FineAccrualTestCase(TestCase):
+
+    def setUp(self):
+        self.today = localdate()
+        self.user = User.objects.create_user(email="user@example.com")
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=5,
+            daily_fee="1.50",
+        )
+        self.overdue = self.borrow(expected_days_ago=3)
+
+    def borrow(self, expected_days_ago, **extra):
+        borrowing = Borrowing(
+            user=self.user,
+            book=self.book,
+            borrow_date=self.today - timedelta(days=30),
+            expected_return_date=(
+                self.today - timedelta(days=expected_days_ago)
+            ),
+            **extra,
+        )
+        borrowing.save(validate=False)
+        return borrowing
+
+    def test_first_run_accrues_all_overdue_days(self):
+        result = accrue_fines(as_of=self.today)
+
+        entry = FineLedger.objects.get()
+        self.overdue.refresh_from_db()
+
+        self.assertEqual(result.entries, 1)
+        self.assertEqual(entry.days, 3)
+        self.assertEqual(entry.amount, Decimal("9.00"))
+        self.assertEqual(
+            entry.accrued_from, self.today - timedelta(days=2)
+        )
+        self.assertEqual(entry.accrued_to, self.today)
+        self.assertEqual(self.overdue.fines_accrued_until, self.today)
+
+    def test_repeated_run_appends_only_new_days(self):
+        accrue_fines(as_of=self.today)
+        repeated = accrue_fines(as_of=self.today)
+        next_day = accrue_fines(as_of=self.today + timedelta(days=1))
+
+        entries = list(
+            FineLedger.objects.order_by("accrued_to").values_list(
+                "days", "amount"
+            )
+        )
+
+        self.assertEqual(repeated.entries, 0)
+        self.assertEqual(next_day.entries, 1)
+        self.assertEqual(
+            entries, [(3, Decimal("9.00")), (1, Decimal("3.00"))]
+        )
+
+    def test_returned_and_not_overdue_borrowings_are_skipped(self):
+        self.borrow(expected_days_ago=-2)
+        self.borrow(expected_days_ago=0)
+        self.borrow(expected_days_ago=5, actual_return_date=self.today)
+
+        result = accrue_fines(as_of=self.today)
+
+        self.assertEqual(result.entries, 1)
+        self.assertEqual(FineLedger.objects.get().borrowing, self.overdue)
+
+    def test_chunks_cover_all_borrowings(self):
+        for _ in range(4):
+            self.borrow(expected_days_ago=1)
+
+        result = accrue_fines(as_of=self.today, chunk_size=2)
+
+        self.assertEqual(result.entries, 5)
+        self.assertEqual(result.days, 3 + 4)
+        self.assertEqual(FineLedger.objects.count(), 5)
+
+    def test_command_reports_accrual(self):
+        out = StringIO()
+
+        call_command("accrue_fines", as_of=self.today, stdout=out)
+
+        self.assertIn("Accrued 9.00 $ for 3 days", out.getvalue())
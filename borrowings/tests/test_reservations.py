@@ -0,0 +1,258 @@
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.urls import reverse
+from django.utils import timezone
+from django.utils.timezone import localdate
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowings.models import Borrowing, Reservation
+from borrowings.serializers import ReservationSerializer
+from users.models import User
+
+
+class ReservationTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.first, self.second = (
+            User.objects.create_user(
+                email=f"waiting{index}@example.com", password="password"
+            )
+            for index in range(2)
+        )
+        self.book = Book.objects.create(
+            title="Popular Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=0,
+            daily_fee="1.00",
+        )
+        self.today = localdate()
+        self.borrowings = [
+            Borrowing.objects.create(
+                user=self.user,
+                book=self.book,
+                expected_return_date=self.today + timedelta(days=days),
+            )
+            for days in (10, 3)
+        ]
+        self.url = reverse("borrowings:reservation-list")
+        self.availability_url = reverse(
+            "books:book-availability", args=[self.book.id]
+        )
+
+    def reserve(self, user, book=None):
+        self.client.force_authenticate(user=user)
+        return self.client.post(
+            self.url, {"book": (book or self.book).id}, format="json"
+        )
+
+    def return_borrowing(self, borrowing):
+        self.client.force_authenticate(user=borrowing.user)
+        return self.client.patch(
+            reverse("borrowings:borrowing-detail", args=[borrowing.id]),
+            {"manage_this_borrowing": "return"},
+            format="json",
+        )
+
+    def borrow(self, user):
+        self.client.force_authenticate(user=user)
+        return self.client.post(
+            reverse("borrowings:borrowing-list"),
+            {
+                "book": self.book.id,
+                "expected_return_date": self.today + timedelta(days=7),
+            },
+            format="json",
+        )
+
+    def test_reserve_out_of_stock_book(self):
+        response = self.reserve(self.first)
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], Reservation.Status.WAITING)
+
+    def test_cannot_reserve_available_book_or_twice(self):
+        self.reserve(self.first)
+        twice = self.reserve(self.first)
+        Book.objects.filter(pk=self.book.pk).update(inventory=1)
+        available = self.reserve(self.second)
+
+        self.assertEqual(twice.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(available.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("book", available.data)
+
+    def test_inventory_is_read_from_the_locked_book(self):
+        Book.objects.filter(pk=self.book.pk).update(inventory=1)
+
+        with mock.patch.object(
+            ReservationSerializer, "validate_book", lambda self, book: book
+        ):
+            response = self.reserve(self.first)
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertIn("book", response.data)
+        self.assertFalse(Reservation.objects.exists())
+
+    def test_returned_copy_goes_to_the_head_of_the_queue(self):
+        self.reserve(self.first)
+        self.reserve(self.second)
+
+        self.return_borrowing(self.borrowings[0])
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 0)
+        self.assertEqual(
+            dict(Reservation.objects.values_list("user", "status")),
+            {
+                self.first.id: Reservation.Status.READY,
+                self.second.id: Reservation.Status.WAITING,
+            },
+        )
+
+        self.assertEqual(
+            self.borrow(self.second).status_code,
+            status.HTTP_400_BAD_REQUEST,
+        )
+        self.assertEqual(
+            self.borrow(self.first).status_code, status.HTTP_201_CREATED
+        )
+        self.assertFalse(Reservation.objects.filter(user=self.first))
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 0)
+
+    def test_held_copy_is_borrowed_before_the_restocked_ones(self):
+        self.reserve(self.first)
+        self.return_borrowing(self.borrowings[0])
+        Book.objects.filter(pk=self.book.pk).update(inventory=2)
+
+        response = self.borrow(self.first)
+
+        self.book.refresh_from_db()
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(Reservation.objects.exists())
+        self.assertEqual(self.book.inventory, 2)
+
+    def test_bulk_return_serves_the_queue_first(self):
+        self.reserve(self.first)
+
+        self.client.force_authenticate(user=self.user)
+        response = self.client.post(
+            reverse("borrowings:borrowing-bulk-return"),
+            {"borrowings": [borrowing.id for borrowing in self.borrowings]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.inventory, 1)
+        self.assertEqual(
+            Reservation.objects.get().status, Reservation.Status.READY
+        )
+
+    def test_cancel_ready_reservation_passes_the_copy_on(self):
+        self.reserve(self.first)
+        self.reserve(self.second)
+        self.return_borrowing(self.borrowings[0])
+        reservation = Reservation.objects.get(user=self.first)
+
+        self.client.force_authenticate(user=self.first)
+        response = self.client.delete(
+            reverse("borrowings:reservation-detail", args=[reservation.id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_204_NO_CONTENT)
+        self.assertEqual(
+            Reservation.objects.get().status, Reservation.Status.READY
+        )
+
+    def test_users_see_only_their_reservations(self):
+        self.reserve(self.first)
+        reservation = Reservation.objects.get()
+
+        self.client.force_authenticate(user=self.second)
+        listed = self.client.get(self.url)
+        cancelled = self.client.delete(
+            reverse("borrowings:reservation-detail", args=[reservation.id])
+        )
+
+        self.assertEqual(listed.data["count"], 0)
+        self.assertEqual(cancelled.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_expired_holds_are_passed_on(self):
+        self.reserve(self.first)
+        self.reserve(self.second)
+        self.return_borrowing(self.borrowings[0])
+        Reservation.objects.ready().update(
+            ready_at=timezone.now() - timedelta(days=10)
+        )
+
+        out = StringIO()
+        call_command("expire_reservations", stdout=out)
+
+        self.assertIn("Expired 1", out.getvalue())
+        self.assertEqual(
+            Reservation.objects.get().user, self.second
+        )
+        self.assertEqual(
+            Reservation.objects.get().status, Reservation.Status.READY
+        )
+
+    def test_availability_estimates_from_expected_returns(self):
+        self.reserve(self.first)
+        self.reserve(self.second)
+        self.client.logout()
+
+        anonymous = self.client.get(self.availability_url)
+
+        self.assertEqual(anonymous.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            anonymous.data,
+            {
+                "book": self.book.id,
+                "inventory": 0,
+                "queue_length": 2,
+                "status": None,
+                "position": None,
+                "next_available_date": None,
+            },
+        )
+
+        self.client.force_authenticate(user=self.first)
+        first = self.client.get(self.availability_url)
+        self.client.force_authenticate(user=self.second)
+        second = self.client.get(self.availability_url)
+
+        self.assertEqual(first.data["position"], 1)
+        self.assertEqual(
+            first.data["next_available_date"],
+            str(self.today + timedelta(days=3)),
+        )
+        self.assertEqual(second.data["position"], 2)
+        self.assertEqual(
+            second.data["next_available_date"],
+            str(self.today + timedelta(days=10)),
+        )
+
+    def test_availability_of_overdue_and_available_books(self):
+        Borrowing.objects.filter(pk=self.borrowings[1].pk).update(
+            borrow_date=self.today - timedelta(days=20),
+            expected_return_date=self.today - timedelta(days=5),
+        )
+
+        overdue = self.client.get(self.availability_url)
+        Book.objects.filter(pk=self.book.pk).update(inventory=1)
+        available = self.client.get(self.availability_url)
+
+        self.assertEqual(overdue.data["next_available_date"], str(self.today))
+        self.assertEqual(available.data["inventory"], 1)
+        self.assertEqual(
+            available.data["next_available_date"], str(self.today)
+        )
@@ -1,10 +1,11 @@
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
-from borrowings.views import BorrowingViewSet
+from borrowings.views import BorrowingViewSet, ReservationViewSet
 
 
 router = DefaultRouter()
+router.register(r"reservations", ReservationViewSet)
 router.register(r"", BorrowingViewSet)
 urlpatterns = router.urls
 
@@ -1,12 +1,25 @@
+from collections import Counter
+from datetime import date
+from decimal import Decimal
+
 from django.utils.timezone import localdate
-from rest_framework import viewsets
-from rest_framework.permissions import IsAuthenticated
+from rest_framework import mixins, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.exceptions import (
     ValidationError as DRFValidationError,
     PermissionDenied,
 )
-from django.core.exceptions import ValidationError as DjangoValidationError
 from django.db import transaction
+from django.http import StreamingHttpResponse
+from django.db.models import (
+    BooleanField,
+    ExpressionWrapper,
+    ProtectedError,
+    Q,
+)
+from rest_framework.response import Response
+from drf_spectacular.types import OpenApiTypes
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
@@ -16,13 +29,46 @@ from drf_spectacular.utils import (
 )
 
 from books.models import Book
-from books.views import LibraryPagination
-from borrowings.models import Borrowing
+from books.pagination import LibraryPagination
+from borrowings.fines import accrue_returned_fines
+from borrowings.models import Borrowing, Reservation
 from borrowings.serializers import (
     BorrowingSerializer,
     BorrowingCreateSerializer,
     BorrowingUpdateSerializer,
+    BorrowingBatchItemSerializer,
+    BorrowingReturnSerializer,
+    BorrowingExportSerializer,
+    ReservationSerializer,
 )
+from paid_library_service.bulk import bulk_ids, bulk_response
+from paid_library_service.mixins import (
+    ConditionalRequestMixin,
+    Conflict,
+    QueryOptimizationMixin,
+)
+from paid_library_service.renderers import CSVRenderer, NDJSONRenderer
+from paid_library_service.values import ValuesListMixin
+
+
+SPARSE_FIELDSET_PARAMETERS = [
+    OpenApiParameter(
+        name="fields",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Comma separated fields to return "
+                    "(ex. ?fields=id,book,expected_return_date)",
+        required=False,
+    ),
+    OpenApiParameter(
+        name="expand",
+        type=str,
+        location=OpenApiParameter.QUERY,
+        description="Related data to render: book_detail, user. "
+                    "All by default, none for an empty value.",
+        required=False,
+    ),
+]
 
 
 @extend_schema_view(
@@ -50,12 +96,14 @@ from borrowings.serializers import (
                             "Available only to admin users.",
                 required=False,
             ),
+            *SPARSE_FIELDSET_PARAMETERS,
         ],
         responses={200: BorrowingSerializer(many=True)},
     ),
     retrieve=extend_schema(
         description="Retrieve details of a borrowing by its ID."
                     "Non-admin users can only access their own borrowings.",
+        parameters=SPARSE_FIELDSET_PARAMETERS,
         responses={
             200: BorrowingSerializer,
             403: OpenApiResponse(description="Forbidden"),
@@ -98,10 +146,16 @@ from borrowings.serializers import (
         responses={
             204: OpenApiResponse(description="No Content"),
             403: OpenApiResponse(description="Forbidden"),
+            409: OpenApiResponse(description="Borrowing already billed"),
         },
     ),
 )
-class BorrowingViewSet(viewsets.ModelViewSet):
+class BorrowingViewSet(
+    ValuesListMixin,
+    ConditionalRequestMixin,
+    QueryOptimizationMixin,
+    viewsets.ModelViewSet,
+):
     """
     ViewSet for managing book borrowings.
 
@@ -109,22 +163,61 @@ class BorrowingViewSet(viewsets.ModelViewSet):
     - Admin users can access and manage all borrowings.
     - Users can create new borrowings.
     - Only the owner of a borrowing can update or delete it.
+    - List and detail responses support conditional GET,
+      lists are rendered from .values() rows.
     """
 
     permission_classes = (IsAuthenticated,)
     queryset = Borrowing.objects.all()
     pagination_class = LibraryPagination
+    cursor_ordering = ("-id",)
+    batch_max_size = 50
+    validator_fields = ("updated_at", "book__updated_at", "user__email")
+    validators_per_user = True
+    export_chunk_size = 2000
+    export_columns = (
+        ("id", "id"),
+        ("borrow_date", "borrow_date"),
+        ("expected_return_date", "expected_return_date"),
+        ("actual_return_date", "actual_return_date"),
+        ("book_id", "book_id"),
+        ("book_title", "book__title"),
+        ("book_author", "book__author"),
+        ("book_daily_fee", "book__daily_fee"),
+        ("user_id", "user_id"),
+        ("user_email", "user__email"),
+    )
+    values_annotations = {
+        "is_active": ExpressionWrapper(
+            Q(actual_return_date__isnull=True), output_field=BooleanField()
+        ),
+    }
+
+    @property
+    def throttle_scope(self):
+        if self.action in ("create", "batch", "bulk_return"):
+            return "borrow"
+        return None
 
     def get_serializer_class(self):
         if self.action == "create":
             return BorrowingCreateSerializer
+        if self.action == "batch":
+            return BorrowingBatchItemSerializer
+        if self.action == "bulk_return":
+            return BorrowingReturnSerializer
+        if self.action == "export":
+            return BorrowingExportSerializer
         if self.action in ("update", "partial_update"):
             return BorrowingUpdateSerializer
         return BorrowingSerializer
 
     def get_object(self):
         obj = super().get_object()
-        if not self.request.user.is_staff and obj.user != self.request.user:
+        if (
+            not self.request.user.is_staff
+            and obj.user_id != self.request.user.pk
+        ):
             raise PermissionDenied(
                 "You do not have permission to access this borrowing."
             )
@@ -161,7 +254,9 @@ class BorrowingViewSet(viewsets.ModelViewSet):
 
     @extend_schema(
         description="Handle the creation of a new borrowing."
-                    "Decreases the book's inventory if successful.",
+                    "Decreases the book's inventory if successful, "
+                    "an out-of-stock book can be borrowed only with "
+                    "a ready reservation.",
         request=BorrowingCreateSerializer,
         responses={
             201: BorrowingSerializer,
@@ -169,25 +264,35 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         },
     )
     def perform_create(self, serializer):
+        """
+        A copy held for the user's reservation is taken first, whatever
+        the inventory, so the hold doesn't keep a second copy.
+        Otherwise the borrowing is inserted first and the copy is taken
+        last with a conditional UPDATE, so the book row is locked only
+        for the moment between that UPDATE and the commit.
+        """
+        book = serializer.validated_data["book"]
+        out_of_stock = DRFValidationError(
+            {"book": "No more copies available to borrow."}
+        )
+
+        hold = Reservation.objects.ready().filter(
+            book=book, user=self.request.user
+        )
+        if book.inventory <= 0 and not hold.exists():
+            raise out_of_stock
+
         with transaction.atomic():
-            book = serializer.validated_data["book"]
-            book = Book.objects.select_for_update().get(pk=book.pk)
+            if hold.delete()[0]:
+                serializer.save(user=self.request.user)
+                return
 
             if book.inventory <= 0:
-                raise DRFValidationError(
-                    {"book": "No more copies available to borrow."}
-                )
-
-            try:
-                borrowing = serializer.save(user=self.request.user)
-            except DjangoValidationError as e:
-                raise DRFValidationError(detail=e.message_dict)
+                raise out_of_stock
+            serializer.save(user=self.request.user)
 
-            try:
-                book.borrow_book()
-            except ValueError as e:
-                borrowing.delete()
-                raise DRFValidationError({"book": str(e)})
+            if not Book.objects.decrement_inventory(book.pk):
+                raise out_of_stock
 
     @extend_schema(
         description=(
@@ -203,9 +308,9 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         },
     )
     def perform_update(self, serializer):
-        borrowing = self.get_object()
+        borrowing = serializer.instance
 
-        if self.request.user != borrowing.user:
+        if self.request.user.pk != borrowing.user_id:
             raise PermissionDenied(
                 "You do not have permission to modify this borrowing."
             )
@@ -220,8 +325,21 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         )
 
         if manage_this_borrowing == "return":
-            serializer.save(actual_return_date=localdate())
-            borrowing.book.return_book()
+            return_date = localdate()
+            with transaction.atomic():
+                returned = Borrowing.objects.filter(
+                    pk=borrowing.pk
+                ).mark_returned(return_date)
+                if not returned:
+                    raise DRFValidationError(
+                        {"detail": "The book has already been returned."}
+                    )
+                if return_date > borrowing.expected_return_date:
+                    accrue_returned_fines(
+                        Borrowing.objects.filter(pk=borrowing.pk)
+                    )
+                Reservation.objects.release_copies(borrowing.book_id)
+            borrowing.actual_return_date = return_date
         else:
             serializer.save()
 
@@ -231,6 +349,7 @@ class BorrowingViewSet(viewsets.ModelViewSet):
         responses={
             204: OpenApiResponse(description="No Content"),
             403: OpenApiResponse(description="Forbidden"),
+            409: OpenApiResponse(description="Borrowing already billed"),
         },
     )
     def perform_destroy(self, instance):
@@ -241,4 +360,337 @@ class BorrowingViewSet(viewsets.ModelViewSet):
             raise PermissionDenied(
                 "You do not have permission to delete this borrowing."
             )
-        instance.delete()
+        try:
+            instance.delete()
+        except ProtectedError:
+            raise Conflict(
+                "The borrowing has been billed and can't be deleted."
+            )
+
+    @extend_schema(
+        description="Borrow several books at once."
+                    "Items are validated one by one, all valid borrowings "
+                    "are created in one transaction and the outcome "
+                    "is reported per item. Copies of one book are taken "
+                    "all together or not at all, the copy held for your "
+                    "reservation first.",
+        request=BorrowingBatchItemSerializer(many=True),
+        responses={
+            201: OpenApiResponse(description="All borrowings created"),
+            207: OpenApiResponse(description="Some items failed"),
+            400: OpenApiResponse(description="No borrowing created"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="batch")
+    def batch(self, request):
+        items = request.data
+        if not isinstance(items, list) or not items:
+            raise DRFValidationError(
+                {"detail": "Expected a non-empty list of borrowings."}
+            )
+        if len(items) > self.batch_max_size:
+            raise DRFValidationError(
+                {
+                    "detail": f"No more than {self.batch_max_size} "
+                              f"borrowings per batch."
+                }
+            )
+
+        context = self.get_serializer_context()
+        context["books"] = Book.objects.in_bulk(bulk_ids(items, "book"))
+
+        valid, errors = {}, {}
+        for index, item in enumerate(items):
+            serializer = BorrowingBatchItemSerializer(
+                data=item, context=context
+            )
+            if serializer.is_valid():
+                valid[index] = serializer.validated_data
+            else:
+                errors[index] = serializer.errors
+
+        copies = Counter(data["book"].pk for data in valid.values())
+        created = {}
+
+        if copies:
+            with transaction.atomic():
+                # A copy held for the user's reservation is taken first,
+                # the hold is dropped once the book's copies are taken.
+                held = set(
+                    Reservation.objects.ready()
+                    .select_for_update()
+                    .filter(user=request.user, book_id__in=copies)
+                    .values_list("book_id", flat=True)
+                )
+                # Books are always locked in id order,
+                # so two concurrent batches cannot deadlock.
+                for book_id in sorted(copies):
+                    needed = copies[book_id] - (book_id in held)
+                    if not needed or Book.objects.decrement_inventory(
+                        book_id, needed
+                    ):
+                        continue
+                    held.discard(book_id)
+                    for index, data in valid.items():
+                        if data["book"].pk == book_id:
+                            errors[index] = {
+                                "book": ["No more copies available to borrow."]
+                            }
+                if held:
+                    Reservation.objects.ready().filter(
+                        user=request.user, book_id__in=held
+                    ).delete()
+
+                indexes = [index for index in valid if index not in errors]
+                borrowings = Borrowing.objects.bulk_create(
+                    Borrowing(user=request.user, **valid[index])
+                    for index in indexes
+                )
+                created = dict(zip(indexes, borrowings))
+
+        results = []
+        for index in range(len(items)):
+            if index in created:
+                results.append(
+                    {
+                        "index": index,
+                        "status": status.HTTP_201_CREATED,
+                        "borrowing": BorrowingSerializer(
+                            created[index], context=context
+                        ).data,
+                    }
+                )
+            else:
+                results.append(
+                    {
+                        "index": index,
+                        "status": status.HTTP_400_BAD_REQUEST,
+                        "errors": errors[index],
+                    }
+                )
+
+        return bulk_response(results, status.HTTP_201_CREATED)
+
+    @extend_schema(
+        description="Return several of your borrowings at once."
+                    "Borrowings are closed in one UPDATE, the copies of "
+                    "every book go to its reservation queue first and "
+                    "the rest back to the inventory in one update. "
+                    "The outcome is reported per borrowing id.",
+        request=BorrowingReturnSerializer,
+        responses={
+            200: OpenApiResponse(description="All borrowings returned"),
+            207: OpenApiResponse(description="Some borrowings failed"),
+            400: OpenApiResponse(description="No borrowing returned"),
+        },
+    )
+    @action(detail=False, methods=["post"], url_path="return")
+    def bulk_return(self, request):
+        serializer = BorrowingReturnSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ids = list(dict.fromkeys(serializer.validated_data["borrowings"]))
+        return_date = localdate()
+
+        with transaction.atomic():
+            rows = list(
+                Borrowing.objects.select_for_update()
+                .filter(user=request.user, id__in=ids)
+                .order_by("id")
+                .values_list(
+                    "id",
+                    "book_id",
+                    "actual_return_date",
+                    "expected_return_date",
+                )
+            )
+            active = {
+                borrowing_id: book_id
+                for borrowing_id, book_id, actual_return_date, _ in rows
+                if actual_return_date is None
+            }
+            late = [
+                borrowing_id
+                for borrowing_id, _, _, expected_return_date in rows
+                if borrowing_id in active
+                and expected_return_date < return_date
+            ]
+            if active:
+                Borrowing.objects.filter(id__in=active).mark_returned(
+                    return_date
+                )
+                if late:
+                    accrue_returned_fines(
+                        Borrowing.objects.filter(id__in=late)
+                    )
+                copies = Counter(active.values())
+                for book_id in sorted(copies):
+                    Reservation.objects.release_copies(
+                        book_id, copies[book_id]
+                    )
+
+        found = {row[0] for row in rows}
+        results = []
+        for borrowing_id in ids:
+            if borrowing_id in active:
+                results.append(
+                    {"id": borrowing_id, "status": status.HTTP_200_OK}
+                )
+            elif borrowing_id in found:
+                results.append(
+                    {
+                        "id": borrowing_id,
+                        "status": status.HTTP_400_BAD_REQUEST,
+                        "errors": {
+                            "detail": "The book has already been returned."
+                        },
+                    }
+                )
+            else:
+                results.append(
+                    {
+                        "id": borrowing_id,
+                        "status": status.HTTP_404_NOT_FOUND,
+                        "errors": {"detail": "Not found."},
+                    }
+                )
+
+        return bulk_response(results)
+
+    @staticmethod
+    def _export_value(value):
+        if isinstance(value, date):
+            return value.isoformat()
+        if isinstance(value, Decimal):
+            return str(value)
+        return value
+
+    @extend_schema(
+        description="Stream all borrowings as NDJSON (?format=ndjson) "
+                    "or CSV (?format=csv). Accessible only to admin users. "
+                    "Supports the is_active and user_id filters "
+                    "and a borrow date range.",
+        parameters=[
+            OpenApiParameter(
+                name="is_active",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                required=False,
+            ),
+            OpenApiParameter(
+                name="user_id",
+                type=int,
+                location=OpenApiParameter.QUERY,
+                required=False,
+            ),
+            OpenApiParameter(
+                name="borrowed_from",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                required=False,
+            ),
+            OpenApiParameter(
+                name="borrowed_to",
+                type=OpenApiTypes.DATE,
+                location=OpenApiParameter.QUERY,
+                required=False,
+            ),
+        ],
+        responses={
+            (200, "application/x-ndjson"): OpenApiTypes.STR,
+            (200, "text/csv"): OpenApiTypes.STR,
+            400: OpenApiResponse(description="Validation Error"),
+            403: OpenApiResponse(description="Forbidden"),
+        },
+    )
+    @action(
+        detail=False,
+        methods=["get"],
+        url_path="export",
+        permission_classes=(IsAdminUser,),
+        renderer_classes=(NDJSONRenderer, CSVRenderer),
+    )
+    def export(self, request):
+        """
+        Rows are read with .iterator(), which uses a server-side cursor
+        on Postgres, and written out export_chunk_size rows at a time,
+        so memory use doesn't grow with the number of borrowings.
+        """
+        params = BorrowingExportSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+
+        queryset = self.get_queryset()
+        if "borrowed_from" in params.validated_data:
+            queryset = queryset.filter(
+                borrow_date__gte=params.validated_data["borrowed_from"]
+            )
+        if "borrowed_to" in params.validated_data:
+            queryset = queryset.filter(
+                borrow_date__lte=params.validated_data["borrowed_to"]
+            )
+
+        columns = [column for column, _ in self.export_columns]
+        rows = (
+            tuple(self._export_value(value) for value in row)
+            for row in queryset.order_by("id")
+            .values_list(*(lookup for _, lookup in self.export_columns))
+            .iterator(chunk_size=self.export_chunk_size)
+        )
+
+        renderer = request.accepted_renderer
+        response = StreamingHttpResponse(
+            renderer.stream(columns, rows), content_type=renderer.media_type
+        )
+        response["Content-Disposition"] = (
+            f'attachment; filename="borrowings.{renderer.format}"'
+        )
+        return response
+
+
+@extend_schema_view(
+    list=extend_schema(description="List your reservations, oldest first."),
+    create=extend_schema(
+        description="Join the queue of an out-of-stock book. The next "
+                    "returned copy goes to the oldest reservation and is "
+                    "held for RESERVATION_HOLD_DAYS days."
+    ),
+    destroy=extend_schema(
+        description="Cancel a reservation, a held copy goes to the next "
+                    "reservation in the queue."
+    ),
+)
+class ReservationViewSet(
+    mixins.CreateModelMixin,
+    mixins.ListModelMixin,
+    mixins.DestroyModelMixin,
+    viewsets.GenericViewSet,
+):
+    queryset = Reservation.objects.all()
+    serializer_class = ReservationSerializer
+    permission_classes = (IsAuthenticated,)
+    pagination_class = LibraryPagination
+
+    def get_queryset(self):
+        return self.queryset.filter(user=self.request.user)
+
+    def perform_create(self, serializer):
+        with transaction.atomic():
+            # Locked, so a return can't put a copy back in the inventory
+            # while the reservation joins the queue.
+            book = Book.objects.select_for_update().get(
+                pk=serializer.validated_data["book"].pk
+            )
+            if book.inventory > 0:
+                raise DRFValidationError(
+                    {"book": ["The book is available, borrow it instead."]}
+                )
+            serializer.save()
+
+    def perform_destroy(self, instance):
+        with transaction.atomic():
+            # Locked, so a return can't hand it a copy meanwhile.
+            instance = Reservation.objects.select_for_update().get(
+                pk=instance.pk
+            )
+            instance.delete()
+            if instance.status == Reservation.Status.READY:
+                Reservation.objects.release_copies(instance.book_id)
@@ -0,0 +1,37 @@
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def bulk_ids(items, key, limit=None):
+    """
+    Integer ids under `key` in the items of a bulk request body, so the
+    objects can be fetched in one query before validation. Malformed
+    items are skipped, validation reports them.
+    """
+    ids = set()
+    if isinstance(items, list):
+        for item in items[:limit]:
+            if isinstance(item, dict):
+                try:
+                    ids.add(int(item.get(key)))
+                except (TypeError, ValueError):
+                    pass
+    return ids
+
+
+def bulk_response(results, success_status=status.HTTP_200_OK):
+    """
+    Outcome of a bulk action reported per item, each result with its own
+    "status": success_status when every item succeeded, 400 when none
+    did, 207 Multi-Status otherwise.
+    """
+    succeeded = sum(
+        result["status"] < status.HTTP_400_BAD_REQUEST for result in results
+    )
+    if succeeded == len(results):
+        response_status = success_status
+    elif not succeeded:
+        response_status = status.HTTP_400_BAD_REQUEST
+    else:
+        response_status = status.HTTP_207_MULTI_STATUS
+    return Response({"results": results}, status=response_status)
@@ -0,0 +1,193 @@
+import csv
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, field
+
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+
+
+FORMATS = ("json", "ndjson", "csv")
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+class InvalidRow:
+    """Yielded by the readers in place of a row that can't be parsed."""
+
+    def __init__(self, error):
+        self.error = error
+
+
+def validate_row(validator, row):
+    """Validated data of the row, an InvalidRow fails like bad data."""
+    if isinstance(row, InvalidRow):
+        raise serializers.ValidationError(
+            {api_settings.NON_FIELD_ERRORS_KEY: [row.error]}
+        )
+    return validator.run_validation(row)
+
+
+def read_json_array(stream, chunk_size=1 << 16, max_item_size=1 << 20):
+    """
+    Yield the items of a top-level JSON array one by one, reading the
+    stream chunk_size characters at a time instead of all at once.
+    An item not decoded within max_item_size characters is malformed
+    (or too large): the rest of the array can't be split into items
+    reliably, so a ValueError is raised rather than reading on.
+    """
+    decoder = json.JSONDecoder()
+    buffer, index = "", 0
+
+    def more():
+        nonlocal buffer, index
+        chunk = stream.read(chunk_size)
+        buffer, index = buffer[index:] + chunk, 0
+        return bool(chunk)
+
+    while True:
+        index = _SEPARATORS.match(buffer, index).end()
+        if index < len(buffer) or not more():
+            break
+    if buffer[index:index + 1] != "[":
+        raise ValueError("Expected a JSON array.")
+    index += 1
+
+    while True:
+        index = _SEPARATORS.match(buffer, index).end()
+        if index == len(buffer):
+            if not more():
+                raise ValueError("Unexpected end of the JSON array.")
+            continue
+        if buffer[index] == "]":
+            return
+        try:
+            item, index = decoder.raw_decode(buffer, index)
+        except json.JSONDecodeError as error:
+            if len(buffer) - index > max_item_size:
+                raise ValueError(
+                    f"JSON array item malformed or longer than "
+                    f"{max_item_size} characters: {error}"
+                )
+            if not more():
+                raise
+            continue
+        yield item
+
+
+def read_ndjson(stream):
+    """Malformed lines are yielded as InvalidRow, reading goes on."""
+    for line in stream:
+        if line.strip():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError as error:
+                yield InvalidRow(f"Invalid JSON: {error}")
+
+
+def read_rows(stream, file_format):
+    """Rows of a JSON array, NDJSON or CSV file, read incrementally."""
+    if file_format == "json":
+        return read_json_array(stream)
+    if file_format == "ndjson":
+        return read_ndjson(stream)
+    if file_format == "csv":
+        return csv.DictReader(stream)
+    raise ValueError(f"Unknown format {file_format!r}.")
+
+
+@dataclass
+class ImportResult:
+    rows: int = 0
+    imported: int = 0
+    invalid: int = 0
+    errors: list = field(default_factory=list)
+
+
+def validate_batch(validator, batch, result, max_errors):
+    """
+    Yield the validated data of the rows of a batch. Invalid rows are
+    skipped and counted, the first max_errors of them are kept in the
+    result with their 1-based row number.
+    """
+    for number, row in enumerate(batch, start=result.rows + 1):
+        try:
+            data = validate_row(validator, row)
+        except serializers.ValidationError as error:
+            result.invalid += 1
+            if len(result.errors) < max_errors:
+                result.errors.append((number, error.detail))
+            continue
+        yield data
+
+
+class ImportCommand(BaseCommand):
+    """
+    Base of the commands streaming a file into the database.
+    Subclasses implement import_rows() and describe().
+    """
+
+    def add_arguments(self, parser):
+        parser.add_argument("path")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="File format, guessed from the extension by default",
+        )
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def import_rows(self, rows, progress, **options):
+        """Import the rows, return an ImportResult."""
+        raise NotImplementedError
+
+    def describe(self, result):
+        """What was imported, for the summary line."""
+        raise NotImplementedError
+
+    def handle(self, *args, **options):
+        file_format = options["format"] or self.guess_format(options["path"])
+        started = time.perf_counter()
+
+        def progress(result):
+            if options["verbosity"] > 1:
+                self.stdout.write(
+                    f"{result.rows} rows read, {result.imported} imported"
+                )
+
+        try:
+            with open(
+                options["path"], encoding="utf-8-sig", newline=""
+            ) as stream:
+                result = self.import_rows(
+                    read_rows(stream, file_format), progress, **options
+                )
+        except (OSError, ValueError) as error:
+            raise CommandError(error)
+        elapsed = time.perf_counter() - started
+
+        for number, errors in result.errors:
+            self.stderr.write(f"Row {number}: {errors}")
+        if result.invalid > len(result.errors):
+            self.stderr.write(
+                f"... and {result.invalid - len(result.errors)} more "
+                f"invalid rows"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{self.describe(result)} in {elapsed:.2f}s, "
+                f"{result.rows / max(elapsed, 1e-9):.0f} rows/s"
+            )
+        )
+
+    @staticmethod
+    def guess_format(path):
+        extension = os.path.splitext(path)[1].lower().lstrip(".")
+        if extension == "jsonl":
+            return "ndjson"
+        if extension not in FORMATS:
+            raise CommandError(
+                f"Can't guess the format of {path}, use --format."
+            )
+        return extension
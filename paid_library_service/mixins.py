@@ -0,0 +1,323 @@
+import hashlib
+from datetime import datetime
+from functools import cache
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models.constants import LOOKUP_SEP
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.relations import RelatedField
+from rest_framework.response import Response
+from rest_framework.serializers import BaseSerializer
+
+
+class QueryPlan:
+    """
+    Relations and columns a serializer reads from a queryset.
+    """
+
+    def __init__(self):
+        self.select_related = set()
+        self.prefetch_related = set()
+        self.only = set()
+
+    def add_all_columns(self, model, prefix):
+        self.only.update(
+            f"{prefix}{field.name}" for field in model._meta.concrete_fields
+        )
+
+    def apply(self, queryset, restrict_columns=True):
+        if self.select_related:
+            queryset = queryset.select_related(*sorted(self.select_related))
+        if self.prefetch_related:
+            queryset = queryset.prefetch_related(
+                *sorted(self.prefetch_related)
+            )
+        if restrict_columns and self.only:
+            queryset = queryset.only(*sorted(self.only))
+        return queryset
+
+
+def build_query_plan(serializer, model, prefix="", plan=None):
+    """
+    Walk the readable fields of the serializer and collect what they need:
+    forward FK/one-to-one paths go to select_related, many-valued ones
+    to prefetch_related, and plain model fields to only().
+    Sources that are not model fields (properties, methods, "*")
+    may read any column, so the whole model is loaded in that case.
+    """
+    plan = plan or QueryPlan()
+    plan.only.add(f"{prefix}{model._meta.pk.name}")
+
+    for field in serializer.fields.values():
+        if field.write_only:
+            continue
+
+        if field.source == "*":
+            if isinstance(field, BaseSerializer):
+                build_query_plan(field, model, prefix, plan)
+            else:
+                plan.add_all_columns(model, prefix)
+            continue
+
+        current_model, path = model, prefix
+        for position, attr in enumerate(field.source_attrs):
+            try:
+                model_field = current_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                plan.add_all_columns(current_model, path)
+                break
+
+            is_last = position == len(field.source_attrs) - 1
+
+            if not model_field.is_relation:
+                plan.only.add(f"{path}{attr}")
+                break
+
+            if model_field.many_to_many or model_field.one_to_many:
+                plan.prefetch_related.add(f"{path}{attr}")
+                break
+
+            if model_field.concrete:
+                plan.only.add(f"{path}{attr}")
+            if (
+                is_last
+                and isinstance(field, RelatedField)
+                and field.use_pk_only_optimization()
+            ):
+                break
+
+            plan.select_related.add(f"{path}{attr}")
+            current_model = model_field.related_model
+            path = f"{path}{attr}__"
+            plan.only.add(f"{path}{current_model._meta.pk.name}")
+
+            if is_last:
+                if isinstance(field, BaseSerializer):
+                    build_query_plan(field, current_model, path, plan)
+                else:
+                    plan.add_all_columns(current_model, path)
+
+    return plan
+
+
+class QueryOptimizationMixin:
+    """
+    Derives select_related/prefetch_related/only() for the queryset
+    from the fields of the active serializer, so list and detail
+    endpoints run a constant number of queries whatever the serializer
+    renders. Column restriction is applied to read requests only,
+    writes load full rows because model validation reads every field.
+    """
+
+    def get_query_plan(self, model):
+        return build_query_plan(self.get_serializer(), model)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        plan = self.get_query_plan(queryset.model)
+        return plan.apply(
+            queryset,
+            restrict_columns=self.request.method in SAFE_METHODS,
+        )
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = "The resource has been modified since it was fetched."
+    default_code = "precondition_failed"
+
+
+class Conflict(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "The resource can't be changed in its current state."
+    default_code = "conflict"
+
+
+class Validators:
+    """
+    ETag (a digest of everything the representation depends on)
+    and Last-Modified of a response.
+    """
+
+    def __init__(self, *parts, last_modified=None):
+        digest = hashlib.md5(repr(parts).encode()).hexdigest()
+        self.etag = quote_etag(digest)
+        self.last_modified = last_modified
+
+    @property
+    def headers(self):
+        headers = {"ETag": self.etag}
+        if self.last_modified:
+            headers["Last-Modified"] = http_date(
+                self.last_modified.timestamp()
+            )
+        return headers
+
+    def evaluate(self, request):
+        """
+        Return a 304 response when the client's copy is still current,
+        raise PreconditionFailed when If-Match or If-Unmodified-Since
+        fails, or return None to go on with the request.
+        """
+        response = get_conditional_response(
+            request,
+            etag=self.etag,
+            last_modified=self.last_modified
+            and int(self.last_modified.timestamp()),
+        )
+        if response is None:
+            return None
+        if response.status_code == status.HTTP_412_PRECONDITION_FAILED:
+            raise PreconditionFailed()
+        for header, value in self.headers.items():
+            response[header] = value
+        return response
+
+    def respond(self, request, render):
+        """Call render() only if the client's copy is out of date."""
+        response = self.evaluate(request)
+        if response is None:
+            response = render()
+            if status.is_success(response.status_code):
+                for header, value in self.headers.items():
+                    response[header] = value
+        return response
+
+
+class ConditionalRequestMixin:
+    """
+    Conditional requests on the "updated_at" columns of the model.
+
+    Validators are computed before serialization: for a list from the
+    ids and timestamps of the rows on the page plus the pagination
+    envelope (count, links), for a detail from the object itself.
+    So If-None-Match / If-Modified-Since get a 304 without rendering
+    and without any query beyond the ones the page needs anyway.
+    If-Match / If-Unmodified-Since guard updates and deletes.
+    Lists only get an ETag: the newest timestamp of a page doesn't
+    change when a row is deleted from it, so Last-Modified would
+    answer 304 to a stale copy.
+
+    "validator_fields" also lists the timestamps of related objects
+    the serializer renders, e.g. "book__updated_at", or the rendered
+    columns themselves of relations without one, e.g. "user__email".
+    Lists only use those of relations the current serializer reads
+    (see get_validator_fields()), details always use all of them.
+    Must come before QueryOptimizationMixin, so those columns are loaded.
+    """
+
+    validator_fields = ("updated_at",)
+    validators_per_user = False
+
+    def get_validator_fields(self):
+        """
+        On lists, timestamps of relations the serializer doesn't read
+        are skipped, so dropping a nested field (?fields=) also drops
+        its join. Details keep all of them, so an object has a single
+        ETag for If-Match whatever fields were fetched.
+        """
+        if self.detail:
+            return self.validator_fields
+        if not hasattr(self, "_validator_fields"):
+            plan = build_query_plan(
+                self.get_serializer(), self.get_queryset().model
+            )
+            self._validator_fields = tuple(
+                field
+                for field in self.validator_fields
+                if LOOKUP_SEP not in field
+                or field.rsplit(LOOKUP_SEP, 1)[0] in plan.select_related
+            )
+        return self._validator_fields
+
+    def get_query_plan(self, model):
+        plan = super().get_query_plan(model)
+        for field in self.get_validator_fields():
+            plan.only.add(field)
+            if LOOKUP_SEP in field:
+                relation = field.rsplit(LOOKUP_SEP, 1)[0]
+                plan.select_related.add(relation)
+                plan.only.add(relation)
+        return plan
+
+    def get_modified(self, obj):
+        fields = self.get_validator_fields()
+        if isinstance(obj, dict):
+            return [obj[field] for field in fields]
+        modified = []
+        for field in fields:
+            value = obj
+            for attr in field.split(LOOKUP_SEP):
+                value = getattr(value, attr)
+            modified.append(value)
+        return modified
+
+    def get_list_page(self):
+        queryset = self.filter_queryset(self.get_queryset())
+        page = self.paginate_queryset(queryset)
+        if page is None:
+            return list(queryset), False
+        return page, True
+
+    def get_list_validators(self, rows, paginated):
+        parts = [self.request.get_host(), self.request.get_full_path()]
+        if self.validators_per_user:
+            parts.append(self.request.user.pk)
+        if paginated:
+            parts.append(self.get_paginated_response([]).data)
+
+        for row in rows:
+            modified = self.get_modified(row)
+            pk = row["pk"] if isinstance(row, dict) else row.pk
+            parts.append((pk, *modified))
+        return Validators(*parts)
+
+    def get_object_validators(self, obj):
+        modified = self.get_modified(obj)
+        return Validators(
+            obj._meta.label,
+            obj.pk,
+            *modified,
+            last_modified=max(
+                (value for value in modified if isinstance(value, datetime)),
+                default=None,
+            ),
+        )
+
+    def conditional_response(self, request, get_validators, render):
+        return get_validators().respond(request, render)
+
+    def serialize_page(self, rows):
+        return self.get_serializer(rows, many=True).data
+
+    def list(self, request, *args, **kwargs):
+        get_page = cache(self.get_list_page)
+
+        def render():
+            rows, paginated = get_page()
+            data = self.serialize_page(rows)
+            if paginated:
+                return self.get_paginated_response(data)
+            return Response(data)
+
+        return self.conditional_response(
+            request, lambda: self.get_list_validators(*get_page()), render
+        )
+
+    def retrieve(self, request, *args, **kwargs):
+        get_object = cache(self.get_object)
+        return self.conditional_response(
+            request,
+            lambda: self.get_object_validators(get_object()),
+            lambda: Response(self.get_serializer(get_object()).data),
+        )
+
+    def get_object(self):
+        obj = super().get_object()
+        if self.request.method not in SAFE_METHODS:
+            self.get_object_validators(obj).evaluate(self.request)
+        return obj
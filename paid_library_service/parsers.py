@@ -0,0 +1,43 @@
+import codecs
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from django.conf import settings
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import json
+
+from paid_library_service.renderers import FastJSONRenderer
+
+
+class FastJSONParser(JSONParser):
+    """
+    JSONParser decoding UTF-8 bodies with orjson when it is installed.
+    Bodies orjson rejects are parsed again by the stdlib, so errors
+    and edge cases (e.g. integers over 64 bits) behave as in JSONParser.
+    """
+
+    renderer_class = FastJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        parser_context = parser_context or {}
+        encoding = parser_context.get("encoding", settings.DEFAULT_CHARSET)
+        if orjson is None or codecs.lookup(encoding).name != "utf-8":
+            return super().parse(stream, media_type, parser_context)
+
+        body = stream.read()
+        try:
+            return orjson.loads(body)
+        except orjson.JSONDecodeError:
+            pass
+
+        try:
+            parse_constant = json.strict_constant if self.strict else None
+            return json.loads(
+                body.decode(encoding), parse_constant=parse_constant
+            )
+        except ValueError as exc:
+            raise ParseError("JSON parse error - %s" % str(exc))
@@ -0,0 +1,112 @@
+import csv
+import io
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover
+    orjson = None
+
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    JSONRenderer encoding with orjson when it is installed.
+    Dates, UUIDs and dict/list/str subclasses are encoded natively,
+    anything else (Decimal, datetime, lazy strings, querysets...) goes
+    through DRF's JSONEncoder.default(), so the output is the same.
+    Indented, ASCII-only or non-compact output and values orjson can't
+    encode (e.g. integers over 64 bits) fall back to the stdlib encoder.
+    """
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        indent = self.get_indent(accepted_media_type, renderer_context or {})
+        if indent is not None or self.ensure_ascii or not self.compact:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(
+                data,
+                default=self.encoder_class().default,
+                option=orjson.OPT_NON_STR_KEYS
+                | orjson.OPT_PASSTHROUGH_DATETIME,
+            )
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Escape U+2028 and U+2029 like JSONRenderer does.
+        return ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+            b"\xe2\x80\xa9", b"\\u2029"
+        )
+
+
+class NDJSONRenderer(BaseRenderer):
+    """
+    Newline delimited JSON, one object per row. Views stream rows with
+    stream(), render() only serves other responses such as errors.
+    """
+
+    media_type = "application/x-ndjson"
+    format = "ndjson"
+    charset = None
+    flush_every = 1000
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        return FastJSONRenderer().render(data) + b"\n"
+
+    def stream(self, columns, rows):
+        """
+        Yield the rows (tuples of JSON-ready values in "columns" order)
+        flush_every rows at a time.
+        """
+        encoder = FastJSONRenderer()
+        lines = []
+        for row in rows:
+            lines.append(encoder.render(dict(zip(columns, row))))
+            if len(lines) == self.flush_every:
+                lines.append(b"")
+                yield b"\n".join(lines)
+                lines = []
+        if lines:
+            lines.append(b"")
+            yield b"\n".join(lines)
+
+
+class CSVRenderer(BaseRenderer):
+    """
+    CSV with a header row. Views stream rows with stream(),
+    render() only serves other responses such as errors.
+    """
+
+    media_type = "text/csv"
+    format = "csv"
+    charset = "utf-8"
+    flush_every = 1000
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        rows = data if isinstance(data, list) else [data]
+        columns = list(rows[0]) if rows else []
+        return b"".join(
+            self.stream(columns, ([row[c] for c in columns] for row in rows))
+        )
+
+    def stream(self, columns, rows):
+        """Yield the header and the rows flush_every rows at a time."""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(columns)
+        for count, row in enumerate(rows, start=1):
+            writer.writerow(row)
+            if count % self.flush_every == 0:
+                yield buffer.getvalue().encode(self.charset)
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode(self.charset)
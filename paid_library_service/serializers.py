@@ -0,0 +1,72 @@
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.serializers import ListSerializer
+
+
+def query_param_list(request, name):
+    """Comma separated values of a query param, None when it is absent."""
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class SparseFieldsetMixin:
+    """
+    Lets clients choose the fields of a read response:
+    ?fields=id,title keeps only the listed fields (all of them when it
+    is empty, unknown names answer 400) and ?expand= lists
+    which of Meta.expandable_fields (nested or related data) to render,
+    all of them by default (?expand= with no value renders none).
+    Applies to the top-level serializer only. Views derive their query
+    plan from the remaining fields, so dropped relations aren't joined.
+    """
+
+    def is_root(self):
+        parent = getattr(self, "parent", None)
+        if isinstance(parent, ListSerializer):
+            parent = parent.parent
+        return parent is None
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get("request")
+        if (
+            request is None
+            or request.method not in SAFE_METHODS
+            or not self.is_root()
+        ):
+            return fields
+
+        # ?fields= without any name keeps all of them.
+        requested = query_param_list(request, "fields") or None
+        expand = query_param_list(request, "expand")
+        if requested is None and expand is None:
+            return fields
+
+        readable = {
+            name for name, field in fields.items() if not field.write_only
+        }
+        expandable = set(getattr(self.Meta, "expandable_fields", ()))
+
+        errors = {}
+        unknown = set(requested or ()) - readable
+        if unknown:
+            errors["fields"] = f"Unknown fields: {', '.join(sorted(unknown))}."
+        unknown = set(expand or ()) - expandable
+        if unknown:
+            errors["expand"] = (
+                f"Fields that can be expanded: "
+                f"{', '.join(sorted(expandable)) or 'none'}."
+            )
+        if errors:
+            raise ValidationError(errors)
+
+        selected = readable if requested is None else set(requested)
+        if expand is not None:
+            selected = (selected - expandable) | set(expand)
+        return {
+            name: field
+            for name, field in fields.items()
+            if name in selected or field.write_only
+        }
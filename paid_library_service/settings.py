@@ -49,10 +49,12 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "books",
     "rest_framework",
     "users",
     "borrowings",
+    "payments",
     "drf_spectacular",
 ]
 
@@ -146,14 +148,91 @@ DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
 
 REST_FRAMEWORK = {
     "DEFAULT_THROTTLE_CLASSES": [
-        "rest_framework.throttling.AnonRateThrottle",
-        "rest_framework.throttling.UserRateThrottle",
+        "paid_library_service.throttling.AnonSlidingWindowThrottle",
+        "paid_library_service.throttling.UserSlidingWindowThrottle",
+        "paid_library_service.throttling.ScopedSlidingWindowThrottle",
     ],
-    "DEFAULT_THROTTLE_RATES": {"anon": "1000/day", "user": "1000/day"},
+    "DEFAULT_THROTTLE_RATES": {
+        "anon": "1000/day",
+        "user": "1000/day",
+        # Per view throttle_scope: cheap catalog reads, borrowing writes
+        "catalog": "600/min",
+        "borrow": "120/hour",
+    },
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "users.authentication.CachedJWTAuthentication",
     ),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_RENDERER_CLASSES": (
+        "paid_library_service.renderers.FastJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ),
+    "DEFAULT_PARSER_CLASSES": (
+        "paid_library_service.parsers.FastJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ),
+}
+
+# Sliding-window throttle counters. The default cache is per process,
+# set THROTTLE_STORE_PATH to share them between the workers of a host
+# through a SQLite file (or point the cache at Redis/Memcached).
+if os.environ.get("THROTTLE_STORE_PATH"):
+    THROTTLE_STORE = {
+        "BACKEND": "paid_library_service.throttling.SQLiteThrottleStore",
+        "OPTIONS": {"path": os.environ["THROTTLE_STORE_PATH"]},
+    }
+else:
+    THROTTLE_STORE = {
+        "BACKEND": "paid_library_service.throttling.CacheThrottleStore",
+        "OPTIONS": {"alias": "default"},
+    }
+
+# Fine per overdue day = book daily fee * FINE_MULTIPLIER
+FINE_MULTIPLIER = 2
+
+# Days a returned copy is held for the head of the reservation queue
+RESERVATION_HOLD_DAYS = 3
+
+# Upper bound (seconds) for serving a cached catalog response
+CATALOG_CACHE_TIMEOUT = 60
+# Extra seconds an expired catalog response is served while one
+# request refreshes it
+CATALOG_CACHE_STALE_TIMEOUT = 30
+
+# Users resolved from JWTs are cached per process (LOCAL_TIMEOUT seconds,
+# not invalidated across processes) and in the default cache (TIMEOUT).
+# Changes reach other processes after LOCAL_TIMEOUT only if that cache
+# is shared (Redis/Memcached); the default one is per process.
+AUTH_USER_CACHE = {
+    "TIMEOUT": 300,
+    "LOCAL_TIMEOUT": 5,
+    "LOCAL_MAX_SIZE": 1024,
+}
+
+# Password hashing runs on WORKERS threads per process; requests past
+# MAX_CONCURRENCY (hashing or waiting) get 503 before any work
+PASSWORD_HASHING = {
+    "WORKERS": 2,
+    "MAX_CONCURRENCY": 16,
+}
+
+# Revoked refresh tokens are looked up in a per-process Bloom filter
+# (sized for CAPACITY tokens at ERROR_RATE false positives), synced from
+# the database every SYNC_INTERVAL seconds and rebuilt every
+# REBUILD_INTERVAL seconds
+TOKEN_REVOCATION = {
+    "CAPACITY": 1_000_000,
+    "ERROR_RATE": 0.001,
+    "SYNC_INTERVAL": 1,
+    "REBUILD_INTERVAL": 3600,
+}
+
+PAYMENT_PROVIDER = "payments.providers.FakePaymentProvider"
+
+LIBRARY_PAGINATION = {
+    "MAX_PAGE_SIZE": 100,
+    "CURSOR_COUNT": False,
 }
 
 SPECTACULAR_SETTINGS = {
@@ -161,6 +240,9 @@ SPECTACULAR_SETTINGS = {
     "DESCRIPTION": "Booking books",
     "VERSION": "1.0.0",
     "SERVE_INCLUDE_SCHEMA": False,
+    "ENUM_NAME_OVERRIDES": {
+        "ReservationStatusEnum": "borrowings.models.Reservation.Status",
+    },
     "SWAGGER_UI_SETTINGS": {
         "deepLinking": True,
         "defaultModelRendering": "model",
@@ -174,4 +256,8 @@ SIMPLE_JWT = {
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
     "ROTATE_REFRESH_TOKENS": False,
     "AUTH_HEADER_NAME": "HTTP_AUTHORIZE",
+    "TOKEN_OBTAIN_SERIALIZER": "users.serializers.TokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "users.serializers.TokenRefreshSerializer",
+    "TOKEN_VERIFY_SERIALIZER": "users.serializers.TokenVerifySerializer",
+    "TOKEN_BLACKLIST_SERIALIZER": "users.serializers.TokenRevokeSerializer",
 }
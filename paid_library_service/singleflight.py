@@ -0,0 +1,154 @@
+import threading
+import time
+import uuid
+
+from django.core.cache import caches
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key inside one process:
+    the first caller runs the function, the others wait for its result
+    (or its exception) instead of running it again.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, function):
+        """Return (result, shared), "shared" is True for the waiters."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = function()
+            return call.result, False
+        except Exception as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+single_flight = SingleFlight()
+
+
+class CacheLock:
+    """
+    Best-effort lock shared by all processes using the same cache,
+    built on the atomic cache.add(). It expires after "timeout" seconds
+    so a crashed holder can't block the key forever.
+    """
+
+    def __init__(self, cache, key, timeout):
+        self.cache = cache
+        self.key = f"lock:{key}"
+        self.timeout = timeout
+        self.token = uuid.uuid4().hex
+
+    def acquire(self):
+        return self.cache.add(self.key, self.token, self.timeout)
+
+    def release(self):
+        if self.cache.get(self.key) == self.token:
+            self.cache.delete(self.key)
+
+
+def cached_read(
+    key,
+    compute,
+    timeout,
+    stale_timeout=0,
+    cross_process=True,
+    lock_timeout=10,
+    poll_interval=0.05,
+    cache_alias="default",
+):
+    """
+    Read-through cache for expensive reads with request coalescing.
+
+    Returns (value, state), where state is one of:
+    "HIT" - fresh cached value;
+    "MISS" - computed by this call;
+    "SHARED" - computed by a concurrent call in this or another process;
+    "STALE" - an expired value served while another call refreshes it.
+
+    On a miss, concurrent calls in the process wait on one computation
+    (SingleFlight). With cross_process=True the computing process also
+    takes a cache lock, other processes poll the cache for the value
+    for up to lock_timeout seconds and compute it themselves only if it
+    doesn't show up.
+
+    With stale_timeout > 0 values are kept that much longer after they
+    expire, and an expired value is returned at once unless this call
+    wins the right to refresh it (stale-while-revalidate).
+    Staleness is therefore bounded by timeout + stale_timeout.
+    """
+    cache = caches[cache_alias]
+
+    def store(value):
+        entry = (value, time.time() + timeout)
+        cache.set(key, entry, timeout + stale_timeout)
+        return value, False
+
+    entry = cache.get(key)
+    if entry is not None:
+        value, fresh_until = entry
+        if time.time() < fresh_until:
+            return value, "HIT"
+        if single_flight.in_flight(key):
+            return value, "STALE"
+        lock = CacheLock(cache, key, lock_timeout)
+        if cross_process and not lock.acquire():
+            return value, "STALE"
+        try:
+            (result, _), shared = single_flight.do(
+                key, lambda: store(compute())
+            )
+        finally:
+            if cross_process:
+                lock.release()
+        return result, "SHARED" if shared else "MISS"
+
+    def load():
+        if not cross_process:
+            return store(compute())
+        lock = CacheLock(cache, key, lock_timeout)
+        if lock.acquire():
+            try:
+                return store(compute())
+            finally:
+                lock.release()
+        deadline = time.monotonic() + lock_timeout
+        while time.monotonic() < deadline:
+            time.sleep(poll_interval)
+            entry = cache.get(key)
+            if entry is not None:
+                return entry[0], True
+        return store(compute())
+
+    (result, computed_elsewhere), shared = single_flight.do(key, load)
+    return result, "SHARED" if shared or computed_elsewhere else "MISS"
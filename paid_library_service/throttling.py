@@ -0,0 +1,201 @@
+import functools
+import os
+import random
+import sqlite3
+import threading
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from rest_framework.throttling import (
+    AnonRateThrottle,
+    ScopedRateThrottle,
+    SimpleRateThrottle,
+    UserRateThrottle,
+)
+
+
+class CacheThrottleStore:
+    """
+    Counters in a Django cache: two integers per key and window.
+    Shared by all workers when the cache is (Redis, Memcached),
+    per process with the default local-memory cache.
+    """
+
+    def __init__(self, alias="default"):
+        self.alias = alias
+
+    def hit(self, key, window_start, duration):
+        """
+        Count a request in the window starting at window_start.
+        Returns the counts of that window and of the previous one.
+        """
+        cache = caches[self.alias]
+        current_key = f"{key}:{window_start}"
+        cache.add(current_key, 0, duration * 2)
+        try:
+            current = cache.incr(current_key)
+        except ValueError:
+            # Evicted between add() and incr().
+            cache.set(current_key, 1, duration * 2)
+            current = 1
+        previous = cache.get(f"{key}:{window_start - duration}", 0)
+        return current, previous
+
+
+class SQLiteThrottleStore:
+    """
+    Counters in a SQLite file, shared by all the worker processes of a
+    host without any other service. One row per key, updated in place;
+    rows of keys idle for two windows are pruned every prune_every hits.
+    """
+
+    UPSERT = """
+        INSERT INTO throttle (key, window_start, current, previous, expires)
+        VALUES (:key, :window_start, 1, 0, :expires)
+        ON CONFLICT (key) DO UPDATE SET
+            previous = CASE
+                WHEN window_start >= :window_start THEN previous
+                WHEN window_start = :window_start - :duration THEN current
+                ELSE 0
+            END,
+            current = CASE
+                WHEN window_start >= :window_start THEN current + 1
+                ELSE 1
+            END,
+            window_start = MAX(window_start, :window_start),
+            expires = :expires
+    """
+
+    def __init__(self, path, timeout=5.0, prune_every=1000):
+        self.path = str(path)
+        self.timeout = timeout
+        self.prune_every = prune_every
+        self.local = threading.local()
+
+    def connect(self):
+        """One connection per thread, opened again after a fork."""
+        if getattr(self.local, "pid", None) != os.getpid():
+            connection = sqlite3.connect(
+                self.path, timeout=self.timeout, isolation_level=None
+            )
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS throttle ("
+                "key TEXT PRIMARY KEY, window_start INTEGER NOT NULL, "
+                "current INTEGER NOT NULL, previous INTEGER NOT NULL, "
+                "expires INTEGER NOT NULL)"
+            )
+            connection.execute(
+                "CREATE INDEX IF NOT EXISTS throttle_expires "
+                "ON throttle (expires)"
+            )
+            self.local.connection, self.local.pid = connection, os.getpid()
+        return self.local.connection
+
+    def hit(self, key, window_start, duration):
+        connection = self.connect()
+        # Takes the write lock first, so the read sees our own update.
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            connection.execute(
+                self.UPSERT,
+                {
+                    "key": key,
+                    "window_start": window_start,
+                    "duration": duration,
+                    "expires": window_start + duration * 2,
+                },
+            )
+            current, previous, stored_start = connection.execute(
+                "SELECT current, previous, window_start "
+                "FROM throttle WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if random.randrange(self.prune_every) == 0:
+                connection.execute(
+                    "DELETE FROM throttle WHERE expires < ?",
+                    (window_start,),
+                )
+            connection.execute("COMMIT")
+        except BaseException:
+            connection.execute("ROLLBACK")
+            raise
+        if stored_start > window_start:
+            # Another worker's clock is a window ahead.
+            return current, 0
+        return current, previous
+
+
+@functools.cache
+def get_throttle_store():
+    config = settings.THROTTLE_STORE
+    return import_string(config["BACKEND"])(**config.get("OPTIONS", {}))
+
+
+@receiver(setting_changed)
+def reset_throttle_store(setting, **kwargs):
+    if setting == "THROTTLE_STORE":
+        get_throttle_store.cache_clear()
+
+
+class SlidingWindowRateThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle counting requests in fixed windows instead of
+    keeping a list of timestamps: the rate is checked against the count
+    of the current window plus the count of the previous one, weighted
+    by the part of it still inside the sliding window. The counters are
+    kept in THROTTLE_STORE, a constant size per key. Rejected requests
+    are counted as well.
+    """
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window_start = int(now // self.duration * self.duration)
+        self.current, self.previous = get_throttle_store().hit(
+            self.key, window_start, self.duration
+        )
+        self.elapsed = now - window_start
+        weight = 1 - self.elapsed / self.duration
+        return self.previous * weight + self.current <= self.num_requests
+
+    def wait(self):
+        """Seconds until one more request fits in the sliding window."""
+        duration, num_requests = self.duration, self.num_requests
+        remaining = duration - self.elapsed
+        if self.current < num_requests and self.previous:
+            wait = (
+                duration
+                * (1 - (num_requests - self.current - 1) / self.previous)
+                - self.elapsed
+            )
+            if wait <= remaining:
+                return max(wait, 0)
+        # This window's count has to slide out in the next one.
+        return remaining + duration * max(
+            0, 1 - (num_requests - 1) / self.current
+        )
+
+
+class AnonSlidingWindowThrottle(SlidingWindowRateThrottle, AnonRateThrottle):
+    pass
+
+
+class UserSlidingWindowThrottle(SlidingWindowRateThrottle, UserRateThrottle):
+    pass
+
+
+class ScopedSlidingWindowThrottle(
+    ScopedRateThrottle, SlidingWindowRateThrottle
+):
+    """Throttles by the view's throttle_scope, no limit without one."""
@@ -26,6 +26,7 @@ urlpatterns = [
     path("api/borrowings/", include(
         "borrowings.urls", namespace="borrowings")
          ),
+    path("api/payments/", include("payments.urls", namespace="payments")),
     path('api/schema/', SpectacularAPIView.as_view(), name="schema"),
     path(
         "api/doc/swagger/",
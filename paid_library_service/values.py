@@ -0,0 +1,199 @@
+import datetime
+from operator import itemgetter
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework import fields as drf_fields
+from rest_framework.relations import PrimaryKeyRelatedField
+from rest_framework.serializers import BaseSerializer
+from rest_framework.settings import ISO_8601, api_settings
+
+
+def _identity(value):
+    return value
+
+
+def compile_converter(field):
+    """
+    Function turning a database value into the field's representation.
+    Fields whose to_representation() would return the database value
+    unchanged are mapped to identity, the rest keep to_representation().
+    """
+    if type(field) in (
+        drf_fields.CharField,
+        drf_fields.IntegerField,
+        drf_fields.BooleanField,
+        drf_fields.ReadOnlyField,
+    ):
+        return _identity
+    if type(field) is drf_fields.ChoiceField and all(
+        isinstance(choice, str) for choice in field.choices
+    ):
+        return _identity
+    if type(field) is PrimaryKeyRelatedField and field.pk_field is None:
+        return _identity
+    if type(field) is drf_fields.DateField:
+        output_format = getattr(field, "format", api_settings.DATE_FORMAT)
+        if output_format and output_format.lower() == ISO_8601:
+            return datetime.date.isoformat
+    return field.to_representation
+
+
+class ValuesRepresentation:
+    """
+    A serializer compiled into .values() lookups and one function per
+    output key, so list rows are rendered from dicts without model
+    instances or per-row field machinery. The output is the same as
+    serializer.data: keys in field order, nested serializers as dicts
+    and None for NULL values.
+
+    Fields that aren't model field paths (e.g. properties) must be given
+    as query expressions in "annotations", keyed by field name.
+    """
+
+    def __init__(self, serializer, model, annotations=None):
+        self.annotations = annotations or {}
+        self.lookups = set()
+        self.build = self.compile(serializer, model, "")
+
+    def compile(self, serializer, model, prefix):
+        getters = []
+        for name, field in serializer.fields.items():
+            if field.write_only:
+                continue
+
+            if not prefix and name in self.annotations:
+                self.lookups.add(name)
+                getters.append((name, itemgetter(name), _identity))
+                continue
+
+            lookup, related_model = self.resolve(field, model, prefix)
+
+            if isinstance(field, BaseSerializer):
+                self.lookups.add(lookup)
+                getters.append(
+                    (
+                        name,
+                        itemgetter(lookup),
+                        self.compile(
+                            field, related_model, f"{lookup}{LOOKUP_SEP}"
+                        ),
+                        True,
+                    )
+                )
+                continue
+
+            self.lookups.add(lookup)
+            getters.append(
+                (name, itemgetter(lookup), compile_converter(field))
+            )
+
+        def build(row):
+            data = {}
+            for name, get, convert, *nested in getters:
+                value = get(row)
+                if value is not None:
+                    value = convert(row) if nested else convert(value)
+                data[name] = value
+            return data
+
+        return build
+
+    def resolve(self, field, model, prefix):
+        """Lookup of the field's source and the model it ends on."""
+        if not field.source_attrs:
+            raise ImproperlyConfigured(
+                f"{field.field_name!r} of {type(field.parent).__name__} "
+                f"has source='*', add it to the annotations."
+            )
+        current_model = model
+        for attr in field.source_attrs:
+            try:
+                model_field = current_model._meta.get_field(attr)
+            except FieldDoesNotExist:
+                model_field = None
+            if model_field is None or (
+                model_field.many_to_many or model_field.one_to_many
+            ):
+                raise ImproperlyConfigured(
+                    f"{field.field_name!r} of "
+                    f"{type(field.parent).__name__} can't be read from "
+                    f".values(), add it to the annotations."
+                )
+            current_model = model_field.related_model or current_model
+        return (
+            prefix + LOOKUP_SEP.join(field.source_attrs),
+            current_model,
+        )
+
+    def values(self, queryset, *extra_lookups):
+        return queryset.annotate(**self.annotations).values(
+            *sorted(self.lookups.union(extra_lookups))
+        )
+
+    def to_representation(self, rows):
+        build = self.build
+        return [build(row) for row in rows]
+
+
+class ValuesListMixin:
+    """
+    Opt-in fast path for the list action: rows are fetched with .values()
+    and rendered by the compiled ValuesRepresentation of the serializer
+    instead of model instances and serializer fields.
+    Goes before ConditionalRequestMixin, whose list() fetches the page
+    through get_list_page() and renders it through serialize_page().
+    """
+
+    values_annotations = {}
+    _values_representations = {}
+
+    def get_values_representation(self, model):
+        serializer = self.get_serializer()
+        key = (type(self), type(serializer), tuple(serializer.fields))
+        representation = self._values_representations.get(key)
+        if representation is None:
+            representation = self._values_representations[key] = (
+                ValuesRepresentation(
+                    serializer, model, self.values_annotations
+                )
+            )
+        return representation
+
+    def get_list_page(self):
+        """
+        The page is counted and paginated on the ids (and the cursor
+        ordering), so the COUNT and the page lookup don't join the
+        tables the values read. Only the rows of the page are then read
+        with .values().
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        values = self.get_values_representation(queryset.model).values(
+            queryset,
+            "pk",
+            *getattr(self, "get_validator_fields", tuple)(),
+        )
+        page = self.paginate_queryset(
+            queryset.values(
+                "pk",
+                *(
+                    field.lstrip("-")
+                    for field in getattr(self, "cursor_ordering", ())
+                ),
+            )
+        )
+        if page is None:
+            return list(values), False
+        rows = {
+            row["pk"]: row
+            for row in values.filter(pk__in=[row["pk"] for row in page])
+        }
+        return [rows[row["pk"]] for row in page], True
+
+    def serialize_page(self, rows):
+        if self.action != "list":
+            return super().serialize_page(rows)
+        representation = self.get_values_representation(
+            self.get_queryset().model
+        )
+        return representation.to_representation(rows)
@@ -0,0 +1,9 @@
+from django.contrib import admin
+
+from payments.models import BillingRun, Invoice, InvoiceLine, Payment
+
+
+admin.site.register(BillingRun)
+admin.site.register(Invoice)
+admin.site.register(InvoiceLine)
+admin.site.register(Payment)
@@ -0,0 +1,187 @@
+from dataclasses import dataclass
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import (
+    DecimalField,
+    ExpressionWrapper,
+    F,
+    Func,
+    IntegerField,
+    OuterRef,
+    Subquery,
+    Sum,
+    Value,
+)
+from django.db.models.functions import Coalesce, Greatest
+from django.utils import timezone
+
+from borrowings.fines import accrue_returned_fines
+from borrowings.models import Borrowing, FineLedger
+from payments.models import BillingRun, Invoice, InvoiceLine
+
+
+AMOUNT = DecimalField(max_digits=12, decimal_places=2)
+
+
+class DaysBetween(Func):
+    """Whole days from the second date to the first one."""
+
+    arg_joiner = " - "
+    template = "(%(expressions)s)"
+    output_field = IntegerField()
+
+    def __init__(self, end, start, **extra):
+        super().__init__(end, start, **extra)
+
+    def as_sqlite(self, compiler, connection, **extra_context):
+        end, start = (
+            compiler.compile(expression)
+            for expression in self.get_source_expressions()
+        )
+        return (
+            f"CAST(julianday({end[0]}) - julianday({start[0]}) AS INTEGER)",
+            (*end[1], *start[1]),
+        )
+
+
+@dataclass
+class BillingResult:
+    run: BillingRun
+    invoices: int = 0
+    lines: int = 0
+
+
+def billable_borrowings(period_start, period_end):
+    """
+    Borrowings returned in the period and not billed yet, with their
+    amounts computed by the database:
+    fee = daily_fee * days borrowed (at least one day),
+    fine = the sum of the borrowing's FineLedger entries.
+    """
+    days = Greatest(
+        DaysBetween(F("actual_return_date"), F("borrow_date")), Value(1)
+    )
+    fines = (
+        FineLedger.objects.filter(borrowing=OuterRef("pk"))
+        .order_by()
+        .values("borrowing")
+        .annotate(total=Sum("amount"))
+        .values("total")
+    )
+    return (
+        Borrowing.objects.filter(
+            actual_return_date__range=(period_start, period_end),
+            invoice_line__isnull=True,
+        )
+        .annotate(
+            days=days,
+            fee_amount=ExpressionWrapper(
+                F("book__daily_fee") * days, output_field=AMOUNT
+            ),
+            fine_amount=Coalesce(
+                Subquery(fines, output_field=AMOUNT),
+                Value(Decimal("0.00")),
+                output_field=AMOUNT,
+            ),
+        )
+        .order_by()
+    )
+
+
+def bill_users(run, borrowings, user_ids):
+    """
+    Invoice one batch of users in a single transaction:
+    totals per user are aggregated by the database,
+    invoices and lines are written with bulk inserts.
+    """
+    batch = borrowings.filter(user_id__in=user_ids)
+    totals = (
+        batch.values("user_id")
+        .annotate(fee_total=Sum("fee_amount"), fine_total=Sum("fine_amount"))
+        .order_by("user_id")
+    )
+
+    with transaction.atomic():
+        invoices = Invoice.objects.bulk_create(
+            Invoice(
+                user_id=row["user_id"],
+                billing_run=run,
+                period_start=run.period_start,
+                period_end=run.period_end,
+                fee_total=row["fee_total"],
+                fine_total=row["fine_total"],
+                total=row["fee_total"] + row["fine_total"],
+            )
+            for row in totals
+        )
+        invoice_ids = {invoice.user_id: invoice.id for invoice in invoices}
+
+        lines = InvoiceLine.objects.bulk_create(
+            (
+                InvoiceLine(
+                    invoice_id=invoice_ids[row["user_id"]],
+                    borrowing_id=row["id"],
+                    days=row["days"],
+                    fee_amount=row["fee_amount"],
+                    fine_amount=row["fine_amount"],
+                )
+                for row in batch.values(
+                    "id", "user_id", "days", "fee_amount", "fine_amount"
+                ).iterator()
+            ),
+            batch_size=5000,
+        )
+
+        run.checkpoint_user_id = user_ids[-1]
+        run.invoices_created += len(invoices)
+        run.lines_created += len(lines)
+        run.save(
+            update_fields=[
+                "checkpoint_user_id",
+                "invoices_created",
+                "lines_created",
+            ]
+        )
+
+    return len(invoices), len(lines)
+
+
+def run_billing(period_start, period_end, batch_size=1000):
+    """
+    Bill every borrowing returned in the period, one batch of users
+    per transaction. Calling it again for the same period resumes after
+    the last committed batch, or does nothing if the run has finished.
+    Only past periods can be billed: borrowings may still be returned
+    in the current one.
+    """
+    if period_end >= timezone.localdate():
+        raise ValueError("The billing period must end before today.")
+    run, _ = BillingRun.objects.get_or_create(
+        period_start=period_start, period_end=period_end
+    )
+    result = BillingResult(run=run)
+    if run.status == BillingRun.Status.FINISHED:
+        return result
+
+    borrowings = billable_borrowings(period_start, period_end)
+    # Returns are accrued when they happen, this catches up on the ones
+    # returned before the ledger covered them.
+    accrue_returned_fines(borrowings)
+    while True:
+        user_ids = list(
+            borrowings.filter(user_id__gt=run.checkpoint_user_id)
+            .order_by("user_id")
+            .values_list("user_id", flat=True)
+            .distinct()[:batch_size]
+        )
+        if not user_ids:
+            break
+        invoices, lines = bill_users(run, borrowings, user_ids)
+        result.invoices += invoices
+        result.lines += lines
+
+    run.status = BillingRun.Status.FINISHED
+    run.finished_at = timezone.now()
+    run.save(update_fields=["status", "finished_at"])
+    return result
@@ -0,0 +1,106 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.billing import run_billing
+from users.models import User
+
+
+class Command(BaseCommand):
+    """
+    Django command billing synthetic returned borrowings.
+    Everything runs inside a transaction that is rolled back at the end.
+    """
+
+    help = "Benchmark a billing run over synthetic borrowings"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--borrowings", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=50_000)
+        parser.add_argument("--books", type=int, default=5_000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        period_start = date(2000, 1, 1)
+        period_end = date(2000, 1, 31)
+
+        with transaction.atomic():
+            self.stdout.write("Generating data...")
+            started = time.perf_counter()
+            user_ids, book_ids = self.generate_catalog(options)
+            Borrowing.objects.bulk_create(
+                (
+                    self.make_borrowing(
+                        rng, user_ids, book_ids, period_start
+                    )
+                    for _ in range(options["borrowings"])
+                ),
+                batch_size=10_000,
+            )
+            self.stdout.write(
+                f"Generated {options['borrowings']} borrowings "
+                f"in {time.perf_counter() - started:.2f}s"
+            )
+
+            started = time.perf_counter()
+            result = run_billing(
+                period_start, period_end, batch_size=options["batch_size"]
+            )
+            elapsed = time.perf_counter() - started
+
+            transaction.set_rollback(True)
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Billed {result.lines} borrowings into {result.invoices} "
+                f"invoices in {elapsed:.2f}s "
+                f"({result.lines / elapsed:,.0f} borrowings/s)"
+            )
+        )
+
+    @staticmethod
+    def generate_catalog(options):
+        users = User.objects.bulk_create(
+            (
+                User(email=f"billing{number}@example.com", password="!")
+                for number in range(options["users"])
+            ),
+            batch_size=10_000,
+        )
+        books = Book.objects.bulk_create(
+            (
+                Book(
+                    title=f"Book {number}",
+                    author="Author",
+                    cover=Book.CoverType.SOFT,
+                    inventory=10,
+                    daily_fee="1.25",
+                )
+                for number in range(options["books"])
+            ),
+            batch_size=10_000,
+        )
+        return (
+            [user.id for user in users],
+            [book.id for book in books],
+        )
+
+    @staticmethod
+    def make_borrowing(rng, user_ids, book_ids, period_start):
+        borrow_date = period_start - timedelta(days=rng.randint(0, 20))
+        expected_return_date = borrow_date + timedelta(days=14)
+        return Borrowing(
+            user_id=rng.choice(user_ids),
+            book_id=rng.choice(book_ids),
+            borrow_date=borrow_date,
+            expected_return_date=expected_return_date,
+            actual_return_date=period_start
+            + timedelta(days=rng.randint(0, 30)),
+        )
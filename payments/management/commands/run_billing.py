@@ -0,0 +1,41 @@
+import time
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.timezone import localdate
+
+from payments.billing import run_billing
+
+
+class Command(BaseCommand):
+    """Django command to invoice the borrowings returned in a period"""
+
+    help = "Run (or resume) the billing of a period, last month by default"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--period-start", type=date.fromisoformat)
+        parser.add_argument("--period-end", type=date.fromisoformat)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        period_end = options["period_end"] or (
+            localdate().replace(day=1) - timedelta(days=1)
+        )
+        period_start = options["period_start"] or period_end.replace(day=1)
+
+        started = time.perf_counter()
+        try:
+            result = run_billing(
+                period_start, period_end, batch_size=options["batch_size"]
+            )
+        except ValueError as error:
+            raise CommandError(error)
+        elapsed = time.perf_counter() - started
+
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Billing {period_start} - {period_end}: "
+                f"{result.invoices} invoices, {result.lines} lines "
+                f"in {elapsed:.2f}s"
+            )
+        )
@@ -0,0 +1,128 @@
+from django.db import models
+
+from borrowings.models import Borrowing
+from users.models import User
+
+
+class BillingRun(models.Model):
+    """
+    One billing run per period. "checkpoint_user_id" is the last user
+    whose invoice was committed, an interrupted run resumes after it.
+    """
+
+    class Status(models.TextChoices):
+        RUNNING = "RUNNING", "Running"
+        FINISHED = "FINISHED", "Finished"
+
+    period_start = models.DateField()
+    period_end = models.DateField()
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.RUNNING
+    )
+    checkpoint_user_id = models.BigIntegerField(default=0)
+    invoices_created = models.PositiveIntegerField(default=0)
+    lines_created = models.PositiveIntegerField(default=0)
+    started_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["period_start", "period_end"],
+                name="billing_run_unique_period",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"Billing {self.period_start} - {self.period_end} "
+            f"({self.status})"
+        )
+
+
+class Invoice(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        PAID = "PAID", "Paid"
+
+    user = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="invoices"
+    )
+    billing_run = models.ForeignKey(
+        BillingRun, on_delete=models.CASCADE, related_name="invoices"
+    )
+    period_start = models.DateField()
+    period_end = models.DateField()
+    fee_total = models.DecimalField(max_digits=12, decimal_places=2)
+    fine_total = models.DecimalField(max_digits=12, decimal_places=2)
+    total = models.DecimalField(max_digits=12, decimal_places=2)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ["-period_start", "id"]
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "period_start", "period_end"],
+                name="invoice_unique_user_period",
+            ),
+        ]
+
+    def __str__(self):
+        return (
+            f"Invoice {self.id} for {self.user_id}: {self.total} $ "
+            f"({self.period_start} - {self.period_end})"
+        )
+
+
+class InvoiceLine(models.Model):
+    """A returned borrowing is billed exactly once."""
+
+    invoice = models.ForeignKey(
+        Invoice, on_delete=models.CASCADE, related_name="lines"
+    )
+    borrowing = models.OneToOneField(
+        Borrowing, on_delete=models.PROTECT, related_name="invoice_line"
+    )
+    days = models.PositiveIntegerField()
+    fee_amount = models.DecimalField(max_digits=10, decimal_places=2)
+    fine_amount = models.DecimalField(max_digits=10, decimal_places=2)
+
+    def __str__(self):
+        return f"Borrowing {self.borrowing_id}: {self.days} days"
+
+
+class Payment(models.Model):
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        PAID = "PAID", "Paid"
+        FAILED = "FAILED", "Failed"
+
+    invoice = models.ForeignKey(
+        Invoice, on_delete=models.CASCADE, related_name="payments"
+    )
+    provider = models.CharField(max_length=50)
+    # Set once the provider has started the payment.
+    external_id = models.CharField(
+        max_length=255, unique=True, null=True, blank=True
+    )
+    amount = models.DecimalField(max_digits=12, decimal_places=2)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    checkout_url = models.URLField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["invoice"],
+                condition=models.Q(status="PENDING"),
+                name="payment_one_pending_per_invoice",
+            ),
+        ]
+
+    def __str__(self):
+        return f"Payment {self.external_id} for invoice {self.invoice_id}"
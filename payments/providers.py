@@ -0,0 +1,75 @@
+import functools
+import uuid
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class PaymentProviderUnavailable(APIException):
+    status_code = status.HTTP_502_BAD_GATEWAY
+    default_detail = _("The payment provider could not start the payment.")
+    default_code = "payment_provider_unavailable"
+
+
+@dataclass(frozen=True)
+class ProviderPayment:
+    external_id: str
+    status: str
+    checkout_url: str = ""
+
+
+class PaymentProvider(ABC):
+    """
+    Interface of an external payment provider.
+    Statuses use the values of Payment.Status.
+    """
+
+    name = None
+
+    @abstractmethod
+    def create_payment(self, invoice):
+        """Start a payment of the invoice total, return ProviderPayment."""
+
+    @abstractmethod
+    def get_status(self, external_id):
+        """Return the current status of a started payment."""
+
+
+class FakePaymentProvider(PaymentProvider):
+    """
+    Local provider for development and tests:
+    every payment succeeds at once and is kept in the memory
+    of the process.
+    """
+
+    name = "fake"
+
+    def __init__(self):
+        self.payments = {}
+
+    def create_payment(self, invoice):
+        external_id = f"fake_{uuid.uuid4().hex}"
+        self.payments[external_id] = "PAID"
+        return ProviderPayment(external_id=external_id, status="PAID")
+
+    def get_status(self, external_id):
+        return self.payments.get(external_id, "FAILED")
+
+
+@functools.cache
+def get_payment_provider():
+    """Return the provider configured in settings.PAYMENT_PROVIDER."""
+    return import_string(settings.PAYMENT_PROVIDER)()
+
+
+@receiver(setting_changed)
+def reset_payment_provider(setting, **kwargs):
+    if setting == "PAYMENT_PROVIDER":
+        get_payment_provider.cache_clear()
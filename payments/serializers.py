@@ -0,0 +1,42 @@
+from rest_framework import serializers
+
+from payments.models import Invoice, InvoiceLine, Payment
+
+
+class InvoiceLineSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = InvoiceLine
+        fields = ["borrowing", "days", "fee_amount", "fine_amount"]
+
+
+class InvoiceSerializer(serializers.ModelSerializer):
+    user = serializers.ReadOnlyField(source="user.email")
+    lines = InvoiceLineSerializer(many=True, read_only=True)
+
+    class Meta:
+        model = Invoice
+        fields = [
+            "id",
+            "user",
+            "period_start",
+            "period_end",
+            "fee_total",
+            "fine_total",
+            "total",
+            "status",
+            "lines",
+        ]
+
+
+class PaymentSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Payment
+        fields = [
+            "id",
+            "invoice",
+            "provider",
+            "external_id",
+            "amount",
+            "status",
+            "checkout_url",
+        ]
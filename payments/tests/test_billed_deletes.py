@@ -0,0 +1,82 @@
+from datetime import date
+
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from books.models import Book
+from borrowings.models import Borrowing
+from payments.billing import run_billing
+from users.models import User
+
+
+class BilledDeleteTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.admin = User.objects.create_superuser(
+            email="admin@example.com", password="password"
+        )
+        self.book, self.free_book = (
+            Book.objects.create(
+                title=title,
+                author="Author",
+                cover=Book.CoverType.HARD,
+                inventory=5,
+                daily_fee="1.50",
+            )
+            for title in ("Billed Book", "Free Book")
+        )
+        self.borrowing = Borrowing(
+            user=self.user,
+            book=self.book,
+            borrow_date=date(2024, 5, 1),
+            expected_return_date=date(2024, 5, 10),
+            actual_return_date=date(2024, 5, 5),
+        )
+        self.borrowing.save(validate=False)
+        run_billing(date(2024, 5, 1), date(2024, 5, 31))
+
+    def test_billed_borrowing_cannot_be_deleted(self):
+        url = reverse("borrowings:borrowing-detail", args=[self.borrowing.id])
+
+        for user in (self.user, self.admin):
+            self.client.force_authenticate(user=user)
+            response = self.client.delete(url)
+
+            self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertTrue(Borrowing.objects.filter(pk=self.borrowing.pk))
+
+    def test_book_with_billed_borrowings_cannot_be_deleted(self):
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.delete(
+            reverse("books:book-detail", args=[self.book.id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        self.assertTrue(Book.objects.filter(pk=self.book.pk))
+
+    def test_bulk_delete_reports_billed_books(self):
+        self.client.force_authenticate(user=self.admin)
+
+        response = self.client.delete(
+            reverse("books:book-bulk"),
+            {"ids": [self.book.id, self.free_book.id, 1_000_000]},
+            format="json",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(
+            [item["status"] for item in response.data["results"]],
+            [
+                status.HTTP_409_CONFLICT,
+                status.HTTP_204_NO_CONTENT,
+                status.HTTP_404_NOT_FOUND,
+            ],
+        )
+        self.assertEqual(
+            list(Book.objects.values_list("id", flat=True)), [self.book.id]
+        )
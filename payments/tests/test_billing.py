@@ -0,0 +1,171 @@
+from datetime import date
+from decimal import Decimal
+from unittest import mock
+
+from django.test import TestCase
+
+from books.models import Book
+from borrowings.models import Borrowing, FineLedger
+from payments import billing
+from payments.billing import run_billing
+from payments.models import BillingRun, Invoice, InvoiceLine
+from users.models import User
+
+
+class BillingRunTestCase(TestCase):
+
+    def setUp(self):
+        self.period_start = date(2024, 5, 1)
+        self.period_end = date(2024, 5, 31)
+        self.book = Book.objects.create(
+            title="Test Book",
+            author="Author",
+            cover=Book.CoverType.HARD,
+            inventory=5,
+            daily_fee="1.50",
+        )
+        self.users = [
+            User.objects.create_user(email=f"user{number}@example.com")
+            for number in range(3)
+        ]
+
+    def borrow(self, user, borrow_date, expected, returned=None):
+        borrowing = Borrowing(
+            user=user,
+            book=self.book,
+            borrow_date=borrow_date,
+            expected_return_date=expected,
+            actual_return_date=returned,
+        )
+        borrowing.save(validate=False)
+        return borrowing
+
+    def test_invoice_totals_fees_and_fines(self):
+        on_time = self.borrow(
+            self.users[0], date(2024, 5, 1), date(2024, 5, 10),
+            date(2024, 5, 5),
+        )
+        late = self.borrow(
+            self.users[0], date(2024, 5, 1), date(2024, 5, 10),
+            date(2024, 5, 13),
+        )
+
+        result = run_billing(self.period_start, self.period_end)
+
+        invoice = Invoice.objects.get()
+        lines = {line.borrowing_id: line for line in invoice.lines.all()}
+
+        self.assertEqual((result.invoices, result.lines), (1, 2))
+        self.assertEqual(lines[on_time.id].days, 4)
+        self.assertEqual(lines[on_time.id].fee_amount, Decimal("6.00"))
+        self.assertEqual(lines[on_time.id].fine_amount, Decimal("0.00"))
+        self.assertEqual(lines[late.id].days, 12)
+        self.assertEqual(lines[late.id].fee_amount, Decimal("18.00"))
+        self.assertEqual(lines[late.id].fine_amount, Decimal("9.00"))
+        self.assertEqual(invoice.fee_total, Decimal("24.00"))
+        self.assertEqual(invoice.fine_total, Decimal("9.00"))
+        self.assertEqual(invoice.total, Decimal("33.00"))
+
+    def test_fines_are_billed_from_the_ledger(self):
+        late = self.borrow(
+            self.users[0], date(2024, 5, 1), date(2024, 5, 10),
+            date(2024, 5, 13),
+        )
+        # Accrued at an earlier rate, before the return.
+        FineLedger.objects.create(
+            borrowing=late,
+            accrued_from=date(2024, 5, 11),
+            accrued_to=date(2024, 5, 12),
+            days=2,
+            amount=Decimal("2.00"),
+        )
+        Borrowing.objects.filter(pk=late.pk).update(
+            fines_accrued_until=date(2024, 5, 12)
+        )
+
+        run_billing(self.period_start, self.period_end)
+
+        line = InvoiceLine.objects.get()
+
+        self.assertEqual(line.fine_amount, Decimal("5.00"))
+        self.assertEqual(
+            list(late.fines.values_list("accrued_to", "days")),
+            [(date(2024, 5, 12), 2), (date(2024, 5, 13), 1)],
+        )
+        self.assertEqual(Invoice.objects.get().fine_total, Decimal("5.00"))
+
+    def test_only_borrowings_returned_in_period_are_billed(self):
+        self.borrow(self.users[0], date(2024, 5, 1), date(2024, 5, 10))
+        self.borrow(
+            self.users[1], date(2024, 4, 1), date(2024, 4, 10),
+            date(2024, 4, 30),
+        )
+        self.borrow(
+            self.users[2], date(2024, 5, 20), date(2024, 6, 10),
+            date(2024, 6, 1),
+        )
+
+        result = run_billing(self.period_start, self.period_end)
+
+        self.assertEqual(result.invoices, 0)
+        self.assertEqual(
+            BillingRun.objects.get().status, BillingRun.Status.FINISHED
+        )
+
+    def test_run_in_batches_groups_lines_per_user(self):
+        for user in self.users:
+            for day in (2, 3):
+                self.borrow(
+                    user, date(2024, 5, 1), date(2024, 5, 10),
+                    date(2024, 5, day),
+                )
+
+        result = run_billing(self.period_start, self.period_end, batch_size=2)
+
+        self.assertEqual((result.invoices, result.lines), (3, 6))
+        self.assertEqual(
+            sorted(Invoice.objects.values_list("user_id", flat=True)),
+            sorted(user.id for user in self.users),
+        )
+        self.assertEqual(BillingRun.objects.get().lines_created, 6)
+
+    def test_interrupted_run_resumes_after_checkpoint(self):
+        for user in self.users:
+            self.borrow(
+                user, date(2024, 5, 1), date(2024, 5, 10), date(2024, 5, 2)
+            )
+        bill_users = billing.bill_users
+        calls = []
+
+        def fail_on_second_batch(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 2:
+                raise RuntimeError("worker killed")
+            return bill_users(*args, **kwargs)
+
+        with mock.patch.object(
+            billing, "bill_users", side_effect=fail_on_second_batch
+        ):
+            with self.assertRaises(RuntimeError):
+                run_billing(self.period_start, self.period_end, batch_size=1)
+
+        self.assertEqual(Invoice.objects.count(), 1)
+
+        result = run_billing(self.period_start, self.period_end, batch_size=1)
+        repeated = run_billing(self.period_start, self.period_end)
+
+        self.assertEqual(result.invoices, 2)
+        self.assertEqual(repeated.invoices, 0)
+        self.assertEqual(Invoice.objects.count(), 3)
+        self.assertEqual(InvoiceLine.objects.count(), 3)
+
+    def test_period_not_over_is_rejected(self):
+        today = date(2024, 5, 31)
+
+        with mock.patch.object(
+            billing.timezone, "localdate", return_value=today
+        ):
+            with self.assertRaises(ValueError):
+                run_billing(self.period_start, today)
+
+        self.assertFalse(BillingRun.objects.exists())
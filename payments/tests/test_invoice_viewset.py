@@ -0,0 +1,205 @@
+import threading
+import time
+from datetime import date
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from payments.models import BillingRun, Invoice, Payment
+from payments.providers import FakePaymentProvider, get_payment_provider
+from payments.views import InvoiceViewSet
+from users.models import User
+
+
+class InvoiceTests:
+
+    def setUp(self):
+        self.user = User.objects.create_user(email="user@example.com")
+        self.another_user = User.objects.create_user(
+            email="another_user@example.com"
+        )
+        run = BillingRun.objects.create(
+            period_start=date(2024, 5, 1), period_end=date(2024, 5, 31)
+        )
+        self.invoice, self.foreign_invoice = (
+            Invoice.objects.create(
+                user=user,
+                billing_run=run,
+                period_start=run.period_start,
+                period_end=run.period_end,
+                fee_total=Decimal("10.00"),
+                fine_total=Decimal("2.00"),
+                total=Decimal("12.00"),
+            )
+            for user in (self.user, self.another_user)
+        )
+        self.client.force_authenticate(user=self.user)
+
+
+class InvoiceViewSetTestCase(InvoiceTests, APITestCase):
+
+    def test_users_see_only_their_invoices(self):
+        response = self.client.get(reverse("payments:invoice-list"))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [invoice["id"] for invoice in response.data["results"]],
+            [self.invoice.id],
+        )
+
+    def test_pay_invoice_with_fake_provider(self):
+        url = reverse("payments:invoice-pay", args=[self.invoice.id])
+
+        response = self.client.post(url)
+        repeated = self.client.post(url)
+
+        self.invoice.refresh_from_db()
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data["status"], Payment.Status.PAID)
+        self.assertEqual(response.data["amount"], "12.00")
+        self.assertEqual(self.invoice.status, Invoice.Status.PAID)
+        self.assertEqual(repeated.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cannot_pay_invoice_of_another_user(self):
+        response = self.client.post(
+            reverse("payments:invoice-pay", args=[self.foreign_invoice.id])
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_paid_status_is_read_from_the_locked_row(self):
+        # A concurrent request paid it after this one fetched it.
+        stale = Invoice.objects.get(pk=self.invoice.pk)
+        Invoice.objects.filter(pk=self.invoice.pk).update(
+            status=Invoice.Status.PAID
+        )
+
+        with (
+            mock.patch.object(
+                InvoiceViewSet, "get_object", return_value=stale
+            ),
+            mock.patch.object(FakePaymentProvider, "create_payment") as pay,
+        ):
+            response = self.client.post(
+                reverse("payments:invoice-pay", args=[self.invoice.id])
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        pay.assert_not_called()
+        self.assertFalse(Payment.objects.exists())
+
+    def test_provider_is_called_after_the_invoice_is_claimed(self):
+        claimed = []
+        create_payment = FakePaymentProvider.create_payment
+
+        def record_claim(provider, invoice):
+            claimed.append(Payment.objects.get().status)
+            return create_payment(provider, invoice)
+
+        with mock.patch.object(
+            FakePaymentProvider, "create_payment", record_claim
+        ):
+            response = self.client.post(
+                reverse("payments:invoice-pay", args=[self.invoice.id])
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(claimed, [Payment.Status.PENDING])
+        self.assertEqual(Payment.objects.get().status, Payment.Status.PAID)
+
+    def test_payment_in_progress_is_not_started_twice(self):
+        Payment.objects.create(
+            invoice=self.invoice, provider="fake", amount=self.invoice.total
+        )
+
+        with mock.patch.object(FakePaymentProvider, "create_payment") as pay:
+            response = self.client.post(
+                reverse("payments:invoice-pay", args=[self.invoice.id])
+            )
+
+        self.assertEqual(response.status_code, status.HTTP_409_CONFLICT)
+        pay.assert_not_called()
+
+    def test_provider_failure_is_recorded(self):
+        url = reverse("payments:invoice-pay", args=[self.invoice.id])
+
+        with mock.patch.object(
+            FakePaymentProvider,
+            "create_payment",
+            side_effect=ConnectionError("provider down"),
+        ):
+            response = self.client.post(url)
+        retried = self.client.post(url)
+
+        self.assertEqual(response.status_code, status.HTTP_502_BAD_GATEWAY)
+        self.assertEqual(retried.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(
+            list(
+                Payment.objects.order_by("id").values_list(
+                    "status", flat=True
+                )
+            ),
+            [Payment.Status.FAILED, Payment.Status.PAID],
+        )
+
+    def test_started_payment_status_is_known_later(self):
+        self.client.post(
+            reverse("payments:invoice-pay", args=[self.invoice.id])
+        )
+        payment = Payment.objects.get()
+
+        self.assertEqual(
+            get_payment_provider().get_status(payment.external_id),
+            Payment.Status.PAID,
+        )
+
+
+@skipUnless(connection.vendor == "postgresql", "Row locks need PostgreSQL")
+class ConcurrentPaymentTestCase(InvoiceTests, APITransactionTestCase):
+
+    def test_concurrent_requests_pay_once(self):
+        create_payment = FakePaymentProvider.create_payment
+        paying = threading.Event()
+        responses = []
+
+        def slow_payment(provider, invoice):
+            paying.set()
+            time.sleep(0.5)
+            return create_payment(provider, invoice)
+
+        def pay():
+            client = self.client_class()
+            client.force_authenticate(user=self.user)
+            try:
+                responses.append(
+                    client.post(
+                        reverse(
+                            "payments:invoice-pay", args=[self.invoice.id]
+                        )
+                    )
+                )
+            finally:
+                connection.close()
+
+        with mock.patch.object(
+            FakePaymentProvider, "create_payment", slow_payment
+        ):
+            first = threading.Thread(target=pay)
+            first.start()
+            # The second request comes while the first one is paying.
+            paying.wait(timeout=5)
+            second = threading.Thread(target=pay)
+            second.start()
+            first.join()
+            second.join()
+
+        self.assertEqual(
+            sorted(response.status_code for response in responses),
+            [status.HTTP_201_CREATED, status.HTTP_409_CONFLICT],
+        )
+        self.assertEqual(Payment.objects.count(), 1)
@@ -0,0 +1,10 @@
+from rest_framework.routers import DefaultRouter
+
+from payments.views import InvoiceViewSet
+
+
+router = DefaultRouter()
+router.register(r"invoices", InvoiceViewSet)
+urlpatterns = router.urls
+
+app_name = "payments"
@@ -0,0 +1,119 @@
+import logging
+
+from django.db import transaction
+from rest_framework import status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError as DRFValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from drf_spectacular.utils import (
+    extend_schema,
+    extend_schema_view,
+    OpenApiResponse,
+)
+
+from books.pagination import LibraryPagination
+from paid_library_service.mixins import Conflict, QueryOptimizationMixin
+from payments.models import Invoice, Payment
+from payments.providers import (
+    PaymentProviderUnavailable,
+    get_payment_provider,
+)
+from payments.serializers import InvoiceSerializer, PaymentSerializer
+
+
+logger = logging.getLogger(__name__)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        description="Retrieve a list of invoices."
+                    "Non-admin users will only see their own invoices.",
+    ),
+    retrieve=extend_schema(
+        description="Retrieve an invoice with its lines.",
+    ),
+)
+class InvoiceViewSet(QueryOptimizationMixin, viewsets.ReadOnlyModelViewSet):
+    """
+    ViewSet for invoices produced by the billing runs.
+
+    - Non-admin users can list, retrieve and pay their own invoices.
+    - Admin users can see all invoices.
+    """
+
+    permission_classes = (IsAuthenticated,)
+    queryset = Invoice.objects.all()
+    serializer_class = InvoiceSerializer
+    pagination_class = LibraryPagination
+    cursor_ordering = ("-id",)
+
+    def get_queryset(self):
+        queryset = Invoice.objects.all()
+        if not self.request.user.is_staff:
+            queryset = queryset.filter(user=self.request.user)
+        return queryset
+
+    @extend_schema(
+        description="Pay the invoice through the configured "
+                    "payment provider.",
+        request=None,
+        responses={
+            201: PaymentSerializer,
+            400: OpenApiResponse(description="Invoice already paid"),
+            409: OpenApiResponse(description="Payment already in progress"),
+            502: OpenApiResponse(description="Payment provider failed"),
+        },
+    )
+    @action(detail=True, methods=["post"])
+    def pay(self, request, pk=None):
+        """
+        The invoice is locked only to claim it with a PENDING payment
+        (one per invoice), the provider is called outside any
+        transaction and its answer is recorded in a second one.
+        """
+        invoice = self.get_object()
+        provider = get_payment_provider()
+
+        with transaction.atomic():
+            invoice = Invoice.objects.select_for_update().get(pk=invoice.pk)
+            if invoice.status == Invoice.Status.PAID:
+                raise DRFValidationError(
+                    {"detail": "The invoice has already been paid."}
+                )
+            if invoice.payments.filter(
+                status=Payment.Status.PENDING
+            ).exists():
+                raise Conflict(
+                    "A payment of the invoice is already in progress."
+                )
+            payment = Payment.objects.create(
+                invoice=invoice,
+                provider=provider.name,
+                amount=invoice.total,
+            )
+
+        try:
+            started = provider.create_payment(invoice)
+        except Exception:
+            logger.exception("Could not start payment %s", payment.pk)
+            Payment.objects.filter(pk=payment.pk).update(
+                status=Payment.Status.FAILED
+            )
+            raise PaymentProviderUnavailable()
+
+        with transaction.atomic():
+            payment.external_id = started.external_id
+            payment.status = started.status
+            payment.checkout_url = started.checkout_url
+            payment.save(
+                update_fields=["external_id", "status", "checkout_url"]
+            )
+            if payment.status == Payment.Status.PAID:
+                Invoice.objects.filter(pk=invoice.pk).update(
+                    status=Invoice.Status.PAID
+                )
+
+        return Response(
+            PaymentSerializer(payment).data, status=status.HTTP_201_CREATED
+        )
@@ -0,0 +1,143 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.settings import api_settings
+
+
+USER_VERSION_CLAIM = "user_version"
+
+
+class LocalUserCache:
+    """
+    Per-process LRU of user rows with a short TTL, the only tier that
+    isn't invalidated across processes: entries live TTL seconds at most.
+    """
+
+    def __init__(self, max_size, timeout):
+        self.max_size = max_size
+        self.timeout = timeout
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                return None
+            value, expires = entry
+            if expires < time.monotonic():
+                del self.entries[key]
+                return None
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        with self.lock:
+            self.entries[key] = (value, time.monotonic() + self.timeout)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def delete(self, key):
+        with self.lock:
+            self.entries.pop(key, None)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+
+local_users = LocalUserCache(
+    settings.AUTH_USER_CACHE["LOCAL_MAX_SIZE"],
+    settings.AUTH_USER_CACHE["LOCAL_TIMEOUT"],
+)
+
+
+def user_cache_key(user_id, version):
+    return f"users:auth:{user_id}:{version}"
+
+
+def forget_user(user_id, *versions):
+    """
+    Drop the cached rows of the user right away and once more after the
+    commit, so a row read before the commit is not kept.
+    """
+    keys = [user_cache_key(user_id, version) for version in versions]
+
+    def delete():
+        cache.delete_many(keys)
+        for key in keys:
+            local_users.delete(key)
+
+    delete()
+    if connection.in_atomic_block:
+        transaction.on_commit(delete)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWTAuthentication resolving the user from a per-process LRU, then the
+    shared cache, keyed by user id and the user version in the token, so
+    authenticated requests don't query the user row.
+
+    Saving a user bumps its version (see User.save()): tokens issued
+    before are rejected and the cached rows are dropped. Tokens without
+    the version claim are resolved from the database as before.
+    The password hash is not cached, it is loaded on access.
+    """
+
+    def get_user(self, validated_token):
+        version = validated_token.get(USER_VERSION_CLAIM)
+        if version is None:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(
+                _("Token contained no recognizable user identification")
+            )
+
+        key = user_cache_key(user_id, version)
+        row = local_users.get(key)
+        if row is None:
+            row = cache.get(key)
+            if row is None:
+                user = super().get_user(validated_token)
+                if user.auth_version != version:
+                    raise AuthenticationFailed(
+                        _("The user has changed since the token was issued."),
+                        code="user_changed",
+                    )
+                row = self.get_row(user)
+                cache.set(key, row, settings.AUTH_USER_CACHE["TIMEOUT"])
+            local_users.set(key, row)
+
+        # A new instance per request, so changes made by one request
+        # don't leak into the cached row.
+        return self.user_model.from_db(
+            router.db_for_read(self.user_model),
+            self.get_cached_fields(),
+            row,
+        )
+
+    def get_cached_fields(self):
+        return [
+            field.attname
+            for field in self.user_model._meta.concrete_fields
+            if field.attname != "password"
+        ]
+
+    def get_row(self, user):
+        return tuple(
+            getattr(user, attname) for attname in self.get_cached_fields()
+        )
@@ -0,0 +1,90 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.contrib.auth import hashers
+from django.db import connections
+from django.utils.translation import gettext_lazy as _
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+logger = logging.getLogger(__name__)
+
+
+class PasswordHashingBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _("Too many sign-ins at the moment, retry shortly.")
+    default_code = "password_hashing_busy"
+    # Sent as Retry-After.
+    wait = 1
+
+
+class PasswordHashing:
+    """
+    Per-process pool running the password hashers on `workers` threads
+    (PBKDF2 releases the GIL), so a burst of registrations or logins
+    uses that many cores at most and other requests keep theirs.
+
+    Requests that hash take a slot first, up to max_concurrency hashing
+    or waiting for a thread; the next ones are rejected before any work.
+    """
+
+    def __init__(self, workers, max_concurrency):
+        self.executor = ThreadPoolExecutor(
+            workers, thread_name_prefix="password-hashing"
+        )
+        self.slots = threading.BoundedSemaphore(max_concurrency)
+
+    @contextmanager
+    def slot(self):
+        if not self.slots.acquire(blocking=False):
+            raise PasswordHashingBusy()
+        try:
+            yield
+        finally:
+            self.slots.release()
+
+    def make_password(self, raw_password):
+        if raw_password is None:
+            # Unusable passwords aren't hashed.
+            return hashers.make_password(None)
+        return self.executor.submit(
+            hashers.make_password, raw_password
+        ).result()
+
+    def verify_password(self, raw_password, encoded):
+        """Returns whether the password is correct and must be rehashed."""
+        return self.executor.submit(
+            hashers.verify_password, raw_password, encoded
+        ).result()
+
+    def rehash_later(self, user, raw_password):
+        """Rehashes with the current hasher after the response."""
+        return self.executor.submit(
+            self.rehash, user.pk, user.password, raw_password
+        )
+
+    @staticmethod
+    def rehash(user_id, encoded, raw_password):
+        # Imported here: users.models uses this module.
+        from users.models import User
+
+        try:
+            # Not if the password was changed in the meantime; an update,
+            # so the user version and the issued tokens are kept.
+            User.objects.filter(pk=user_id, password=encoded).update(
+                password=hashers.make_password(raw_password)
+            )
+        except Exception:
+            logger.exception("Could not rehash the password of %s", user_id)
+        finally:
+            connections.close_all()
+
+
+password_hashing = PasswordHashing(
+    settings.PASSWORD_HASHING["WORKERS"],
+    settings.PASSWORD_HASHING["MAX_CONCURRENCY"],
+)
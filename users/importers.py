@@ -0,0 +1,130 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from functools import partial
+from itertools import islice
+
+from django.contrib.auth.hashers import get_hasher, make_password
+from rest_framework import serializers
+
+from paid_library_service.importers import ImportResult, validate_batch
+from users.models import User
+
+
+class UserImportSerializer(serializers.Serializer):
+    """One user row. Without a password the user gets an unusable one."""
+
+    email = serializers.EmailField()
+    password = serializers.CharField(
+        min_length=5, required=False, allow_blank=True, trim_whitespace=False
+    )
+    first_name = serializers.CharField(
+        max_length=150, required=False, allow_blank=True
+    )
+    last_name = serializers.CharField(
+        max_length=150, required=False, allow_blank=True
+    )
+
+    def validate_email(self, value):
+        return User.objects.normalize_email(value)
+
+
+@dataclass
+class UserImportResult(ImportResult):
+    existing: int = 0
+
+
+def import_users(
+    rows, batch_size=1000, workers=None, max_errors=20, progress=None
+):
+    """
+    Create users from rows batch_size at a time, skipping the emails
+    that already exist (one query per batch) or appear earlier in the
+    file (normalized as create_user() does). Passwords are hashed on a
+    pool of `workers` processes (all cores by default) while the
+    previous batch is inserted with bulk_create, so hashing, which
+    dominates, scales with the cores.
+
+    Invalid rows are skipped and counted, the first max_errors of them
+    are kept in the result with their 1-based row number. Users
+    registered concurrently are left as they are by the insert and
+    counted as existing.
+    """
+    workers = workers or os.cpu_count() or 1
+    result = UserImportResult()
+    rows = iter(rows)
+    validator = UserImportSerializer()
+    # Resolved here and sent to the workers with each password, so they
+    # hash with this process's settings whatever their start method.
+    hash_password = partial(make_password, salt=None, hasher=get_hasher())
+
+    def read_batch(previous):
+        """
+        Valid new users of the next batch by email, and its row count.
+        The previous batch isn't inserted yet, its emails are skipped.
+        """
+        batch = list(islice(rows, batch_size))
+        users = {}
+        for data in validate_batch(validator, batch, result, max_errors):
+            if data["email"] in users or data["email"] in previous:
+                result.existing += 1
+                continue
+            users[data["email"]] = data
+
+        existing = User.objects.filter(email__in=users).values_list(
+            "email", flat=True
+        )
+        for email in existing:
+            del users[email]
+            result.existing += 1
+        result.rows += len(batch)
+        return users, len(batch)
+
+    def submit(executor, users):
+        passwords = [
+            data["password"]
+            for data in users.values()
+            if data.get("password")
+        ]
+        chunksize = max(1, math.ceil(len(passwords) / (workers * 4)))
+        return executor.map(hash_password, passwords, chunksize=chunksize)
+
+    def create(users, hashes):
+        objects = []
+        for data in users.values():
+            password = data.pop("password", "")
+            user = User(**data)
+            user.password = (
+                next(hashes) if password else make_password(None)
+            )
+            objects.append(user)
+        User.objects.bulk_create(objects, ignore_conflicts=True)
+        # The insert skips emails registered since the batch was read;
+        # only the rows holding the new (salted) hashes are ours.
+        passwords = {user.email: user.password for user in objects}
+        stored = User.objects.filter(email__in=passwords).values_list(
+            "email", "password"
+        )
+        imported = sum(
+            passwords[email] == password for email, password in stored
+        )
+        result.imported += imported
+        result.existing += len(objects) - imported
+        if progress:
+            progress(result)
+
+    with ProcessPoolExecutor(workers) as executor:
+        pending = None
+        while True:
+            users, count = read_batch(pending[0] if pending else {})
+            if not count:
+                break
+            hashes = submit(executor, users)
+            if pending:
+                create(*pending)
+            pending = users, hashes
+        if pending:
+            create(*pending)
+
+    return result
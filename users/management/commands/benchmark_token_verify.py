@@ -0,0 +1,115 @@
+import time
+import uuid
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.tokens import (
+    RefreshToken as BaseRefreshToken,
+    UntypedToken as BaseUntypedToken,
+)
+
+from users.models import RevokedToken
+from users.revocation import revoked_tokens
+from users.tokens import UntypedToken
+
+
+class Command(BaseCommand):
+    """
+    Django command comparing token verification with a database lookup
+    per token (what simplejwt's blacklist does) and with the Bloom
+    filter in front of it. Revoked tokens are generated inside a
+    transaction that is rolled back at the end.
+    """
+
+    help = "Benchmark token verification against many revoked tokens"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--revoked", type=int, default=1_000_000)
+        parser.add_argument("--tokens", type=int, default=10_000)
+        parser.add_argument("--batch-size", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        tokens = [str(BaseRefreshToken()) for _ in range(options["tokens"])]
+        jtis = [BaseUntypedToken(token)["jti"] for token in tokens]
+        revoked = BaseRefreshToken()
+        expires_at = timezone.now() + timedelta(days=1)
+
+        with transaction.atomic():
+            self.stdout.write(
+                f"Generating {options['revoked']} revoked tokens..."
+            )
+            for start in range(0, options["revoked"], options["batch_size"]):
+                count = min(options["batch_size"], options["revoked"] - start)
+                RevokedToken.objects.bulk_create(
+                    RevokedToken(jti=uuid.uuid4().hex, expires_at=expires_at)
+                    for _ in range(count)
+                )
+            RevokedToken.objects.create(
+                jti=revoked["jti"], expires_at=expires_at
+            )
+
+            revoked_tokens.reset()
+            started = time.perf_counter()
+            # In this thread, which sees the uncommitted tokens.
+            revoked_tokens.rebuild()
+            build = time.perf_counter() - started
+            bloom_filter = revoked_tokens.filter
+
+            results = {
+                "database lookup": self.measure(jtis, self.is_in_database),
+                "bloom filter": self.measure(jtis, revoked_tokens.is_revoked),
+                "verify, database": self.measure(
+                    tokens, self.verify_in_database
+                ),
+                "verify, bloom": self.measure(tokens, UntypedToken),
+            }
+            rejected = self.is_rejected(str(revoked))
+
+            transaction.set_rollback(True)
+        # Drop the rolled back tokens from the filter.
+        revoked_tokens.reset()
+
+        false_positives = sum(jti in bloom_filter for jti in jtis)
+        self.stdout.write(f"Database: {connection.vendor}")
+        self.stdout.write(
+            f"Filter built in {build:.2f} s, "
+            f"{len(bloom_filter.bits) / 2**20:.1f} MB, "
+            f"{false_positives} false positives in {len(jtis)} tokens"
+        )
+        for name, elapsed in results.items():
+            self.report(name, elapsed, len(tokens))
+        self.stdout.write(f"Revoked token rejected: {rejected}")
+
+    @staticmethod
+    def is_in_database(jti):
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    @classmethod
+    def verify_in_database(cls, token):
+        return cls.is_in_database(BaseUntypedToken(token)["jti"])
+
+    @staticmethod
+    def is_rejected(token):
+        try:
+            UntypedToken(token)
+        except TokenError:
+            return True
+        return False
+
+    @staticmethod
+    def measure(items, verify):
+        started = time.perf_counter()
+        for item in items:
+            verify(item)
+        return time.perf_counter() - started
+
+    def report(self, name, elapsed, count):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{name:<16} {count / elapsed:10.0f} tokens/s "
+                f"({elapsed / count * 1e6:.1f} us per token)"
+            )
+        )
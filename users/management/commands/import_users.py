@@ -0,0 +1,35 @@
+from paid_library_service.importers import ImportCommand
+from users.importers import import_users
+
+
+class Command(ImportCommand):
+    """
+    Django command creating users from a JSON array, NDJSON or CSV file
+    (email, password, first_name, last_name). Passwords are hashed on a
+    pool of processes and users inserted in batches; emails that already
+    exist are skipped.
+    """
+
+    help = "Create users from a JSON, NDJSON or CSV file"
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            "--workers",
+            type=int,
+            help="Password hashing processes, one per core by default",
+        )
+
+    def import_rows(self, rows, progress, **options):
+        return import_users(
+            rows,
+            batch_size=options["batch_size"],
+            workers=options["workers"],
+            progress=progress,
+        )
+
+    def describe(self, result):
+        return (
+            f"Imported {result.imported} users from {result.rows} rows "
+            f"({result.existing} existing, {result.invalid} invalid)"
+        )
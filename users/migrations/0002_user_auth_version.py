@@ -0,0 +1,18 @@
+# Generated by Django 5.1.1 on 2026-10-17 14:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="auth_version",
+            field=models.PositiveIntegerField(default=1, editable=False),
+        ),
+    ]
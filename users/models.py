@@ -5,6 +5,8 @@ from django.contrib.auth.models import (
 from django.db import models
 from django.utils.translation import gettext as _
 
+from users.hashing import password_hashing
+
 
 class UserManager(BaseUserManager):
     """Define a model manager for User model with no username field."""
@@ -43,8 +45,112 @@ class UserManager(BaseUserManager):
 class User(AbstractUser):
     username = None
     email = models.EmailField(_("email address"), unique=True)
+    # Embedded in JWTs, bumped when a VERSIONED_FIELDS value is saved
+    # to reject older tokens and drop the cached rows
+    # (see users.authentication).
+    auth_version = models.PositiveIntegerField(default=1, editable=False)
 
     USERNAME_FIELD = "email"
     REQUIRED_FIELDS = []
 
     objects = UserManager()
+
+    # Saves that don't change these (e.g. of last_login) keep the version.
+    VERSIONED_FIELDS = {
+        "password",
+        "email",
+        "is_active",
+        "is_staff",
+        "is_superuser",
+    }
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        user = super().from_db(db, field_names, values)
+        user.remember_versioned_values()
+        return user
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using, fields, from_queryset)
+        self.remember_versioned_values(fields)
+
+    def get_versioned_values(self):
+        # Deferred fields (the password of cached users) aren't loaded.
+        return {
+            name: self.__dict__[name]
+            for name in self.VERSIONED_FIELDS
+            if name in self.__dict__
+        }
+
+    def versioned_fields_changed(self, update_fields):
+        """Compares the saved fields with their values when loaded."""
+        if not hasattr(self, "_versioned"):
+            # Not loaded from the database, nothing to compare with.
+            return update_fields is None or bool(
+                self.VERSIONED_FIELDS.intersection(update_fields)
+            )
+        current = self.get_versioned_values()
+        if update_fields is None:
+            # Fields still deferred aren't saved.
+            names = current.keys()
+        else:
+            names = self.VERSIONED_FIELDS.intersection(update_fields)
+        return any(
+            name not in current
+            or name not in self._versioned
+            or current[name] != self._versioned[name]
+            for name in names
+        )
+
+    def save(self, *args, **kwargs):
+        update_fields = kwargs.get("update_fields")
+        if self.pk is not None and self.versioned_fields_changed(
+            update_fields
+        ):
+            self.auth_version += 1
+            if update_fields is not None:
+                kwargs["update_fields"] = {*update_fields, "auth_version"}
+        super().save(*args, **kwargs)
+        self.remember_versioned_values(update_fields)
+
+    def remember_versioned_values(self, fields=None):
+        """Values of the fields as stored, to compare on the next save."""
+        values = self.get_versioned_values()
+        if fields is not None:
+            values = {
+                name: value for name, value in values.items() if name in fields
+            }
+        self._versioned = {**getattr(self, "_versioned", {}), **values}
+
+    # Hashing runs in the bounded pool of users.hashing.
+
+    def set_password(self, raw_password):
+        self.password = password_hashing.make_password(raw_password)
+        self._password = raw_password
+
+    def check_password(self, raw_password):
+        """
+        Passwords stored with outdated hasher parameters are rehashed in
+        the background instead of during the login.
+        """
+        is_correct, must_update = password_hashing.verify_password(
+            raw_password, self.password
+        )
+        if is_correct and must_update:
+            password_hashing.rehash_later(self, raw_password)
+        return is_correct
+
+
+class RevokedToken(models.Model):
+    """
+    Revoked refresh tokens, by JWT id. Rows are appended in id order,
+    which per-process Bloom filters follow to stay in sync
+    (see users.revocation).
+    """
+
+    jti = models.CharField(max_length=255, unique=True)
+    expires_at = models.DateTimeField(db_index=True)
+    revoked_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    def __str__(self):
+        return self.jti
@@ -0,0 +1,184 @@
+import hashlib
+import math
+import threading
+import time
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+from users.models import RevokedToken
+
+
+# Ids are taken at insert but rows show up at commit: the last
+# SYNC_MARGIN ids are read again by every sync, so a row committed after
+# a higher id is still seen.
+SYNC_MARGIN = 100
+
+
+class BloomFilter:
+    """
+    Set membership with no false negatives and error_rate false
+    positives up to capacity items, in about 1.2 bytes per item at 0.1%.
+    """
+
+    def __init__(self, capacity, error_rate):
+        self.capacity = capacity
+        self.size = max(
+            8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+        )
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def positions(self, item):
+        # Double hashing over two halves of one digest.
+        digest = hashlib.blake2b(item.encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        return [
+            (first + index * second) % self.size
+            for index in range(self.hash_count)
+        ]
+
+    def add(self, item):
+        # Items already in the filter (as far as it can tell) aren't
+        # counted again, so syncs overlapping in time don't inflate it.
+        added = False
+        for position in self.positions(item):
+            mask = 1 << (position & 7)
+            if not self.bits[position >> 3] & mask:
+                self.bits[position >> 3] |= mask
+                added = True
+        self.count += added
+
+    def __contains__(self, item):
+        bits = self.bits
+        return all(
+            bits[position >> 3] & (1 << (position & 7))
+            for position in self.positions(item)
+        )
+
+
+class RevocationList:
+    """
+    Per-process Bloom filter of the revoked JWT ids in front of
+    RevokedToken: most tokens are not revoked and are checked without a
+    query, only filter hits are confirmed in the database.
+
+    The filter follows the table by id, at most once per sync_interval
+    seconds, so another process's revocation is seen within that delay.
+    It is rebuilt from scratch every rebuild_interval seconds (dropping
+    expired tokens) or when it outgrows its capacity, in a background
+    thread: requests keep using the current filter, or the database
+    until the first one is built, and the new one is swapped in at once.
+    """
+
+    def __init__(self, capacity, error_rate, sync_interval, rebuild_interval):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.sync_interval = sync_interval
+        self.rebuild_interval = rebuild_interval
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self.lock:
+            self.filter = None
+            self.last_id = 0
+            self.synced_at = self.built_at = -math.inf
+            self.rebuilding = False
+
+    def catch_up(self, bloom, last_id):
+        """Add the rows revoked since last_id, return the new last id."""
+        for pk, jti in RevokedToken.objects.filter(
+            pk__gt=last_id - SYNC_MARGIN
+        ).values_list("pk", "jti"):
+            bloom.add(jti)
+            last_id = max(last_id, pk)
+        return last_id
+
+    def rebuild(self):
+        """Build a filter of the unexpired tokens and swap it in."""
+        try:
+            tokens = RevokedToken.objects.filter(
+                expires_at__gt=timezone.now()
+            )
+            bloom = BloomFilter(
+                max(self.capacity, tokens.count() * 2), self.error_rate
+            )
+            last_id = 0
+            for pk, jti in tokens.values_list("pk", "jti").iterator(
+                chunk_size=10_000
+            ):
+                bloom.add(jti)
+                last_id = max(last_id, pk)
+            with self.lock:
+                # Under the lock, so the revocations of this process
+                # added to the current filter meanwhile are in the rows.
+                self.last_id = self.catch_up(bloom, last_id)
+                self.filter = bloom
+                self.built_at = self.synced_at = time.monotonic()
+        finally:
+            self.rebuilding = False
+
+    def start_rebuild(self):
+        def run():
+            try:
+                self.rebuild()
+            finally:
+                connections.close_all()
+
+        threading.Thread(
+            target=run, name="revocation-rebuild", daemon=True
+        ).start()
+
+    def sync(self):
+        if time.monotonic() - self.synced_at < self.sync_interval:
+            return
+        # While one thread syncs, the others keep using the current
+        # filter, or the database until the first one is built.
+        if not self.lock.acquire(blocking=False):
+            return
+        try:
+            now = time.monotonic()
+            if now - self.synced_at < self.sync_interval:
+                return
+            if self.filter is not None:
+                self.last_id = self.catch_up(self.filter, self.last_id)
+                self.synced_at = time.monotonic()
+            start = not self.rebuilding and (
+                self.filter is None
+                or now - self.built_at >= self.rebuild_interval
+                or self.filter.count > self.filter.capacity
+            )
+            if start:
+                self.rebuilding = True
+        finally:
+            self.lock.release()
+        # Out of the lock, the new filter is swapped in under it.
+        if start:
+            self.start_rebuild()
+
+    def is_revoked(self, jti):
+        self.sync()
+        bloom = self.filter
+        if bloom is not None and jti not in bloom:
+            return False
+        return RevokedToken.objects.filter(jti=jti).exists()
+
+    def revoke(self, jti, expires_at):
+        RevokedToken.objects.get_or_create(
+            jti=jti, defaults={"expires_at": expires_at}
+        )
+        with self.lock:
+            if self.filter is not None:
+                self.filter.add(jti)
+
+
+revoked_tokens = RevocationList(
+    settings.TOKEN_REVOCATION["CAPACITY"],
+    settings.TOKEN_REVOCATION["ERROR_RATE"],
+    settings.TOKEN_REVOCATION["SYNC_INTERVAL"],
+    settings.TOKEN_REVOCATION["REBUILD_INTERVAL"],
+)
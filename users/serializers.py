@@ -1,8 +1,23 @@
 from django.contrib.auth import get_user_model
+from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
+from rest_framework_simplejwt.exceptions import (
+    AuthenticationFailed,
+    InvalidToken,
+)
+from rest_framework_simplejwt.serializers import (
+    TokenBlacklistSerializer,
+    TokenObtainPairSerializer as BaseTokenObtainPairSerializer,
+    TokenRefreshSerializer as BaseTokenRefreshSerializer,
+    TokenVerifySerializer as BaseTokenVerifySerializer,
+)
 
+from paid_library_service.serializers import SparseFieldsetMixin
+from users.authentication import USER_VERSION_CLAIM, CachedJWTAuthentication
+from users.tokens import RefreshToken, UntypedToken
 
-class UserSerializer(serializers.ModelSerializer):
+
+class UserSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class Meta:
         model = get_user_model()
         fields = ("id", "email", "password", "is_staff")
@@ -22,3 +37,54 @@ class UserSerializer(serializers.ModelSerializer):
             user.save()
 
         return user
+
+
+class TokenObtainPairSerializer(BaseTokenObtainPairSerializer):
+    """Tokens carry the user version checked by CachedJWTAuthentication."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token[USER_VERSION_CLAIM] = user.auth_version
+        return token
+
+
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    Revoked refresh tokens are rejected, and so are the ones issued
+    before the user changed (see CachedJWTAuthentication).
+    """
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+        version = refresh.get(USER_VERSION_CLAIM)
+        if version is not None:
+            try:
+                user = CachedJWTAuthentication().get_user(refresh)
+            except AuthenticationFailed as error:
+                raise InvalidToken(error.detail)
+            if user.auth_version != version:
+                raise InvalidToken(
+                    _("The user has changed since the token was issued.")
+                )
+        return super().validate(attrs)
+
+
+class TokenVerifySerializer(BaseTokenVerifySerializer):
+    """Revoked tokens are rejected."""
+
+    def validate(self, attrs):
+        UntypedToken(attrs["token"])
+        return {}
+
+
+class TokenRevokeSerializer(TokenBlacklistSerializer):
+    """Revokes the refresh token, so it can't be refreshed anymore."""
+
+    token_class = RefreshToken
+
+    def validate(self, attrs):
+        self.token_class(attrs["refresh"]).revoke()
+        return {}
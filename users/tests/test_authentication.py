@@ -0,0 +1,212 @@
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import SimpleTestCase
+from django.urls import reverse
+from drf_spectacular.generators import SchemaGenerator
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from users.authentication import (
+    USER_VERSION_CLAIM,
+    LocalUserCache,
+    local_users,
+)
+from users.models import User
+
+
+class CachedJWTAuthenticationTestCase(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_users.clear()
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.url = reverse("users:manage")
+
+    def obtain_token(self, password="password"):
+        response = self.client.post(
+            reverse("users:token_obtain_pair"),
+            {"email": self.user.email, "password": password},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data["access"]
+
+    def get(self, token):
+        return self.client.get(self.url, HTTP_AUTHORIZE=f"Bearer {token}")
+
+    def test_token_carries_the_user_version(self):
+        token = AccessToken(self.obtain_token())
+
+        self.assertEqual(token[USER_VERSION_CLAIM], self.user.auth_version)
+
+    def test_reads_do_not_query_the_user(self):
+        token = self.obtain_token()
+
+        with self.assertNumQueries(1):
+            first = self.get(token)
+        with self.assertNumQueries(0):
+            second = self.get(token)
+        local_users.clear()
+        with self.assertNumQueries(0):
+            shared = self.get(token)
+
+        for response in (first, second, shared):
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertEqual(response.data["email"], "user@example.com")
+
+    def test_refreshed_token_keeps_the_version(self):
+        refresh = self.client.post(
+            reverse("users:token_obtain_pair"),
+            {"email": self.user.email, "password": "password"},
+        ).data["refresh"]
+
+        access = self.client.post(
+            reverse("users:token_refresh"), {"refresh": refresh}
+        ).data["access"]
+
+        self.assertEqual(
+            AccessToken(access)[USER_VERSION_CLAIM], self.user.auth_version
+        )
+
+    def test_user_change_rejects_older_refresh_tokens(self):
+        refresh = self.client.post(
+            reverse("users:token_obtain_pair"),
+            {"email": self.user.email, "password": "password"},
+        ).data["refresh"]
+        self.client.post(reverse("users:token_refresh"), {"refresh": refresh})
+
+        self.user.set_password("new-password")
+        self.user.save()
+        response = self.client.post(
+            reverse("users:token_refresh"), {"refresh": refresh}
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_password_change_rejects_older_tokens(self):
+        token = self.obtain_token()
+        self.get(token)
+
+        response = self.client.patch(
+            self.url,
+            {"password": "new-password"},
+            HTTP_AUTHORIZE=f"Bearer {token}",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get(token).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.assertEqual(
+            self.get(self.obtain_token("new-password")).status_code,
+            status.HTTP_200_OK,
+        )
+
+    def test_is_staff_flip_is_seen_at_once(self):
+        token = self.obtain_token()
+        self.get(token)
+
+        self.user.is_staff = True
+        self.user.save()
+
+        self.assertEqual(
+            self.get(token).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.assertTrue(self.get(self.obtain_token()).data["is_staff"])
+
+    def test_saves_of_other_fields_keep_tokens(self):
+        token = self.obtain_token()
+        self.get(token)
+
+        self.user.last_login = self.user.date_joined
+        self.user.save(update_fields=["last_login"])
+
+        self.assertEqual(self.get(token).status_code, status.HTTP_200_OK)
+
+    def test_full_saves_bump_only_on_versioned_changes(self):
+        token = self.obtain_token()
+        self.get(token)
+
+        user = User.objects.get(pk=self.user.pk)
+        user.first_name = "First"
+        user.save()
+        renamed = self.get(token)
+        user.is_staff = True
+        user.save()
+
+        self.assertEqual(renamed.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.get(token).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_deleted_user_is_rejected(self):
+        token = self.obtain_token()
+        self.get(token)
+
+        self.user.delete()
+
+        self.assertEqual(
+            self.get(token).status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_cached_user_updates_keep_the_password(self):
+        token = self.obtain_token()
+        self.get(token)
+
+        response = self.client.patch(
+            self.url,
+            {"email": "new@example.com"},
+            HTTP_AUTHORIZE=f"Bearer {token}",
+        )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.email, "new@example.com")
+        self.assertTrue(self.user.check_password("password"))
+
+    def test_tokens_without_version_use_the_database(self):
+        token = RefreshToken.for_user(self.user).access_token
+
+        with self.assertNumQueries(1):
+            response = self.get(token)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class LocalUserCacheTestCase(SimpleTestCase):
+
+    def test_least_recently_used_entry_is_evicted(self):
+        users = LocalUserCache(max_size=2, timeout=60)
+        users.set("a", 1)
+        users.set("b", 2)
+        users.get("a")
+
+        users.set("c", 3)
+
+        self.assertEqual(users.get("a"), 1)
+        self.assertIsNone(users.get("b"))
+        self.assertEqual(users.get("c"), 3)
+
+    def test_entries_expire(self):
+        users = LocalUserCache(max_size=2, timeout=5)
+        with mock.patch("users.authentication.time.monotonic") as now:
+            now.return_value = 100
+            users.set("a", 1)
+            now.return_value = 106
+
+            self.assertIsNone(users.get("a"))
+
+
+class AuthenticationSchemaTestCase(SimpleTestCase):
+
+    def test_schema_documents_the_jwt_scheme(self):
+        schema = SchemaGenerator().get_schema(request=None, public=True)
+
+        self.assertIn("jwtAuth", schema["components"]["securitySchemes"])
+        self.assertIn(
+            {"jwtAuth": []},
+            schema["paths"]["/api/users/me/"]["get"]["security"],
+        )
@@ -0,0 +1,138 @@
+import io
+import os
+import tempfile
+from unittest import mock
+
+from django.contrib.auth.hashers import identify_hasher
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+
+from users.importers import import_users
+from users.models import User
+
+
+ROWS = [
+    {"email": "Ann@School.EXAMPLE", "password": "password1"},
+    {
+        "email": "bob@school.example",
+        "password": "password2",
+        "first_name": "Bob",
+    },
+    {"email": "carol@school.example"},
+]
+
+
+@override_settings(
+    PASSWORD_HASHERS=["django.contrib.auth.hashers.MD5PasswordHasher"]
+)
+class ImportUsersTestCase(TestCase):
+
+    def test_users_are_created_with_hashed_passwords(self):
+        result = import_users(ROWS, workers=2)
+
+        self.assertEqual((result.rows, result.imported), (3, 3))
+        ann = User.objects.get(email="Ann@school.example")
+        self.assertTrue(ann.check_password("password1"))
+        self.assertEqual(identify_hasher(ann.password).algorithm, "md5")
+        bob = User.objects.get(email="bob@school.example")
+        self.assertEqual(bob.first_name, "Bob")
+        self.assertTrue(bob.check_password("password2"))
+        self.assertFalse(
+            User.objects.get(email="carol@school.example")
+            .has_usable_password()
+        )
+
+    def test_existing_and_repeated_emails_are_skipped(self):
+        User.objects.create_user(
+            email="bob@school.example", password="unchanged"
+        )
+        rows = [*ROWS, {**ROWS[0], "password": "password3"}]
+
+        result = import_users(rows, batch_size=2, workers=1)
+
+        self.assertEqual(result.imported, 2)
+        self.assertEqual(result.existing, 2)
+        self.assertEqual(User.objects.count(), 3)
+        self.assertTrue(
+            User.objects.get(email="bob@school.example")
+            .check_password("unchanged")
+        )
+        self.assertTrue(
+            User.objects.get(email="Ann@school.example")
+            .check_password("password1")
+        )
+
+    def test_users_registered_during_the_import_are_not_counted(self):
+        bulk_create = User.objects.bulk_create
+
+        def register_first(objects, **kwargs):
+            User.objects.create_user(
+                email="bob@school.example", password="concurrent"
+            )
+            return bulk_create(objects, **kwargs)
+
+        with mock.patch.object(
+            User.objects, "bulk_create", side_effect=register_first
+        ):
+            result = import_users(ROWS, workers=1)
+
+        self.assertEqual((result.imported, result.existing), (2, 1))
+        self.assertTrue(
+            User.objects.get(email="bob@school.example")
+            .check_password("concurrent")
+        )
+
+    def test_invalid_rows_are_skipped(self):
+        rows = [
+            {"email": "not an email"},
+            ROWS[1],
+            {**ROWS[0], "password": "x"},
+        ]
+
+        result = import_users(rows, workers=1)
+
+        self.assertEqual(result.imported, 1)
+        self.assertEqual(result.invalid, 2)
+        number, errors = result.errors[0]
+        self.assertEqual(number, 1)
+        self.assertIn("email", errors)
+
+    def test_batches(self):
+        rows = [
+            {"email": f"user{index}@school.example", "password": "password"}
+            for index in range(5)
+        ]
+        seen = []
+
+        result = import_users(
+            rows,
+            batch_size=2,
+            workers=2,
+            progress=lambda result: seen.append(result.imported),
+        )
+
+        self.assertEqual(result.imported, 5)
+        self.assertEqual(seen, [2, 4, 5])
+        self.assertEqual(User.objects.count(), 5)
+
+    def test_command(self):
+        handle, path = tempfile.mkstemp(suffix=".csv")
+        with os.fdopen(handle, "w", encoding="utf-8") as stream:
+            stream.write(
+                "email,password,first_name,last_name\n"
+                "ann@school.example,password1,Ann,Lee\n"
+                "bob@school.example,pw,Bob,Ray\n"
+            )
+        self.addCleanup(os.remove, path)
+        out, err = io.StringIO(), io.StringIO()
+
+        call_command(
+            "import_users", path, "--workers", "1", stdout=out, stderr=err
+        )
+
+        self.assertIn(
+            "Imported 1 users from 2 rows (0 existing, 1 invalid)",
+            out.getvalue(),
+        )
+        self.assertIn("Row 2", err.getvalue())
+        self.assertEqual(User.objects.get().last_name, "Lee")
@@ -0,0 +1,103 @@
+import threading
+from unittest import mock
+
+from django.contrib.auth.hashers import identify_hasher
+from django.test import override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from users.hashing import password_hashing
+from users.models import User
+
+
+PBKDF2 = "django.contrib.auth.hashers.PBKDF2PasswordHasher"
+MD5 = "django.contrib.auth.hashers.MD5PasswordHasher"
+
+
+class PasswordHashingSlotTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+
+    @mock.patch.object(password_hashing, "slots", threading.Semaphore(0))
+    def test_requests_without_a_slot_are_rejected_early(self):
+        register = self.client.post(
+            reverse("users:create"),
+            {"email": "new@example.com", "password": "password"},
+        )
+        login = self.client.post(
+            reverse("users:token_obtain_pair"),
+            {"email": "user@example.com", "password": "password"},
+        )
+
+        for response in (register, login):
+            self.assertEqual(
+                response.status_code, status.HTTP_503_SERVICE_UNAVAILABLE
+            )
+            self.assertEqual(response["Retry-After"], "1")
+        self.assertFalse(User.objects.filter(email="new@example.com"))
+
+    def test_slots_are_released(self):
+        for _ in range(3):
+            response = self.client.post(
+                reverse("users:token_obtain_pair"),
+                {"email": "user@example.com", "password": "wrong"},
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_401_UNAUTHORIZED
+            )
+
+        self.assertEqual(
+            self.client.post(
+                reverse("users:token_obtain_pair"),
+                {"email": "user@example.com", "password": "password"},
+            ).status_code,
+            status.HTTP_200_OK,
+        )
+
+
+class RehashOnLoginTestCase(APITransactionTestCase):
+
+    def setUp(self):
+        with override_settings(PASSWORD_HASHERS=[MD5]):
+            self.user = User.objects.create_user(
+                email="user@example.com", password="password"
+            )
+        self.rehashes = []
+        rehash_later = password_hashing.rehash_later
+        patcher = mock.patch.object(
+            password_hashing,
+            "rehash_later",
+            side_effect=lambda *args: self.rehashes.append(
+                rehash_later(*args)
+            ),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def login(self):
+        return self.client.post(
+            reverse("users:token_obtain_pair"),
+            {"email": "user@example.com", "password": "password"},
+        )
+
+    @override_settings(PASSWORD_HASHERS=[PBKDF2, MD5])
+    def test_outdated_hash_is_upgraded_after_the_login(self):
+        response = self.login()
+        for future in self.rehashes:
+            future.result(timeout=10)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(self.rehashes), 1)
+        user = User.objects.get()
+        self.assertEqual(
+            identify_hasher(user.password).algorithm, "pbkdf2_sha256"
+        )
+        self.assertEqual(user.auth_version, self.user.auth_version)
+        self.assertTrue(user.check_password("password"))
+
+        self.login()
+        self.assertEqual(len(self.rehashes), 1)
@@ -0,0 +1,147 @@
+import uuid
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import SimpleTestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from users.models import RevokedToken, User
+from users.revocation import BloomFilter, revoked_tokens
+
+
+class TokenRevocationTestCase(APITestCase):
+
+    def setUp(self):
+        revoked_tokens.reset()
+        self.addCleanup(revoked_tokens.reset)
+        # Built in the request, whose transaction holds the test data.
+        rebuild = mock.patch.object(
+            revoked_tokens, "start_rebuild", revoked_tokens.rebuild
+        )
+        rebuild.start()
+        self.addCleanup(rebuild.stop)
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.refresh = str(RefreshToken.for_user(self.user))
+
+    def post(self, name, data):
+        return self.client.post(reverse(f"users:{name}"), data)
+
+    def test_logout_revokes_the_refresh_token(self):
+        other = str(RefreshToken.for_user(self.user))
+
+        response = self.post("logout", {"refresh": self.refresh})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            self.post("token_refresh", {"refresh": self.refresh}).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            self.post("token_verify", {"token": self.refresh}).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            self.post("logout", {"refresh": self.refresh}).status_code,
+            status.HTTP_401_UNAUTHORIZED,
+        )
+        self.assertEqual(
+            self.post("token_refresh", {"refresh": other}).status_code,
+            status.HTTP_200_OK,
+        )
+
+    @mock.patch.object(revoked_tokens, "sync_interval", 3600)
+    def test_tokens_missing_from_the_filter_are_not_queried(self):
+        self.post("token_verify", {"token": self.refresh})
+
+        with self.assertNumQueries(0):
+            refreshed = self.post("token_refresh", {"refresh": self.refresh})
+            verified = self.post("token_verify", {"token": self.refresh})
+
+        self.assertEqual(refreshed.status_code, status.HTTP_200_OK)
+        self.assertEqual(verified.status_code, status.HTTP_200_OK)
+
+    def test_revocations_of_other_processes_are_synced(self):
+        self.post("token_verify", {"token": self.refresh})
+        RevokedToken.objects.create(
+            jti=RefreshToken(self.refresh)["jti"],
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+
+        with mock.patch.object(revoked_tokens, "sync_interval", 3600):
+            before_sync = self.post("token_refresh", {"refresh": self.refresh})
+        with mock.patch.object(revoked_tokens, "sync_interval", 0):
+            after_sync = self.post("token_refresh", {"refresh": self.refresh})
+
+        self.assertEqual(before_sync.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            after_sync.status_code, status.HTTP_401_UNAUTHORIZED
+        )
+
+    def test_sync_follows_ids_whatever_the_clock(self):
+        self.post("token_verify", {"token": self.refresh})
+        RevokedToken.objects.create(
+            jti=RefreshToken(self.refresh)["jti"],
+            expires_at=timezone.now() + timedelta(days=1),
+        )
+        RevokedToken.objects.update(
+            revoked_at=timezone.now() - timedelta(days=1)
+        )
+
+        with mock.patch.object(revoked_tokens, "sync_interval", 0):
+            response = self.post("token_refresh", {"refresh": self.refresh})
+
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_rebuilds_are_started_once_and_keep_the_filter(self):
+        self.post("token_verify", {"token": self.refresh})
+        bloom = revoked_tokens.filter
+        revoked_tokens.built_at -= revoked_tokens.rebuild_interval
+
+        with mock.patch.object(
+            revoked_tokens, "sync_interval", 0
+        ), mock.patch.object(revoked_tokens, "start_rebuild") as start:
+            for _ in range(2):
+                response = self.post(
+                    "token_refresh", {"refresh": self.refresh}
+                )
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        start.assert_called_once_with()
+        self.assertIs(revoked_tokens.filter, bloom)
+
+    def test_expired_revocations_are_pruned(self):
+        now = timezone.now()
+        for expires_at in (now - timedelta(days=1), now + timedelta(days=1)):
+            RevokedToken.objects.create(
+                jti=uuid.uuid4().hex, expires_at=expires_at
+            )
+
+        out = StringIO()
+        call_command("prune_revoked_tokens", stdout=out)
+
+        self.assertIn("Deleted 1", out.getvalue())
+        self.assertEqual(RevokedToken.objects.count(), 1)
+
+
+class BloomFilterTestCase(SimpleTestCase):
+
+    def test_no_false_negatives_and_few_false_positives(self):
+        bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+        added = [uuid.uuid4().hex for _ in range(10_000)]
+        for item in added:
+            bloom.add(item)
+
+        false_positives = sum(
+            uuid.uuid4().hex in bloom for _ in range(10_000)
+        )
+
+        self.assertTrue(all(item in bloom for item in added))
+        self.assertLess(false_positives, 200)
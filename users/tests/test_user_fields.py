@@ -0,0 +1,27 @@
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from users.models import User
+
+
+class ManageUserFieldsTestCase(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user(
+            email="user@example.com", password="password"
+        )
+        self.url = reverse("users:manage")
+        self.client.force_authenticate(user=self.user)
+
+    def test_fields(self):
+        response = self.client.get(self.url, {"fields": "email"})
+
+        self.assertEqual(response.data, {"email": "user@example.com"})
+
+    def test_fields_do_not_apply_to_updates(self):
+        response = self.client.patch(
+            f"{self.url}?fields=email", {"email": "new@example.com"}
+        )
+
+        self.assertEqual(response.data["email"], "new@example.com")
+        self.assertIn("is_staff", response.data)
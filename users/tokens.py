@@ -0,0 +1,33 @@
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import (
+    RefreshToken as BaseRefreshToken,
+    UntypedToken as BaseUntypedToken,
+)
+from rest_framework_simplejwt.utils import datetime_from_epoch
+
+from users.revocation import revoked_tokens
+
+
+class RevocableTokenMixin:
+    """Tokens rejected once revoked (see users.revocation)."""
+
+    def verify(self):
+        super().verify()
+        if revoked_tokens.is_revoked(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError(_("Token is revoked"))
+
+    def revoke(self):
+        revoked_tokens.revoke(
+            self.payload[api_settings.JTI_CLAIM],
+            datetime_from_epoch(self.payload["exp"]),
+        )
+
+
+class RefreshToken(RevocableTokenMixin, BaseRefreshToken):
+    pass
+
+
+class UntypedToken(RevocableTokenMixin, BaseUntypedToken):
+    pass
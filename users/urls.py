@@ -1,11 +1,15 @@
 from django.urls import path
 from rest_framework_simplejwt.views import (
-    TokenObtainPairView,
+    TokenBlacklistView,
     TokenRefreshView,
     TokenVerifyView,
 )
 
-from users.views import CreateUserView, ManageUserView
+from users.views import (
+    CreateUserView,
+    ManageUserView,
+    TokenObtainPairView,
+)
 
 app_name = "users"
 
@@ -14,5 +18,6 @@ urlpatterns = [
     path("token/", TokenObtainPairView.as_view(), name="token_obtain_pair"),
     path("token/refresh/", TokenRefreshView.as_view(), name="token_refresh"),
     path("token/verify/", TokenVerifyView.as_view(), name="token_verify"),
+    path("logout/", TokenBlacklistView.as_view(), name="logout"),
     path("me/", ManageUserView.as_view(), name="manage"),
 ]
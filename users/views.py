@@ -1,34 +1,68 @@
 from rest_framework import generics
 from rest_framework.permissions import IsAuthenticated
-from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.views import (
+    TokenObtainPairView as BaseTokenObtainPairView,
+)
 
+from users.authentication import CachedJWTAuthentication
+from users.hashing import password_hashing
 from users.serializers import UserSerializer
 
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
+    OpenApiParameter,
     OpenApiResponse,
 )
 
 
+class PasswordHashingMixin:
+    """
+    POST requests take a password hashing slot first and are rejected
+    with 503 when there is none left (see users.hashing).
+    """
+
+    def post(self, request, *args, **kwargs):
+        with password_hashing.slot():
+            return super().post(request, *args, **kwargs)
+
+
 @extend_schema(
     description="Create a new user account.",
     request=UserSerializer,
     responses={
         201: UserSerializer,
         400: OpenApiResponse(description="Validation Error"),
+        503: OpenApiResponse(description="Too many sign-ins"),
     },
 )
-class CreateUserView(generics.CreateAPIView):
+class CreateUserView(PasswordHashingMixin, generics.CreateAPIView):
     """
     Endpoint for user registration.
     """
     serializer_class = UserSerializer
 
 
+class TokenObtainPairView(PasswordHashingMixin, BaseTokenObtainPairView):
+    """
+    Takes a set of user credentials and returns an access and refresh
+    JSON web token pair, 503 when too many logins are being checked.
+    """
+
+
 @extend_schema_view(
     get=extend_schema(
         description="Retrieve the authenticated user's details.",
+        parameters=[
+            OpenApiParameter(
+                name="fields",
+                type=str,
+                location=OpenApiParameter.QUERY,
+                description="Comma separated fields to return "
+                            "(ex. ?fields=id,email)",
+                required=False,
+            ),
+        ],
         responses=UserSerializer,
     ),
     put=extend_schema(
@@ -47,7 +81,7 @@ class ManageUserView(generics.RetrieveUpdateAPIView):
     Endpoint for retrieving and updating the authenticated user's information.
     """
     serializer_class = UserSerializer
-    authentication_classes = (JWTAuthentication,)
+    authentication_classes = (CachedJWTAuthentication,)
     permission_classes = (IsAuthenticated,)
 
     def get_object(self):